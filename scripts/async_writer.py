@@ -0,0 +1,187 @@
+"""
+Asynchronous bulk writer backend for OutputTree.
+
+On network filesystems (NFS, SMB) every open/write/close pays a round-trip,
+so writing a course file by file is dominated by latency. AsyncWriteTree
+queues writes and performs them concurrently on a bounded thread pool driven
+by an asyncio event loop running in a background thread.
+
+Guarantees:
+    - Reads, exists() and glob() see queued content immediately, so later
+      stages behave exactly as with the synchronous tree.
+    - Writes to the same path are applied in the order they were queued.
+    - At most `max_pending` writes are in flight; write_text() blocks beyond
+      that, which bounds memory on very large courses.
+    - Failures do not stop other writes; flush() raises one BulkWriteError
+      listing every failed path.
+"""
+
+import asyncio
+import fnmatch
+import os
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from output_tree import OutputTree, ChangeManifest
+    from file_discovery import FileEntry, name_matches
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from output_tree import OutputTree, ChangeManifest
+    from file_discovery import FileEntry, name_matches
+
+DEFAULT_CONCURRENCY = 16
+
+
+class BulkWriteError(Exception):
+    """Raised by flush() with every write that failed since the last flush."""
+
+    def __init__(self, errors: List[Tuple[str, BaseException]]):
+        self.errors = errors
+        details = '; '.join(f"{path}: {error}" for path, error in errors)
+        super().__init__(f"{len(errors)} write(s) failed: {details}")
+
+
+class AsyncWriteTree(OutputTree):
+    """
+    Disk-backed output root whose writes are queued and performed concurrently.
+
+    Args:
+        root (str): Output root directory.
+        manifest (ChangeManifest, optional): Records effective writes, as in OutputTree.
+        metrics (MetricsScope, optional): Counts writes and failures, as in OutputTree.
+        concurrency (int): Number of writes performed in parallel.
+        max_pending (int, optional): Queued writes allowed before write_text() blocks
+            (defaults to four times the concurrency).
+    """
+
+    def __init__(self, root: str = '.', manifest: Optional[ChangeManifest] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, max_pending: Optional[int] = None,
+                 metrics=None):
+        super().__init__(root, manifest=manifest, metrics=metrics)
+        self.concurrency = max(1, concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='writer')
+        self._slots = threading.BoundedSemaphore(max_pending or self.concurrency * 4)
+        self._lock = threading.Lock()
+        # Latest queued content and the future of the last write, per path
+        self._pending: Dict[str, Tuple[int, str]] = {}
+        self._tails: Dict[str, Future] = {}
+        self._futures: List[Future] = []
+        self._errors: List[Tuple[str, BaseException]] = []
+        self._seq = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='writer-loop', daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _key(relpath: str) -> str:
+        return os.path.normpath(relpath)
+
+    # Reads see queued content ----------------------------------------------
+
+    def exists(self, relpath: str) -> bool:
+        with self._lock:
+            if self._key(relpath) in self._pending:
+                return True
+        return super().exists(relpath)
+
+    def read_text(self, relpath: str) -> str:
+        with self._lock:
+            pending = self._pending.get(self._key(relpath))
+        if pending is not None:
+            return pending[1]
+        return super().read_text(relpath)
+
+    def glob(self, pattern: str) -> List[str]:
+        key_pattern = self._key(pattern)
+        depth = key_pattern.count(os.sep)
+        with self._lock:
+            pending = {
+                key for key in self._pending
+                if key.count(os.sep) == depth and fnmatch.fnmatchcase(key, key_pattern)
+            }
+        on_disk = {self._key(p) for p in super().glob(pattern)}
+        return sorted(pending | on_disk)
+
+    def _scan_dir(self, relpath: str, prefix=None, extensions=None, pattern=None) -> List[FileEntry]:
+        directory = self._key(relpath)
+        entries = {e.name: e for e in super()._scan_dir(relpath, prefix, extensions, pattern)}
+        with self._lock:
+            pending = list(self._pending.items())
+        for key, (_, content) in pending:
+            name = os.path.basename(key)
+            if os.path.dirname(key) == directory and name_matches(name, prefix, extensions, pattern):
+                # Not on disk yet: no usable stat data
+                entries[name] = FileEntry(os.path.join(relpath, name), name, len(content.encode('utf-8')), None)
+        return [entries[name] for name in sorted(entries)]
+
+    # Writes ----------------------------------------------------------------
+
+    def write_text(self, relpath: str, content: str) -> None:
+        self._slots.acquire()
+        key = self._key(relpath)
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._pending[key] = (seq, content)
+            previous = self._tails.get(key)
+            future = asyncio.run_coroutine_threadsafe(
+                self._write(key, relpath, content, self.stage, seq, previous), self._loop
+            )
+            self._tails[key] = future
+            self._futures.append(future)
+
+    async def _write(self, key: str, relpath: str, content: str, stage: Optional[str],
+                     seq: int, previous: Optional[Future]) -> None:
+        try:
+            if previous is not None:
+                # Keep per-path order; the previous write's own error is reported separately
+                await asyncio.wait([asyncio.wrap_future(previous)])
+            await self._loop.run_in_executor(self._executor, self._write_file, relpath, content, stage)
+        except Exception as e:
+            with self._lock:
+                self._errors.append((relpath, e))
+            if self.metrics is not None:
+                self.metrics.count(stage, 'failed')
+        finally:
+            with self._lock:
+                # Only drop the overlay if no newer write was queued meanwhile
+                if self._pending.get(key, (None,))[0] == seq:
+                    del self._pending[key]
+                    self._tails.pop(key, None)
+            self._slots.release()
+
+    def flush(self) -> None:
+        """
+        Waits until every queued write has finished.
+
+        Raises:
+            BulkWriteError: If any write failed since the last flush.
+        """
+        while True:
+            with self._lock:
+                futures, self._futures = self._futures, []
+            if not futures:
+                break
+            for future in futures:
+                future.result()
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise BulkWriteError(sorted(errors, key=lambda e: e[0]))
+
+    def close(self) -> None:
+        """Flushes pending writes and stops the event loop and the thread pool."""
+        try:
+            self.flush()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,170 @@
+"""
+Content-addressed build cache for generated course files.
+
+Each generated file is stored under a key derived from its input record
+(e.g. one week of planeamiento.json), the language and a hash of the
+generator's source code. A stage asks the cache before rendering: on a hit
+the stored output is materialised as-is, on a miss the file is rendered and
+stored. Editing a week, switching language or changing a generator therefore
+invalidates exactly the affected entries.
+
+The cache is a plain directory, so CI can carry it between runs with
+actions/cache or any shared filesystem:
+
+    <root>/entries/ab/ab12....json   {"path": "sessions/01-intro.md", "object": "<sha256>"}
+    <root>/objects/cd/cd34...         file content, addressed by its own sha256
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from dataclasses import asdict, is_dataclass
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import CACHE_DIR
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import CACHE_DIR
+
+DEFAULT_BUILD_CACHE_DIR = os.path.join(CACHE_DIR, 'build')
+
+# Bump to invalidate every entry when the cache layout or key scheme changes
+CACHE_FORMAT = 1
+
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Modules whose code shapes every generated file (translations, slugs, model)
+_SHARED_SOURCES = ('utils.py', 'course_model.py')
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def generator_hash(generator_file: str) -> str:
+    """
+    Hash of a generator's source plus the shared modules it depends on.
+
+    Args:
+        generator_file (str): Path of the generator module (usually its __file__).
+    """
+    h = hashlib.sha256()
+    for path in (os.path.abspath(generator_file),
+                 *(os.path.join(_SCRIPTS_DIR, name) for name in _SHARED_SOURCES)):
+        h.update(_file_digest(path).encode('ascii'))
+    return h.hexdigest()
+
+
+def _jsonable(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return str(value)
+
+
+class BuildCache:
+    """
+    Directory-backed, content-addressed store of generated files.
+
+    Safe to share between the threads rendering several languages: entries and
+    objects are written atomically and never modified once stored.
+
+    Args:
+        root (str): Cache directory (created on first write).
+    """
+
+    def __init__(self, root: str = DEFAULT_BUILD_CACHE_DIR):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, generator_file: str, lang: str, *inputs: Any) -> str:
+        """
+        Cache key for one output of a generator.
+
+        Args:
+            generator_file (str): Path of the generator module (its __file__).
+            lang (str): Language code.
+            *inputs: Input records (dicts, dataclasses, strings) the output depends on.
+        """
+        payload = json.dumps(
+            [CACHE_FORMAT, generator_hash(generator_file), lang, inputs],
+            sort_keys=True, ensure_ascii=False, default=_jsonable
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.root, 'entries', key[:2], f"{key}.json")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, 'objects', digest[:2], digest)
+
+    def _write_atomic(self, path: str, content: bytes) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """
+        Looks up a stored output.
+
+        Returns:
+            tuple: (relative path, content), or None on a miss or a damaged entry.
+        """
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(self._object_path(entry['object']), 'rb') as f:
+                raw = f.read()
+        except (OSError, ValueError, KeyError, TypeError):
+            self._count(False)
+            return None
+        if hashlib.sha256(raw).hexdigest() != entry['object']:
+            self._count(False)
+            return None
+        self._count(True)
+        return entry['path'], raw.decode('utf-8')
+
+    def put(self, key: str, relpath: str, content: str) -> Tuple[str, str]:
+        """
+        Stores an output and returns it unchanged, so calls can be chained.
+
+        Returns:
+            tuple: (relpath, content)
+        """
+        raw = content.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            self._write_atomic(object_path, raw)
+        entry = json.dumps({'path': relpath.replace(os.sep, '/'), 'object': digest})
+        self._write_atomic(self._entry_path(key), entry.encode('utf-8'))
+        return relpath, content
+
+    def summary(self) -> str:
+        return f"build cache: {self.hits} hit(s), {self.misses} miss(es) in {self.root}"
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Converts number formatting between locales in markdown files (e.g. 1,234.56 -> 1.234,56).
+
+Each line is tokenized in a single regex pass: code spans, inline math,
+link targets and URLs are matched first and copied through untouched, and
+only the remaining number tokens are rewritten. Fenced code blocks, $$ math
+blocks, {math} directives and the YAML frontmatter are skipped entirely.
+Files are streamed line by line and only replaced when something changed.
+"""
+
+import argparse
+import fnmatch
+import os
+import re
+import shutil
+import sys
+import tempfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import OUTPUT_DIR_EXAMPLES
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import OUTPUT_DIR_EXAMPLES
+
+# Locale -> (thousands separator, decimal separator)
+NUMBER_FORMATS = {
+    'en': (',', '.'),
+    'es': ('.', ','),
+    'fr': ('\u202f', ','),  # narrow no-break space
+}
+
+# Spans that must never be rewritten. Order matters: the first alternative
+# that matches at a position wins, so these are tried before numbers.
+_SKIP_PATTERN = '|'.join([
+    r'`+[^`]*`+',                 # code spans and roles such as {math}`...`
+    r'\$(?=[^\s$])[^$\n]*(?<=\S)\$(?!\d)',  # inline math (pandoc rule, so prices are not math)
+    r'\]\([^)\s]*(?:\s+"[^"]*")?\)',  # link / image targets
+    r'<[a-z][a-z0-9+.-]*:[^>\s]*>',  # autolinks
+    r'\b[a-z][a-z0-9+.-]*://\S+',  # bare URLs
+])
+
+# Opening lines of blocks whose content is left untouched
+_FENCE_RE = re.compile(r'^\s*(`{3,}|~{3,})')
+_MATH_DIRECTIVE_RE = re.compile(r'^\s*(:{3,})\s*\{math\}')
+
+
+def _compile_tokenizer(source: str) -> 're.Pattern':
+    thousands, decimal = (re.escape(sep) for sep in NUMBER_FORMATS[source])
+    # Numbers must not touch letters, digits or other separators, so version
+    # strings (1.2.3), identifiers (v2.0) and dates are left alone.
+    edge_before = rf'(?<![\w{thousands}{decimal}])'
+    edge_after = rf'(?!\w|[{thousands}{decimal}]\d)'
+    grouped = rf'\d{{1,3}}(?:{thousands}\d{{3}})+(?:{decimal}\d+)?'
+    plain = rf'\d+{decimal}\d+'
+    return re.compile(
+        rf'(?P<skip>{_SKIP_PATTERN})|{edge_before}(?P<num>{grouped}|{plain}){edge_after}'
+    )
+
+
+class NumberFormatConverter:
+    """
+    Streaming converter from one locale's number format to another's.
+
+    Args:
+        source (str): Locale of the input numbers (key of NUMBER_FORMATS).
+        target (str): Locale of the output numbers.
+    """
+
+    def __init__(self, source: str = 'en', target: str = 'es'):
+        if source not in NUMBER_FORMATS or target not in NUMBER_FORMATS:
+            raise ValueError(f"Unsupported locale: {source} -> {target}")
+        self.source_seps = NUMBER_FORMATS[source]
+        self.target_seps = NUMBER_FORMATS[target]
+        self.tokenizer = _compile_tokenizer(source)
+
+    def _convert_number(self, token: str) -> str:
+        thousands, decimal = self.source_seps
+        new_thousands, new_decimal = self.target_seps
+        integer, _, fraction = token.partition(decimal)
+        integer = integer.replace(thousands, new_thousands)
+        return f"{integer}{new_decimal}{fraction}" if fraction else integer
+
+    def _replace(self, match: 're.Match') -> str:
+        if match.group('skip') is not None:
+            return match.group('skip')
+        return self._convert_number(match.group('num'))
+
+    def convert_line(self, line: str) -> str:
+        """Converts the numbers of a single line of prose."""
+        return self.tokenizer.sub(self._replace, line)
+
+    def iter_pairs(self, lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Streams (original, converted) line pairs, skipping frontmatter, code and math blocks.
+        """
+        closing = None  # Marker that ends the block we are currently skipping
+        for index, line in enumerate(lines):
+            stripped = line.strip()
+
+            if closing is not None:
+                if closing == '---' and stripped == '---':
+                    closing = None
+                elif closing == '$$' and stripped.endswith('$$'):
+                    closing = None
+                elif closing not in ('---', '$$') and stripped.startswith(closing) \
+                        and stripped.strip(closing[0]) == '':
+                    closing = None
+                yield line, line
+                continue
+
+            if index == 0 and stripped == '---':
+                closing = '---'
+                yield line, line
+                continue
+
+            fence = _FENCE_RE.match(line) or _MATH_DIRECTIVE_RE.match(line)
+            if fence:
+                closing = fence.group(1)
+                yield line, line
+                continue
+
+            if stripped.startswith('$$'):
+                if not (len(stripped) > 2 and stripped.endswith('$$')):
+                    closing = '$$'
+                yield line, line
+                continue
+
+            yield line, self.convert_line(line)
+
+    def convert_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Converts a stream of markdown lines."""
+        for _, converted in self.iter_pairs(lines):
+            yield converted
+
+    def convert_text(self, text: str) -> str:
+        return ''.join(self.convert_lines(text.splitlines(keepends=True)))
+
+    def convert_file(self, filepath: str) -> bool:
+        """
+        Converts a file in place by streaming it through a temporary file.
+
+        Returns:
+            bool: True if the file changed.
+        """
+        changed = False
+        directory = os.path.dirname(os.path.abspath(filepath))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with open(filepath, 'r', encoding='utf-8') as src, os.fdopen(fd, 'w', encoding='utf-8') as dst:
+                for original, converted in self.iter_pairs(src):
+                    changed = changed or converted != original
+                    dst.write(converted)
+            if changed:
+                # The temporary file is created 0600; keep the permissions of the original
+                shutil.copymode(filepath, tmp)
+                os.replace(tmp, filepath)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        return changed
+
+
+def find_files(directory: str, exclude: Optional[List[str]] = None) -> List[str]:
+    """Lists markdown files in directory whose names match none of the exclude patterns."""
+    exclude = exclude or []
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith('.md'):
+                continue
+            if any(fnmatch.fnmatch(entry.name, pattern) for pattern in exclude):
+                continue
+            files.append(entry.path)
+    return sorted(files)
+
+
+def run(directory: str = OUTPUT_DIR_EXAMPLES, source: str = 'en', target: str = 'es',
+        exclude: Optional[List[str]] = None):
+    """
+    Converts number formats in every markdown file of a directory.
+
+    Args:
+        directory (str): Directory to process (non-recursive).
+        source (str): Locale of the existing numbers.
+        target (str): Locale to convert to.
+        exclude (list, optional): Filename glob patterns to leave untouched.
+    """
+    if not os.path.isdir(directory):
+        print(f"Error: {directory} not found.")
+        return
+
+    converter = NumberFormatConverter(source, target)
+    for filepath in find_files(directory, exclude):
+        if converter.convert_file(filepath):
+            print(f"Processed {os.path.basename(filepath)}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert number formatting between locales in markdown files.')
+    parser.add_argument('--dir', default=OUTPUT_DIR_EXAMPLES, help=f'Directory to process (default: {OUTPUT_DIR_EXAMPLES})')
+    parser.add_argument('--from', dest='source', default='en', choices=sorted(NUMBER_FORMATS), help='Locale of the existing numbers (default: en)')
+    parser.add_argument('--to', dest='target', default='es', choices=sorted(NUMBER_FORMATS), help='Target locale (default: es)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='Filename glob to skip (repeatable), e.g. --exclude "07-*.md"')
+    args = parser.parse_args()
+
+    run(directory=args.dir, source=args.source, target=args.target, exclude=args.exclude)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+In-process API: build a whole course in memory.
+
+build_course() runs every scaffold stage against a VirtualTree (see
+output_tree.py), so nothing is read from or written to the working
+directory, and returns the generated files as a mapping of '/'-separated
+relative path to bytes:
+
+    files = build_course(json.loads(text), lang='en')
+    files['myst.yml']                      # b'version: 1\n...'
+    write_zip(files, response_stream)      # or write_tar(), write_directory()
+
+The sinks turn such a mapping into a directory, a zip archive or a tar
+stream. Archive entries get a fixed timestamp, so the same course always
+produces the same archive bytes.
+
+Stages still log through the 'scaffold' loggers; call
+log_config.configure(quiet=True) to keep an embedding service's output clean.
+"""
+
+import io
+import os
+import sys
+import tarfile
+import zipfile
+from typing import BinaryIO, Dict, Mapping, Union
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import OUTPUT_DIR_ASSETS
+    from course_model import Course, as_course
+    from output_tree import VirtualTree
+    import scaffold_course
+    import validate_schema
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import OUTPUT_DIR_ASSETS
+    from course_model import Course, as_course
+    from output_tree import VirtualTree
+    import scaffold_course
+    import validate_schema
+
+# Timestamp of every archive entry (the earliest a zip file can store)
+ARCHIVE_DATE = (1980, 1, 1, 0, 0, 0)
+ARCHIVE_MTIME = 315532800
+
+
+def build_course(course_data, lang: str = 'es', assets_dir: str = None, jobs: int = 1) -> Dict[str, bytes]:
+    """
+    Generates a whole course without touching the disk.
+
+    Args:
+        course_data (Course|dict|list): Parsed planeamiento.json content, or a Course.
+        lang (str): Language code ('es', 'en', 'fr').
+        assets_dir (str, optional): Directory of static assets (e.g. the site logos)
+            copied into assets/ of the result; the only thing read from disk.
+        jobs (int): Worker processes for badge injection.
+
+    Returns:
+        dict: '/'-separated path relative to the course root -> file content, sorted by path.
+
+    Raises:
+        ValueError: If course_data does not match the syllabus schema
+            (the message lists every error, see validate_schema.py).
+    """
+    if not isinstance(course_data, Course):
+        errors = validate_schema.validate(course_data)
+        if errors:
+            raise ValueError(f"Invalid course data: {len(errors)} schema error(s)\n" + '\n'.join(errors))
+        if isinstance(course_data, list):
+            course_data = {'weeks': course_data, 'metadata': {}}
+
+    out = VirtualTree()
+    if assets_dir is not None:
+        out.copy_tree(assets_dir, OUTPUT_DIR_ASSETS)
+    scaffold_course.scaffold(lang, False, as_course(course_data), out=out, jobs=jobs)
+    return out.to_dict()
+
+
+def write_directory(files: Mapping[str, bytes], root: str) -> None:
+    """Writes every file under root, creating directories as needed (existing files are overwritten)."""
+    for path, content in files.items():
+        target = os.path.join(root, *path.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(content)
+
+
+def write_zip(files: Mapping[str, bytes], target: Union[str, BinaryIO]) -> None:
+    """
+    Writes the files as a deflated zip archive.
+
+    Args:
+        files (dict): Result of build_course().
+        target (str|file): Path or binary file object (need not be seekable).
+    """
+    with zipfile.ZipFile(target, 'w') as archive:
+        for path, content in files.items():
+            info = zipfile.ZipInfo(path, date_time=ARCHIVE_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, content)
+
+
+def write_tar(files: Mapping[str, bytes], target: Union[str, BinaryIO], compression: str = '') -> None:
+    """
+    Writes the files as a tar stream.
+
+    Args:
+        files (dict): Result of build_course().
+        target (str|file): Path or binary file object; written sequentially, so
+            a socket or an HTTP response body works.
+        compression (str): '' (plain tar), 'gz', 'bz2' or 'xz'.
+    """
+    mode = f"w|{compression}"
+    if isinstance(target, str):
+        archive = tarfile.open(target, mode)
+    else:
+        archive = tarfile.open(fileobj=target, mode=mode)
+    with archive:
+        for path, content in files.items():
+            info = tarfile.TarInfo(path)
+            info.size = len(content)
+            info.mtime = ARCHIVE_MTIME
+            info.mode = 0o644
+            archive.addfile(info, io.BytesIO(content))
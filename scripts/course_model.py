@@ -0,0 +1,236 @@
+"""
+Typed course model built from planeamiento.json.
+
+The raw JSON is normalised once at load time (string-or-list fields become
+lists, activity slugs are computed) into compact __slots__ records, so the
+generator stages no longer re-normalise the same fields on every pass.
+
+Large courses can use a sharded layout: a week's pages go to a unit
+subdirectory (sessions/unit-03/, activities/unit-03/) when the week has a
+`unit` field, or when `metadata.unit_size` groups the weeks into fixed
+blocks (unit_size 10: weeks 1-10 are unit 1). Weeks without a unit keep the
+flat layout.
+"""
+
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import load_json, generate_filename, unit_dir, JSON_FILE
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import load_json, generate_filename, unit_dir, JSON_FILE
+
+
+def parse_weeks(spec: str) -> List[int]:
+    """
+    Parses a week selection such as '3,5-9' into sorted, unique week numbers.
+
+    Raises:
+        ValueError: If an item is not a positive number or an ascending range.
+    """
+    weeks = set()
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        start, sep, end = item.partition('-')
+        try:
+            first = int(start)
+            last = int(end) if sep else first
+        except ValueError:
+            raise ValueError(f"Invalid week selection '{spec}': '{item}' is not a week or range (e.g. 3,5-9)")
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid week selection '{spec}': '{item}' is not an ascending range of weeks >= 1")
+        weeks.update(range(first, last + 1))
+    if not weeks:
+        raise ValueError(f"Invalid week selection '{spec}': no weeks given")
+    return sorted(weeks)
+
+
+def _as_list(value: Any) -> list:
+    """Normalizes a string-or-list field to a list (None and '' become [])."""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+@dataclass(slots=True)
+class Activity:
+    description: str
+    filename: str
+
+    @property
+    def title(self) -> str:
+        """Short title: first sentence of the description, truncated to 60 chars."""
+        title = self.description.split('.')[0]
+        if len(title) > 60:
+            title = title[:57] + "..."
+        return title
+
+
+@dataclass(slots=True)
+class Evaluation:
+    type: Optional[str] = None
+    description: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, str]:
+        data = {}
+        if self.type is not None:
+            data['type'] = self.type
+        if self.description is not None:
+            data['description'] = self.description
+        return data
+
+
+@dataclass(slots=True)
+class Reference:
+    text: str = ''
+    pages: str = ''
+
+    def to_dict(self) -> Dict[str, str]:
+        data = {'text': self.text}
+        if self.pages:
+            data['pages'] = self.pages
+        return data
+
+
+@dataclass(slots=True)
+class Week:
+    number: Optional[Union[int, str]]
+    title: Optional[str] = None
+    subtitle: Optional[str] = None
+    content: List[str] = field(default_factory=list)
+    objectives: List[str] = field(default_factory=list)
+    activities: List[Activity] = field(default_factory=list)
+    evaluation: List[Evaluation] = field(default_factory=list)
+    references: List[Reference] = field(default_factory=list)
+    unit: Optional[int] = None
+    # planeamiento.json allows a single activity as a plain string; remember it
+    # so generated frontmatter keeps the author's shape.
+    single_activity: bool = False
+    # Likewise objectives given as a plain string (or null) rather than a list;
+    # the sessions table renders those inline.
+    inline_objectives: bool = False
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> 'Week':
+        number = entry.get('week')
+        raw_activities = entry.get('activities')
+        raw_objectives = entry.get('objectives', [])
+        unit = entry.get('unit')
+        activities = [
+            Activity(desc, generate_filename(number, desc) if number else '')
+            for desc in _as_list(raw_activities) if isinstance(desc, str)
+        ]
+        return cls(
+            number=number,
+            title=entry.get('title'),
+            subtitle=entry.get('subtitle'),
+            content=[str(c) for c in _as_list(entry.get('content'))],
+            objectives=[str(o) for o in _as_list(raw_objectives)],
+            activities=activities,
+            evaluation=[
+                Evaluation(e.get('type'), e.get('description'))
+                for e in _as_list(entry.get('evaluation')) if isinstance(e, dict)
+            ],
+            references=[
+                Reference(r.get('text', ''), r.get('pages', ''))
+                for r in _as_list(entry.get('references')) if isinstance(r, dict)
+            ],
+            unit=unit if isinstance(unit, int) and not isinstance(unit, bool) else None,
+            single_activity=isinstance(raw_activities, str),
+            inline_objectives=not isinstance(raw_objectives, list),
+        )
+
+    @property
+    def folder(self) -> str:
+        """Unit subdirectory of the week's sessions and activities ('unit-03'); '' in the flat layout."""
+        return unit_dir(self.unit) if self.unit is not None else ''
+
+    def objectives_value(self) -> Union[str, List[str]]:
+        """Objectives in the shape used by planeamiento.json ('' for null)."""
+        if self.inline_objectives:
+            return self.objectives[0] if self.objectives else ""
+        return list(self.objectives)
+
+    def activities_value(self) -> Union[str, List[str]]:
+        """Activity descriptions in the shape used by planeamiento.json."""
+        if self.single_activity and len(self.activities) == 1:
+            return self.activities[0].description
+        if not self.activities:
+            return ""
+        return [a.description for a in self.activities]
+
+
+@dataclass(slots=True)
+class Course:
+    metadata: Dict[str, Any]
+    weeks: List[Week]
+    _index: Dict[int, Week] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        unit_size = self.metadata.get('unit_size')
+        if not isinstance(unit_size, int) or unit_size < 1:
+            unit_size = None
+        for w in self.weeks:
+            try:
+                number = int(w.number)
+            except (TypeError, ValueError):
+                continue
+            self._index.setdefault(number, w)
+            # An explicit unit wins over the fixed-size blocks
+            if w.unit is None and unit_size and number > 0:
+                w.unit = (number - 1) // unit_size + 1
+
+    @property
+    def sharded(self) -> bool:
+        """True when at least one week's pages live in a unit subdirectory."""
+        return any(w.unit is not None for w in self.weeks)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Course':
+        return cls(
+            metadata=data.get('metadata') or {},
+            weeks=[Week.from_dict(w) for w in data.get('weeks', []) if isinstance(w, dict)],
+        )
+
+    def week(self, number: int) -> Optional[Week]:
+        """O(1) lookup of a week by its number."""
+        return self._index.get(number)
+
+    def numbered_weeks(self) -> List[Week]:
+        """Weeks that have a week number (the ones that produce files)."""
+        return [w for w in self.weeks if w.number]
+
+    def select(self, numbers: Optional[Iterable[int]] = None) -> List[Week]:
+        """
+        Weeks for a selection, looked up through the index.
+
+        Args:
+            numbers (iterable, optional): Week numbers (e.g. from parse_weeks()); None selects
+                every numbered week. Numbers without a week in the course are ignored.
+        """
+        if numbers is None:
+            return self.numbered_weeks()
+        return [self._index[n] for n in numbers if n in self._index]
+
+
+def as_course(data: Union[Course, Dict[str, Any]]) -> Course:
+    """Returns data as a Course, converting a raw planeamiento.json dict if needed."""
+    if isinstance(data, Course):
+        return data
+    return Course.from_dict(data)
+
+
+def load_course(filepath: str = JSON_FILE) -> Course:
+    """Reads planeamiento.json and returns the normalised course model."""
+    return Course.from_dict(load_json(filepath))
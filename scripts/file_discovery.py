@@ -0,0 +1,191 @@
+"""
+Directory discovery built on os.scandir.
+
+scan_dir() lists a directory in one pass, applies name prefix/extension
+filters on the DirEntry names (no extra syscalls for rejected files) and
+returns entries carrying the size and mtime the walk already obtained, so
+incremental stages can skip unchanged files without opening them.
+
+StatIndex persists (mtime, size) fingerprints between runs for that skip
+logic.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import CACHE_DIR, write_atomic
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import CACHE_DIR, write_atomic
+
+
+@dataclass(slots=True, frozen=True)
+class FileEntry:
+    path: str                # directory joined with name
+    name: str
+    size: int
+    mtime_ns: Optional[int]  # None for files that only exist in memory (queued/planned writes)
+
+
+def _as_tuple(value: Union[str, Iterable[str], None]) -> Tuple[str, ...]:
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+def name_matches(name: str, prefix: Union[str, Iterable[str], None] = None,
+                 extensions: Union[str, Iterable[str], None] = None,
+                 pattern: Optional['re.Pattern'] = None) -> bool:
+    """Applies the scan_dir filters to a file name."""
+    prefixes = _as_tuple(prefix)
+    suffixes = _as_tuple(extensions)
+    if prefixes and not name.startswith(prefixes):
+        return False
+    if suffixes and not name.endswith(suffixes):
+        return False
+    return pattern is None or pattern.match(name) is not None
+
+
+def scan_dir(directory: str, prefix: Union[str, Iterable[str], None] = None,
+             extensions: Union[str, Iterable[str], None] = None,
+             pattern: Optional['re.Pattern'] = None) -> List[FileEntry]:
+    """
+    Lists the regular files of a directory (non-recursive) with their stat data.
+
+    Args:
+        directory (str): Directory to scan.
+        prefix (str|list, optional): Keep names starting with (one of) these prefixes.
+        extensions (str|list, optional): Keep names ending with (one of) these suffixes, e.g. '.md'.
+        pattern (re.Pattern, optional): Keep names the compiled regex matches.
+
+    Returns:
+        list: FileEntry records sorted by name (empty if the directory does not exist).
+    """
+    entries = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not name_matches(entry.name, prefix, extensions, pattern):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append(FileEntry(entry.path, entry.name, st.st_size, st.st_mtime_ns))
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
+def list_dirs(directory: str, pattern: Optional['re.Pattern'] = None) -> List[str]:
+    """
+    Names of the immediate subdirectories of a directory, sorted.
+
+    Args:
+        directory (str): Directory to scan.
+        pattern (re.Pattern, optional): Keep names the compiled regex matches.
+
+    Returns:
+        list: Subdirectory names (empty if the directory does not exist).
+    """
+    names = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if pattern is not None and pattern.match(entry.name) is None:
+                    continue
+                try:
+                    if entry.is_dir():
+                        names.append(entry.name)
+                except OSError:
+                    continue
+    except FileNotFoundError:
+        return []
+    return sorted(names)
+
+
+class StatIndex:
+    """
+    Persistent (mtime, size) fingerprints used to skip files that did not change.
+
+    Each fingerprint can carry a tag (e.g. the language a file was processed
+    for), so a file is only skipped when it was last processed the same way.
+
+    Args:
+        filepath (str): JSON file holding the index.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._data: Dict[str, list] = {}
+        self._dirty = False
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._data = data
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def unchanged(self, path: str, entry: FileEntry, tag: str = '') -> bool:
+        """
+        True if the file has the same mtime, size and tag as when it was last recorded.
+
+        Args:
+            path (str): On-disk path of the file (entry paths may be relative to an output root).
+            entry (FileEntry): Entry returned by the scan.
+            tag (str): How the file was processed (e.g. language).
+        """
+        if entry.mtime_ns is None:
+            return False
+        return self._data.get(self._key(path)) == [entry.mtime_ns, entry.size, tag]
+
+    def record(self, path: str, tag: str = '') -> None:
+        """Stores the current fingerprint of a file on disk."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self._data[self._key(path)] = [st.st_mtime_ns, st.st_size, tag]
+        self._dirty = True
+
+    def save(self) -> None:
+        """
+        Writes the index atomically if it changed, dropping files that no longer exist.
+        """
+        if not self._dirty:
+            return
+        self._data = {path: fingerprint for path, fingerprint in self._data.items() if os.path.exists(path)}
+        write_atomic(self.filepath, json.dumps(self._data))
+        self._dirty = False
+
+
+def default_stat_index(name: str, root: str = '.') -> StatIndex:
+    """
+    StatIndex stored under the scaffold cache directory, one file per output root.
+
+    Args:
+        name (str): Stage name (e.g. 'inject_activity_header').
+        root (str): Output root the stage processes.
+    """
+    root_id = hashlib.sha1(os.path.abspath(root).encode('utf-8')).hexdigest()[:12]
+    return StatIndex(os.path.join(CACHE_DIR, 'stat', f"{name}-{root_id}.json"))
@@ -3,10 +3,12 @@
 Script to generate markdown activity files from planeamiento.json.
 
 This script reads 'planeamiento.json', extracts the 'activities' field for each week,
-and generates structured Markdown files in the 'activities/' directory.
+and generates structured Markdown files in the 'activities/' directory
+(in its unit subdirectories with the sharded layout, see course_model.py).
 """
 
 import argparse
+from collections import Counter
 import sys
 import os
 
@@ -15,63 +17,41 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from utils import (
-        load_json, generate_filename, OUTPUT_DIR_ACTIVITIES, TRANSLATIONS
+        load_json, OUTPUT_DIR_ACTIVITIES, TRANSLATIONS
     )
+    from course_model import as_course, parse_weeks
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
 except ImportError:
     # Fallback for when running from root
     sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
     from utils import (
-        load_json, generate_filename, OUTPUT_DIR_ACTIVITIES, TRANSLATIONS
+        load_json, OUTPUT_DIR_ACTIVITIES, TRANSLATIONS
     )
+    from course_model import as_course, parse_weeks
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
 
-def run(lang: str = 'es', force: bool = False):
-    """
-    Generates activity skeleton files.
-    
-    Args:
-        lang (str): Language code.
-        force (bool): Whether to overwrite existing files.
-    """
-    t = TRANSLATIONS.get(lang, TRANSLATIONS['es'])
-
-    if not os.path.exists(OUTPUT_DIR_ACTIVITIES):
-        os.makedirs(OUTPUT_DIR_ACTIVITIES)
-        print(f"Created directory: {OUTPUT_DIR_ACTIVITIES}")
-
-    print(f"Reading configuration...")
-    try:
-        full_data = load_json()
-        weeks = full_data.get('weeks', [])
-    except Exception as e:
-        print(f"Error reading JSON file: {e}")
-        return
+logger = get_logger('generate_activities')
 
-    for entry in weeks:
-        week_num = entry.get('week')
-        if not week_num:
-            continue
-
-        raw_activity = entry.get('activities')
-        if not raw_activity:
-            continue
+def render_activity(activity, t: dict) -> str:
+    """
+    Renders the markdown skeleton of one activity.
 
-        # Normalize to list to handle single string or list of strings
-        activities_list = []
-        if isinstance(raw_activity, str):
-            activities_list.append(raw_activity)
-        elif isinstance(raw_activity, list):
-            activities_list = raw_activity
+    Args:
+        activity (Activity): Activity record.
+        t (dict): Translations for the output language.
 
-        for i, activity_desc in enumerate(activities_list):
-            filename = generate_filename(week_num, activity_desc)
-            
-            # Use title from description (first sentence or whole thing)
-            title = activity_desc.split('.')[0]
-            if len(title) > 60:
-                title = title[:57] + "..."
-            
-            # Frontmatter
-            md_content = f"""---
+    Returns:
+        str: Markdown content.
+    """
+    activity_desc = activity.description
+    
+    # Use title from description (first sentence or whole thing)
+    title = activity.title
+    
+    # Frontmatter
+    md_content = f"""---
 title: "{title}"
 duration: "60 min"
 modality: "{t['modality']}"
@@ -93,24 +73,80 @@ difficulty: "{t['difficulty']}"
 1.  [{t['step']} 1]
 2.  [{t['step']} 2]
 """
-            filepath = os.path.join(OUTPUT_DIR_ACTIVITIES, filename)
+    return md_content
+
+def run(lang: str = 'es', force: bool = False, data=None, out=None, cache=None, weeks=None,
+        filenames=None):
+    """
+    Generates activity skeleton files.
+    
+    Args:
+        lang (str): Language code.
+        force (bool): Whether to overwrite existing files.
+        data (Course|dict, optional): Already parsed course (read from disk if omitted).
+        out (OutputTree, optional): Output root (defaults to the working directory).
+        cache (BuildCache, optional): Build cache consulted before rendering each activity.
+        weeks (list, optional): Week numbers to generate (see course_model.parse_weeks); all by default.
+        filenames (set, optional): Only generate these activity files (e.g. the activities
+            added since the last run, see syllabus_diff); every activity of the weeks by default.
+    """
+    t = TRANSLATIONS.get(lang, TRANSLATIONS['es'])
+    out = out or DEFAULT_TREE
 
-            if os.path.exists(filepath) and not force:
-                print(f"Skipping existing file: {filepath} (use --force to overwrite)")
+    if not out.exists(OUTPUT_DIR_ACTIVITIES):
+        out.makedirs(OUTPUT_DIR_ACTIVITIES)
+        logger.debug(f"Created directory: {OUTPUT_DIR_ACTIVITIES}")
+
+    logger.debug("Reading configuration...")
+    try:
+        course = as_course(data if data is not None else load_json())
+    except Exception as e:
+        logger.error(f"Error reading JSON file: {e}")
+        out.count('failed')
+        return
+
+    counts = Counter()
+    for entry in course.select(weeks):
+        folder = os.path.join(OUTPUT_DIR_ACTIVITIES, entry.folder)
+        if entry.folder and entry.activities and not out.exists(folder):
+            out.makedirs(folder)
+        for activity in entry.activities:
+            if filenames is not None and activity.filename not in filenames:
                 continue
+            filepath = os.path.join(folder, activity.filename)
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(md_content)
+            if out.exists(filepath) and not force:
+                logger.debug(f"Skipping existing file: {filepath} (use --force to overwrite)",
+                             extra={'week': entry.number, 'file': filepath})
+                out.count('skipped')
+                counts['skipped'] += 1
+                continue
+
+            if cache is not None:
+                key = cache.key(__file__, lang, activity)
+                _, md_content = cache.get(key) or cache.put(key, filepath, render_activity(activity, t))
+            else:
+                md_content = render_activity(activity, t)
+
+            out.write_text(filepath, md_content)
             
-            print(f"Generated: {filepath}")
+            logger.debug(f"Generated: {filepath}", extra={'week': entry.number, 'file': filepath})
+            counts['generated'] += 1
+
+    logger.debug(f"Activity files: {counts['generated']} generated, {counts['skipped']} skipped")
 
 def main():
     parser = argparse.ArgumentParser(description='Generate activity skeleton files from planeamiento.json.')
     parser.add_argument('--force', action='store_true', help='Overwrite existing files')
     parser.add_argument('--lang', default='es', choices=['es', 'en', 'fr'], help='Language for generated content')
+    parser.add_argument('--weeks', help='Weeks to generate, as numbers and ranges (e.g., 3,5-9)')
     args = parser.parse_args()
+    try:
+        weeks = parse_weeks(args.weeks) if args.weeks else None
+    except ValueError as e:
+        parser.error(str(e))
     
-    run(lang=args.lang, force=args.force)
+    run(lang=args.lang, force=args.force, weeks=weeks)
 
 if __name__ == "__main__":
     main()
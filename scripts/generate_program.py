@@ -10,36 +10,59 @@ try:
     from utils import (
         load_json, TRANSLATIONS
     )
+    from course_model import as_course
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
 except ImportError:
     # Fallback for when running from root
     sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
     from utils import (
         load_json, TRANSLATIONS
     )
+    from course_model import as_course
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
 
-def run(lang: str = 'es', init: bool = False):
+logger = get_logger('generate_program')
+
+def run(lang: str = 'es', init: bool = False, data=None, out=None, cache=None):
     """
     Generates programa.md.
     
     Args:
         lang (str): Language code.
         init (bool): Only create if missing.
+        data (Course|dict, optional): Already parsed course (read from disk if omitted).
+        out (OutputTree, optional): Output root (defaults to the working directory).
+        cache (BuildCache, optional): Build cache consulted before rendering.
     """
     output_file = 'programa.md'
-    if init and os.path.exists(output_file):
-        print(f"Skipping {output_file}: already exists (and --init flag used).")
+    out = out or DEFAULT_TREE
+    if init and out.exists(output_file):
+        logger.info(f"Skipping {output_file}: already exists (and --init flag used).")
+        out.count('skipped')
         return
 
     t = TRANSLATIONS.get(lang, TRANSLATIONS['es'])
     
     try:
-        data = load_json()
-        metadata = data.get('metadata', {})
-        weeks = data.get('weeks', [])
+        course = as_course(data if data is not None else load_json())
+        metadata = course.metadata
+        weeks = course.weeks
     except Exception as e:
-        print(f"Error reading planeamiento.json: {e}")
+        logger.error(f"Error reading planeamiento.json: {e}", extra={'file': output_file})
+        out.count('failed')
         return
 
+    key = None
+    if cache is not None:
+        key = cache.key(__file__, lang, metadata, weeks)
+        cached = cache.get(key)
+        if cached:
+            out.write_text(output_file, cached[1])
+            logger.info(f"✅ Restored {output_file} from build cache")
+            return
+
     # Extract metadata
     title = metadata.get('title', 'Course Title')
     semester = metadata.get('semester', 'Semester')
@@ -97,18 +120,18 @@ author: {author_name}
         md_content += f"| {week_header} | Title | Content |\n"
         md_content += "| :--- | :--- | :--- |\n"
         for w in weeks:
-            num = w.get('week', '?')
-            w_title = w.get('title', '')
-            w_content = w.get('content', [])
-            content_str = ", ".join(w_content) if isinstance(w_content, list) else str(w_content)
+            num = w.number if w.number is not None else '?'
+            w_title = w.title or ''
+            content_str = ", ".join(w.content)
             # Escaping pipe in content just in case
             content_str = content_str.replace('|', '-')
             md_content += f"| {num} | {w_title} | {content_str} |\n"
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(md_content)
+    if cache is not None:
+        cache.put(key, output_file, md_content)
+    out.write_text(output_file, md_content)
     
-    print(f"✅ Generated {output_file}")
+    logger.info(f"✅ Generated {output_file}")
 
 def main():
     parser = argparse.ArgumentParser(description='Generate programa.md from planeamiento.json')
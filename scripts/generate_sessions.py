@@ -3,10 +3,13 @@
 Script to generate markdown session files from planeamiento.json.
 
 This script reads 'planeamiento.json', extracting content for each week,
-and generates structured Markdown files with YAML frontmatter in the 'sessions/' directory.
+and generates structured Markdown files with YAML frontmatter in the 'sessions/' directory
+(in its unit subdirectories with the sharded layout, see course_model.py).
 """
 
 import argparse
+from collections import Counter
+import posixpath
 import sys
 import os
 import yaml
@@ -16,16 +19,144 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from utils import (
-        load_json, generate_filename, OUTPUT_DIR_SESSIONS, TRANSLATIONS
+        load_json, generate_filename, OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, TRANSLATIONS
     )
+    from course_model import as_course, parse_weeks
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
+    from keywords import extract_keywords
 except ImportError:
     # Fallback for when running from root
     sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
     from utils import (
-        load_json, generate_filename, OUTPUT_DIR_SESSIONS, TRANSLATIONS
+        load_json, generate_filename, OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, TRANSLATIONS
     )
+    from course_model import as_course, parse_weeks
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
+    from keywords import extract_keywords
 
-def run(lang: str = 'es', week: int = None, force: bool = False):
+logger = get_logger('generate_sessions')
+
+def session_title(entry, t: dict) -> str:
+    """Title of a week's session: its own title, or the translated "Session N"."""
+    return entry.title or f"{t['session']} {int(entry.number)}"
+
+def session_path(entry, t: dict) -> str:
+    """
+    Path of a week's session page relative to the output root.
+
+    create_myst_config builds the TOC entries with it, so myst.yml points at
+    the generated files from the start. t is only read for a week without a
+    title, so it may be None for the others.
+    """
+    return posixpath.join(OUTPUT_DIR_SESSIONS, entry.folder, generate_filename(entry.number, session_title(entry, t)))
+
+def render_session(entry, t: dict, course_name: str, keywords=None) -> tuple:
+    """
+    Renders the markdown of one session.
+
+    Args:
+        entry (Week): Week record.
+        t (dict): Translations for the output language.
+        course_name (str): Course title used as the session subject.
+        keywords (list, optional): Keywords of the week from keywords.extract_keywords();
+            the title words longer than four characters if omitted.
+
+    Returns:
+        tuple: (relative file path, markdown content)
+    """
+    week_num = entry.number
+
+    # Content extraction
+    content_list = entry.content
+    objectives = entry.objectives
+    evaluation_list = entry.evaluation
+    references_list = entry.references
+
+    # Process Title (First item of content or generic)
+    title = session_title(entry, t)
+    subtitle = entry.subtitle or f"{t['week']} {int(week_num)}"
+
+    if keywords is None:
+        keywords = [word for word in title.split() if len(word) > 4]
+
+    # Construct Frontmatter
+    frontmatter = {
+        'title': title,
+        'subtitle': subtitle,
+        'subject': course_name,
+        'session': {
+            'number': int(week_num),
+            'duration': "TBD",
+            'modality': t['modality']
+        },
+        'keywords': keywords,
+        'learning_objectives': objectives,
+        'activities': entry.activities_value(),
+        'evaluation': [e.to_dict() for e in evaluation_list],
+        'references': [r.to_dict() for r in references_list]
+    }
+    
+    # Construct Markdown Body
+    yaml_frontmatter = yaml.dump(frontmatter, allow_unicode=True, sort_keys=False)
+    
+    md_content = f"---\n{yaml_frontmatter}---\n\n"
+    
+    # Format Contents as Badges
+    if content_list:
+        badges = []
+        for item in content_list:
+             # Escape characters for shields.io: - -> --, _ -> __, space -> _
+             safe_item = item.replace('-', '--').replace('_', '__').replace(' ', '_').replace('?', '%3F')
+             # Use lightgrey color
+             badge_url = f"https://img.shields.io/badge/-{safe_item}-lightgrey"
+             badges.append(f"![]({badge_url})")
+        md_content += " ".join(badges) + "\n\n"
+
+    # Add Objectives Block
+    if objectives:
+        md_content += f":::{{note}} {t['objectives']}\n"
+        md_content += f"{t['objectives_intro']}\n"
+        for i, obj in enumerate(objectives, 1):
+            md_content += f"{i}. {obj}\n"
+        md_content += ":::\n\n"
+    
+
+    # Helper to link activities
+    if entry.activities:
+        md_content += f"## {t['activities']}\n\n"
+
+        # Activities of a unit live in the matching activities/ subdirectory
+        activity_dir = posixpath.relpath(posixpath.join(OUTPUT_DIR_ACTIVITIES, entry.folder),
+                                         posixpath.join(OUTPUT_DIR_SESSIONS, entry.folder))
+        for act in entry.activities:
+            link = f"[{act.description}]({activity_dir}/{act.filename})"
+            md_content += f"- {link}\n"
+
+        md_content += "\n"
+    
+    if evaluation_list:
+        md_content += f"## {t['evaluation']}\n\n"
+        for eval_item in evaluation_list:
+            etype = eval_item.type or t['evaluation']
+            desc = eval_item.description or ''
+            md_content += f"- **{etype}**: {desc}\n"
+        md_content += "\n"
+    
+    if references_list:
+        md_content += f"## {t['references']}\n\n"
+        for ref in references_list:
+            ref_str = f"{ref.text}"
+            if ref.pages:
+                ref_str += f", {ref.pages}"
+            md_content += f"- {ref_str}\n"
+        md_content += "\n"
+
+    return session_path(entry, t), md_content
+
+def run(lang: str = 'es', week: int = None, force: bool = False, data=None, out=None, cache=None,
+        weeks=None):
     """
     Generates session markdown files.
     
@@ -33,150 +164,90 @@ def run(lang: str = 'es', week: int = None, force: bool = False):
         lang (str): Language code ('es', 'en', 'fr').
         week (int, optional): Specific week to generate.
         force (bool): Whether to overwrite existing files.
+        data (Course|dict, optional): Already parsed course (read from disk if omitted).
+        out (OutputTree, optional): Output root (defaults to the working directory).
+        cache (BuildCache, optional): Build cache consulted before rendering each session.
+        weeks (list, optional): Week numbers to generate (see course_model.parse_weeks); all by default.
     """
     t = TRANSLATIONS.get(lang, TRANSLATIONS['es'])
+    out = out or DEFAULT_TREE
 
-    if not os.path.exists(OUTPUT_DIR_SESSIONS):
-        os.makedirs(OUTPUT_DIR_SESSIONS)
-        print(f"Created directory: {OUTPUT_DIR_SESSIONS}")
+    if not out.exists(OUTPUT_DIR_SESSIONS):
+        out.makedirs(OUTPUT_DIR_SESSIONS)
+        logger.debug(f"Created directory: {OUTPUT_DIR_SESSIONS}")
 
-    print(f"Reading configuration...")
+    logger.debug("Reading configuration...")
     try:
-        full_data = load_json()
-        data = full_data.get('weeks', [])
-        metadata = full_data.get('metadata', {})
+        course = as_course(data if data is not None else load_json())
     except Exception as e:
-        print(f"Error reading JSON file: {e}")
+        logger.error(f"Error reading JSON file: {e}")
+        out.count('failed')
         return
 
-    # Filter data if week argument is provided
-    if week:
-        print(f"Filtering for week {week}...")
-        data = [entry for entry in data if entry.get('week') == week]
-        if not data:
-            print(f"No data found for week {week}")
+    entries = course.weeks
+    # Filter data if a week selection is provided
+    selection = [week] if week else weeks
+    if selection is not None:
+        logger.debug(f"Filtering for week(s) {', '.join(map(str, selection))}...")
+        entries = course.select(selection)
+        found = {int(e.number) for e in entries}
+        for number in selection:
+            if number not in found:
+                logger.warning(f"No data found for week {number}", extra={'week': number})
+        if not entries:
             return
 
     # Defaults from metadata or fallback
-    course_name = metadata.get('title', "your course name")
+    course_name = course.metadata.get('title', "your course name")
+
+    # TF-IDF needs the whole course, also when only some weeks are generated
+    course_keywords = extract_keywords(course)
 
-    for entry in data:
+    counts = Counter()
+    folders = {OUTPUT_DIR_SESSIONS}
+    for entry in entries:
+        filepath = None
         try:
-            week_num = entry.get('week')
+            week_num = entry.number
             if not week_num:
                 continue
             
-            # Content extraction
-            content_list = entry.get('content', [])
-            objectives = entry.get('objectives', [])
-            activities = entry.get('activities', "")
-            evaluation_list = entry.get('evaluation', [])
-            references_list = entry.get('references', [])
-
-            # Process Title (First item of content or generic)
-            title = entry.get('title', f"{t['session']} {int(week_num)}")
-            subtitle = entry.get('subtitle', f"{t['week']} {int(week_num)}")
-
-            # Process Keywords (simple extraction from title)
-            keywords = [word for word in title.split() if len(word) > 4]
-
-            # Construct Frontmatter
-            frontmatter = {
-                'title': title,
-                'subtitle': subtitle,
-                'subject': course_name,
-                'session': {
-                    'number': int(week_num),
-                    'duration': "TBD",
-                    'modality': t['modality']
-                },
-                'keywords': keywords,
-                'learning_objectives': objectives,
-                'activities': activities,
-                'evaluation': evaluation_list,
-                'references': references_list
-            }
-            
-            # Construct Markdown Body
-            yaml_frontmatter = yaml.dump(frontmatter, allow_unicode=True, sort_keys=False)
-            
-            md_content = f"---\n{yaml_frontmatter}---\n\n"
-            
-            # Format Contents as Badges
-            if content_list:
-                badges = []
-                for item in content_list:
-                     # Escape characters for shields.io: - -> --, _ -> __, space -> _
-                     safe_item = item.replace('-', '--').replace('_', '__').replace(' ', '_').replace('?', '%3F')
-                     # Use lightgrey color
-                     badge_url = f"https://img.shields.io/badge/-{safe_item}-lightgrey"
-                     badges.append(f"![]({badge_url})")
-                md_content += " ".join(badges) + "\n\n"
-
-            # Add Objectives Block
-            if objectives:
-                md_content += f":::{{note}} {t['objectives']}\n"
-                md_content += f"{t['objectives_intro']}\n"
-                for i, obj in enumerate(objectives, 1):
-                    md_content += f"{i}. {obj}\n"
-                md_content += ":::\n\n"
-            
-
-            # Helper to link activities
-            if activities:
-                md_content += f"## {t['activities']}\n\n"
-                
-                # Normalize to list
-                act_list = []
-                if isinstance(activities, str):
-                    act_list.append(activities)
-                elif isinstance(activities, list):
-                    act_list = activities
-                
-                for act_desc in act_list:
-                    # We use generate_filename from utils
-                    act_file = generate_filename(week_num, act_desc)
-                    # Link to the activity file in activities/ directory
-                    link = f"[{act_desc}](../activities/{act_file})"
-                    md_content += f"- {link}\n"
-
-                md_content += "\n"
-            
-            if evaluation_list:
-                md_content += f"## {t['evaluation']}\n\n"
-                for eval_item in evaluation_list:
-                    etype = eval_item.get('type', t['evaluation'])
-                    desc = eval_item.get('description', '')
-                    md_content += f"- **{etype}**: {desc}\n"
-                md_content += "\n"
-            
-            if references_list:
-                md_content += f"## {t['references']}\n\n"
-                for ref in references_list:
-                    text = ref.get('text', '')
-                    pages = ref.get('pages', '')
-                    ref_str = f"{text}"
-                    if pages:
-                        ref_str += f", {pages}"
-                    md_content += f"- {ref_str}\n"
-                md_content += "\n"
+            keywords = course_keywords.get(week_num, [])
+            if cache is not None:
+                key = cache.key(__file__, lang, course_name, entry, keywords)
+                filepath, md_content = cache.get(key) or cache.put(
+                    key, *render_session(entry, t, course_name, keywords=keywords))
+            else:
+                filepath, md_content = render_session(entry, t, course_name, keywords=keywords)
 
-            # Write file
-            filename = generate_filename(week_num, title)
-            filepath = os.path.join(OUTPUT_DIR_SESSIONS, filename)
-            
-            if os.path.exists(filepath) and not force:
-                print(f"Skipping existing file: {filepath} (use --force to overwrite)")
+            if out.exists(filepath) and not force:
+                logger.debug(f"Skipping existing file: {filepath} (use --force to overwrite)",
+                             extra={'week': week_num, 'file': filepath})
+                out.count('skipped')
+                counts['skipped'] += 1
                 continue
 
+            folder = os.path.dirname(filepath)
+            if folder not in folders:
+                if not out.exists(folder):
+                    out.makedirs(folder)
+                folders.add(folder)
+
             # Write file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(md_content)
+            out.write_text(filepath, md_content)
             
-            print(f"Generated: {filepath}")
+            logger.debug(f"Generated: {filepath}", extra={'week': week_num, 'file': filepath})
+            counts['generated'] += 1
 
         except Exception as e:
-            print(f"Error processing week {entry.get('week')}: {e}")
+            where = f" ({filepath})" if filepath else ''
+            logger.error(f"Error processing week {entry.number}{where}: {e}",
+                         extra={'week': entry.number, 'file': filepath})
+            out.count('failed')
+            counts['failed'] += 1
+
+    logger.debug(f"Session files: {counts['generated']} generated, {counts['skipped']} skipped, "
+                 f"{counts['failed']} failed")
 
 def main():
     """
@@ -187,12 +258,17 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     parser.add_argument('--week', type=int, help='Specific week number to generate (e.g., 1)')
+    parser.add_argument('--weeks', help='Weeks to generate, as numbers and ranges (e.g., 3,5-9)')
     parser.add_argument('--force', action='store_true', help='Overwrite existing files')
     parser.add_argument('--lang', type=str, default='es', choices=['es', 'en', 'fr'],
                        help='Output language: es (Spanish), en (English), or fr (French). Default: es')
     args = parser.parse_args()
+    try:
+        weeks = parse_weeks(args.weeks) if args.weeks else None
+    except ValueError as e:
+        parser.error(str(e))
     
-    run(lang=args.lang, week=args.week, force=args.force)
+    run(lang=args.lang, week=args.week, force=args.force, weeks=weeks)
 
 if __name__ == "__main__":
     main()
@@ -4,6 +4,7 @@ Script to generate a markdown table of all sessions and their learning objective
 Version: JSON Source (planeamiento.json)
 """
 import argparse
+import re
 import sys
 import os
 
@@ -12,81 +13,128 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from utils import load_json, TRANSLATIONS
+    from course_model import as_course, parse_weeks
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
 except ImportError:
     # Fallback for when running from root
     sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
     from utils import load_json, TRANSLATIONS
+    from course_model import as_course, parse_weeks
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
 
-# ANSI Colors
-CYAN = "\033[96m"
-GREEN = "\033[92m"
-RED = "\033[91m"
-RESET = "\033[0m"
+logger = get_logger('generate_sessions_table_json')
 
 OUTPUT_FILE = "sessions_table.md"
 
-def run(lang: str = 'es'):
+# A table row starts with its week cell: "| 3 | Title | ... |"
+ROW_RE = re.compile(r'^\| ([^|]*?) \|')
+
+def render_row(entry) -> str:
+    """Renders the table row of one week."""
+    week = entry.number if entry.number is not None else ''
+    title = entry.title or ''
+    
+    # Clean title (remove numbers like "1. ")
+    if isinstance(title, str) and "." in title[:3]:
+         parts = title.split(".", 1)
+         if len(parts) > 1: title = parts[1].strip()
+
+    if entry.inline_objectives:
+        formatted_objectives = entry.objectives_value()
+    else:
+        formatted_objectives = "<ul>" + "".join([f"<li>{o}</li>" for o in entry.objectives]) + "</ul>"
+
+    # Escape pipes
+    title = str(title).replace("|", "&#124;")
+    formatted_objectives = formatted_objectives.replace("|", "&#124;")
+
+    return f"| {week} | {title} | {formatted_objectives} |\n"
+
+def update_rows(content: str, rows: dict, order: list) -> str:
+    """
+    Replaces (or adds) the rows of some weeks in an existing table, leaving every other line as it is.
+
+    Args:
+        content (str): Current sessions_table.md.
+        rows (dict): Week cell (e.g. '3') -> new row.
+        order (list): Week cells in course order, used to place added rows.
+
+    Returns:
+        str: Updated table.
+    """
+    header, existing = [], {}
+    for line in content.splitlines(keepends=True):
+        match = ROW_RE.match(line)
+        # Only rows after the separator line are data rows
+        if match and any(h.startswith('|--') for h in header):
+            existing[match.group(1)] = line
+        else:
+            header.append(line)
+    existing.update(rows)
+    known = [key for key in order if key in existing]
+    in_course = set(order)
+    stale = [key for key in existing if key not in in_course]
+    return "".join(header) + "".join(existing[key] for key in known + stale)
+
+def run(lang: str = 'es', data=None, out=None, weeks=None):
     """
     Generates the sessions table markdown file.
     
     Args:
         lang (str): Language code.
+        data (Course|dict, optional): Already parsed course (read from disk if omitted).
+        out (OutputTree, optional): Output root (defaults to the working directory).
+        weeks (list, optional): Only rewrite the rows of these weeks when the table
+            already exists (see course_model.parse_weeks); the whole table by default.
     """
     t = TRANSLATIONS.get(lang, TRANSLATIONS['es'])
+    out = out or DEFAULT_TREE
     
-    print(f"{CYAN}{t.get('generating', 'Generating {0}...').format(OUTPUT_FILE)}{RESET}")
+    logger.debug(t.get('generating', 'Generating {0}...').format(OUTPUT_FILE))
 
     try:
-        data = load_json()
-        weeks = data.get('weeks', [])
+        course = as_course(data if data is not None else load_json())
     except Exception as e:
-        print(f"{RED}{t.get('error', 'Error: {0}').format(e)}{RESET}")
+        logger.error(t.get('error', 'Error: {0}').format(e), extra={'file': OUTPUT_FILE})
+        out.count('failed')
         return
 
     try:
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        if weeks is not None and out.exists(OUTPUT_FILE):
+            order = [str(entry.number if entry.number is not None else '') for entry in course.weeks]
+            rows = {str(entry.number): render_row(entry) for entry in course.select(weeks)}
+            out.write_text(OUTPUT_FILE, update_rows(out.read_text(OUTPUT_FILE), rows, order))
+        else:
             header_title = t.get('header_title', 'Sessions Table')
             col_week = t.get('col_week', 'Week')
             col_title = t.get('col_title', 'Title')
             col_objectives = t.get('col_objectives', 'Objectives')
-            
-            f.write(f"## {header_title}\n\n")
-            f.write(f"| {col_week} | {col_title} | {col_objectives} |\n")
-            f.write("|--------|--------|---------------------------|\n")
-
-            for entry in weeks:
-                week = entry.get('week', '')
-                title = entry.get('title', '')
-                
-                # Clean title (remove numbers like "1. ")
-                if isinstance(title, str) and "." in title[:3]:
-                     parts = title.split(".", 1)
-                     if len(parts) > 1: title = parts[1].strip()
-
-                objectives = entry.get('objectives', [])
-
-                if isinstance(objectives, list):
-                    formatted_objectives = "<ul>" + "".join([f"<li>{o}</li>" for o in objectives]) + "</ul>"
-                elif objectives:
-                    formatted_objectives = str(objectives)
-                else:
-                    formatted_objectives = ""
-
-                # Escape pipes
-                title = str(title).replace("|", "&#124;")
-                formatted_objectives = formatted_objectives.replace("|", "&#124;")
-
-                f.write(f"| {week} | {title} | {formatted_objectives} |\n")
-
-        print(f"{GREEN}{t.get('success', 'Success').format(OUTPUT_FILE)}{RESET}")
+
+            lines = [
+                f"## {header_title}\n\n",
+                f"| {col_week} | {col_title} | {col_objectives} |\n",
+                "|--------|--------|---------------------------|\n",
+            ]
+            lines.extend(render_row(entry) for entry in course.weeks)
+            out.write_text(OUTPUT_FILE, "".join(lines))
+
+        logger.info(t.get('success', 'Success').format(OUTPUT_FILE))
     except Exception as e:
-         print(f"{RED}Error writing file: {e}{RESET}")
+        logger.error(f"Error writing {OUTPUT_FILE}: {e}", extra={'file': OUTPUT_FILE})
+        out.count('failed')
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--lang', default='es', choices=['es', 'en', 'fr'])
+    parser.add_argument('--weeks', help='Only update the rows of these weeks (e.g., 3,5-9)')
     args = parser.parse_args()
-    run(lang=args.lang)
+    try:
+        weeks = parse_weeks(args.weeks) if args.weeks else None
+    except ValueError as e:
+        parser.error(str(e))
+    run(lang=args.lang, weeks=weeks)
 
 if __name__ == "__main__":
     main()
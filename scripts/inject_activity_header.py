@@ -3,24 +3,52 @@ Injects visual badges into activity markdown files based on frontmatter metadata
 
 Reads activities from the configured directory and prepends Shields.io badges
 for type, duration, modality and difficulty in the selected language.
+
+Files are discovered with a single scandir pass (plus one per unit
+subdirectory in the sharded layout); files whose mtime and size match the
+last run for the same language are skipped without being opened.
 """
 
-import glob
+import logging
 import re
 import yaml
 import os
 import sys
 import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 # Add local directory to path to allow imports if running directly
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from utils import OUTPUT_DIR_ACTIVITIES
+    from utils import OUTPUT_DIR_ACTIVITIES, UNIT_DIR_RE
+    from output_tree import DEFAULT_TREE
+    from file_discovery import default_stat_index
+    from build_cache import generator_hash
+    from course_model import parse_weeks
+    from log_config import get_logger
+    from managed_blocks import ManagedBlocks, MarkerError, FRONTMATTER_RE
 except ImportError:
     # Fallback for when running from root
     sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
-    from utils import OUTPUT_DIR_ACTIVITIES
+    from utils import OUTPUT_DIR_ACTIVITIES, UNIT_DIR_RE
+    from output_tree import DEFAULT_TREE
+    from file_discovery import default_stat_index
+    from build_cache import generator_hash
+    from course_model import parse_weeks
+    from log_config import get_logger
+    from managed_blocks import ManagedBlocks, MarkerError, FRONTMATTER_RE
+
+logger = get_logger('inject_activity_header')
+
+# Activity files start with their week number: "03-lab.md"
+WEEK_PREFIX_RE = re.compile(r'^(\d+)-')
+
+# Managed region holding the badges, right after the frontmatter
+BADGE_BLOCK = 'ACTIVITY-BADGES'
+BLOCKS = ManagedBlocks([BADGE_BLOCK])
 
 # Translations configuration
 TRANSLATIONS = {
@@ -77,24 +105,32 @@ def generate_badges(activity_data, lang='es'):
 
     return " ".join(badges)
 
-def process_file(filepath, lang='es'):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+def inject_badges(filepath, content, lang='es'):
+    """
+    Computes the badge update for one activity file without touching the disk.
+
+    Pure function of its arguments, so it can run in worker processes.
 
-    # Regex to extract frontmatter
+    Args:
+        filepath (str): Path used in log messages.
+        content (str): Current file content.
+        lang (str): Language for badge labels.
+
+    Returns:
+        tuple: (action, new content, log message). action is 'Injected',
+        'Updated', 'No change', 'Skipped' or 'Error'; message may be None.
+    """
     # Matches starting ---, content, ending ---
-    match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
+    match = FRONTMATTER_RE.match(content)
     
     if not match:
-        print(f"Skipping {filepath}: No frontmatter found.")
-        return
+        return 'Skipped', content, f"Skipping {filepath}: No frontmatter found."
 
     frontmatter_raw = match.group(1)
     try:
         data = yaml.safe_load(frontmatter_raw)
     except yaml.YAMLError as e:
-        print(f"Error parsing YAML in {filepath}: {e}")
-        return
+        return 'Error', content, f"Error parsing YAML in {filepath}: {e}"
     
     # Fallback: check if we have data in top level (simpler frontmatter) matches what generate_activities producs
     # generate_activities produces flat frontmatter: title, duration, modality, difficulty. 
@@ -111,58 +147,114 @@ def process_file(filepath, lang='es'):
             activity_data = {k: data[k] for k in keys if k in data}
     
     if not activity_data:
-         # print(f"Skipping {filepath}: No activity metadata found.")
          # Silent skip to avoid noise on non-activity files if any
-         return
+         return 'Skipped', content, None
 
     badges_line = generate_badges(activity_data, lang=lang)
-    
-    # Construct the marker line
-    marker = "<!-- ACTIVITY-BADGES -->"
-    new_badges_block = f"{marker}\n{badges_line}\n{marker}"
 
-    # Check if we already have badges to replace
-    # We look for the block between markers
-    pattern = re.compile(f"{re.escape(marker)}.*?{re.escape(marker)}", re.DOTALL)
-    
-    if pattern.search(content):
-        # Update existing badges
-        new_content = pattern.sub(new_badges_block, content)
-        action = "Updated"
-    else:
-        # Insert after frontmatter
-        # match.end() gives the index after the closing ---
-        # We want to insert strictly after the matches end index, which includes the newline
-        end_index = match.end()
-        new_content = content[:end_index] + "\n" + new_badges_block + "\n" + content[end_index:]
-        action = "Injected"
+    # Replace the existing block in place, or insert it after the frontmatter
+    try:
+        new_content, actions = BLOCKS.update(content, {BADGE_BLOCK: badges_line}, start=match.end())
+    except MarkerError as e:
+        return 'Error', content, f"Cannot update badges in {filepath}: {e}"
+
+    action = {'inserted': 'Injected', 'updated': 'Updated'}.get(actions[BADGE_BLOCK])
+    if action is None:
+        return 'No change', content, f"No changes needed for {filepath}"
+    return action, new_content, f"{action} badges in {filepath}"
 
+def _apply(filepath, content, result, out):
+    """Writes and logs the result of inject_badges(); returns the action."""
+    action, new_content, message = result
     if new_content != content:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        print(f"{action} badges in {filepath}")
-    else:
-        print(f"No changes needed for {filepath}")
+        out.write_text(filepath, new_content)
+    if message:
+        week = WEEK_PREFIX_RE.match(os.path.basename(filepath))
+        context = {'file': filepath, 'week': int(week.group(1)) if week else None}
+        # Per-file results are debug output; parse errors must always be seen
+        logger.log(logging.ERROR if action == 'Error' else logging.DEBUG, message, extra=context)
+    return action
 
-def run(lang: str = 'es'):
+def process_file(filepath, lang='es', out=None):
+    out = out or DEFAULT_TREE
+    content = out.read_text(filepath)
+    return _apply(filepath, content, inject_badges(filepath, content, lang), out)
+
+def run(lang: str = 'es', out=None, incremental: bool = True, jobs: int = 1, weeks=None):
     """
     Injects activity badges into activity files.
     
     Args:
         lang (str): Language code.
+        out (OutputTree, optional): Output root (defaults to the working directory).
+        incremental (bool): Skip files unchanged (mtime and size) since the last run.
+        jobs (int): Worker processes for YAML parsing and badge rendering (1 = in process).
+            Files are read and written by this process, and results are logged in
+            file order, so the output does not depend on scheduling.
+        weeks (list, optional): Only process the activity files of these weeks (their
+            "NN-" filename prefix); all files by default.
     """
-    search_path = os.path.join(OUTPUT_DIR_ACTIVITIES, "*.md")
-    files = sorted(glob.glob(search_path))
-    print(f"Found {len(files)} activity files. Language: {lang}")
-    for f in files:
-        process_file(f, lang=lang)
+    out = out or DEFAULT_TREE
+    if weeks is None:
+        entries = out.scan(OUTPUT_DIR_ACTIVITIES, extensions='.md', subdirs=UNIT_DIR_RE)
+    else:
+        # One scan, filtered on the names; an empty selection matches nothing
+        prefixes = tuple(f"{n:02d}-" for n in weeks)
+        entries = out.scan(OUTPUT_DIR_ACTIVITIES, prefix=prefixes, extensions='.md',
+                           subdirs=UNIT_DIR_RE) if prefixes else []
+    logger.debug(f"Found {len(entries)} activity files. Language: {lang}")
+
+    # In-memory trees (--plan) never write, so their results must not be remembered
+    index = default_stat_index('inject_activity_header', out.root) if incremental and out.writes_to_disk else None
+    # Badges depend on the language and on this script's labels
+    tag = f"{lang}:{generator_hash(__file__)[:16]}"
+
+    todo = [e for e in entries if index is None or not index.unchanged(out.path(e.path), e, tag)]
+    counts = Counter({'Unchanged': len(entries) - len(todo)})
+    actions = []
+
+    if jobs > 1 and len(todo) > 1:
+        paths = [e.path for e in todo]
+        contents = [out.read_text(path) for path in paths]
+        chunksize = max(1, len(paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # map() yields in submission order: logs and writes stay deterministic
+            results = pool.map(inject_badges, paths, contents, repeat(lang), chunksize=chunksize)
+            for path, content, result in zip(paths, contents, results):
+                actions.append(_apply(path, content, result, out))
+    else:
+        for entry in todo:
+            actions.append(process_file(entry.path, lang=lang, out=out))
+    counts.update(actions)
+
+    if index is not None:
+        for entry, action in zip(todo, actions):
+            # Files that failed stay out of the index so the error is reported again next run
+            if action != 'Error':
+                index.record(out.path(entry.path), tag)
+        index.save()
+
+    summary = ', '.join(f"{action}: {counts[action]}" for action in
+                        ('Injected', 'Updated', 'No change', 'Unchanged', 'Skipped', 'Error') if counts[action])
+    logger.info(f"Badge injection summary: {summary or 'no activity files'}")
+    # Injected/Updated files were counted by the tree when written
+    out.count('unchanged', counts['No change'] + counts['Unchanged'])
+    out.count('skipped', counts['Skipped'])
+    out.count('failed', counts['Error'])
 
 def main():
     parser = argparse.ArgumentParser(description='Inject badges into activity files.')
     parser.add_argument('--lang', default='es', choices=['es', 'en', 'fr'], help='Language for badge labels')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Process activity files in N worker processes (default: 1)')
+    parser.add_argument('--weeks', help='Only process these weeks, as numbers and ranges (e.g., 3,5-9)')
     args = parser.parse_args()
+    try:
+        weeks = parse_weeks(args.weeks) if args.weeks else None
+    except ValueError as e:
+        parser.error(str(e))
     
-    run(lang=args.lang)
+    run(lang=args.lang, jobs=args.jobs, weeks=weeks)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,167 @@
+"""
+Course-wide keyword extraction for the session frontmatter.
+
+The titles, content items and objectives of every week are tokenised once
+and scored with TF-IDF over the whole course, so a session's keywords are
+the terms that characterise that week rather than words every week uses.
+
+    tf(t, w)  = count of t in week w / tokens in week w
+    idf(t)    = ln((1 + weeks) / (1 + weeks containing t)) + 1
+    score     = tf * idf        (top-k per week, ties in first-seen order)
+
+Counting is vectorised with NumPy when it is installed; the pure-Python
+fallback produces the same keywords.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: the pure-Python path below gives the same result
+    np = None
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import load_json
+    from course_model import as_course
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import load_json
+    from course_model import as_course
+
+DEFAULT_TOP_K = 5
+
+# Title words count this many times: the title names the topic of the week
+TITLE_WEIGHT = 2
+
+# Letters only (accents included); digits and punctuation split tokens
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+
+# Function words of the supported languages (es, en, fr)
+STOPWORDS = frozenset("""
+    and are but can for from has have how into its not our that the their them then these they this
+    those through use used using was were what when where which who why will with within without
+    you your all any each more most other some such than very also been being both between
+
+    aux avec ces comme dans des elle est les leur mais nos notre par pas pour qui que quoi sans ses
+    sont sur une vos votre
+
+    con como del desde las los más mediante para pero por que qué sin sobre sus una uno unos unas
+    entre este esta estos estas ese esa son ser
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words of three or more letters, stopwords removed."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _documents(course) -> tuple:
+    """Week numbers and token lists of the numbered weeks."""
+    numbers, documents = [], []
+    for w in course.numbered_weeks():
+        tokens = tokenize(w.title or '') * TITLE_WEIGHT
+        for item in w.content:
+            tokens += tokenize(item)
+        for objective in w.objectives:
+            tokens += tokenize(objective)
+        numbers.append(w.number)
+        documents.append(tokens)
+    return numbers, documents
+
+
+def _idf(df: List[int], n_docs: int) -> List[float]:
+    # Computed with math.log in both paths so the scores match bit for bit
+    return [math.log((1 + n_docs) / (1 + d)) + 1 for d in df]
+
+
+def _top_k_python(documents: List[List[int]], vocab_size: int, k: int) -> List[List[int]]:
+    counts = [Counter(doc) for doc in documents]
+    df = [0] * vocab_size
+    for c in counts:
+        for term in c:
+            df[term] += 1
+    idf = _idf(df, len(documents))
+    result = []
+    for doc, c in zip(documents, counts):
+        length = len(doc)
+        ranked = sorted(c, key=lambda term: (-(c[term] / length * idf[term]), term))
+        result.append(ranked[:k])
+    return result
+
+
+def _top_k_numpy(documents: List[List[int]], vocab_size: int, k: int) -> List[List[int]]:
+    lengths = np.fromiter((len(doc) for doc in documents), dtype=np.int64, count=len(documents))
+    doc_ids = np.repeat(np.arange(len(documents), dtype=np.int64), lengths)
+    term_ids = np.fromiter((term for doc in documents for term in doc), dtype=np.int64, count=int(lengths.sum()))
+
+    # One (document, term) key per token; unique() counts every pair at once
+    pairs, counts = np.unique(doc_ids * vocab_size + term_ids, return_counts=True)
+    pair_docs, pair_terms = pairs // vocab_size, pairs % vocab_size
+    df = np.bincount(pair_terms, minlength=vocab_size)
+    idf = np.array(_idf(df.tolist(), len(documents)))
+    scores = counts / lengths[pair_docs] * idf[pair_terms]
+
+    # Sort by document, then score (descending), then term id
+    order = np.lexsort((pair_terms, -scores, pair_docs))
+    pair_docs, pair_terms = pair_docs[order], pair_terms[order]
+    starts = np.searchsorted(pair_docs, np.arange(len(documents)))
+    ends = np.append(starts[1:], len(pair_docs))
+    return [pair_terms[start:min(end, start + k)].tolist() for start, end in zip(starts, ends)]
+
+
+def extract_keywords(data, k: int = DEFAULT_TOP_K, use_numpy: bool = True) -> Dict[object, List[str]]:
+    """
+    Scores every term of the course and keeps the top-k per week.
+
+    Args:
+        data (Course|dict): Parsed course or raw planeamiento.json.
+        k (int): Keywords per week.
+        use_numpy (bool): Use NumPy when available (False forces the pure-Python path).
+
+    Returns:
+        dict: Week number -> keywords, best first (weeks without text get []).
+    """
+    numbers, documents = _documents(as_course(data))
+
+    # Term ids in first-seen order, which is also the tie-breaker
+    vocabulary: Dict[str, int] = {}
+    encoded = [[vocabulary.setdefault(token, len(vocabulary)) for token in doc] for doc in documents]
+    if not vocabulary:
+        return {number: [] for number in numbers}
+
+    if np is not None and use_numpy:
+        top = _top_k_numpy(encoded, len(vocabulary), k)
+    else:
+        top = _top_k_python(encoded, len(vocabulary), k)
+
+    terms = list(vocabulary)
+    return {number: [terms[t] for t in ids] for number, ids in zip(numbers, top)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print the TF-IDF keywords of every week of planeamiento.json.')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_K, help=f'Keywords per week (default: {DEFAULT_TOP_K})')
+    parser.add_argument('--json', action='store_true', help='Print a JSON object (week -> keywords)')
+    args = parser.parse_args()
+
+    keywords = extract_keywords(load_json(), k=args.top)
+    if args.json:
+        print(json.dumps({str(week): words for week, words in keywords.items()}, indent=2, ensure_ascii=False))
+    else:
+        for week, words in keywords.items():
+            print(f"{week}: {', '.join(words)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,21 @@
 
 import os
-import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from markdown_sections import MarkdownDocument
+from file_discovery import scan_dir
 
 def add_emojis():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     target_dir = os.path.join(base_dir, 'sessions')
-    files = [f for f in os.listdir(target_dir) if f.endswith('.md')]
+    files = [e.name for e in scan_dir(target_dir, extensions='.md')]
     
+    # Level-2 heading title prefix -> replacement heading prefix
     replacements = [
-        (r'^##\s+Actividades', '## 🧪 Actividades'),
-        (r'^##\s+Evaluación', '## 📝 Evaluación'),
-        (r'^##\s+Referencias', '## 📚 Referencias'),
+        ('Actividades', '## 🧪 Actividades'),
+        ('Evaluación', '## 📝 Evaluación'),
+        ('Referencias', '## 📚 Referencias'),
     ]
     
     for filename in files:
@@ -18,19 +23,20 @@ def add_emojis():
         with open(path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        new_content = content
-        for pattern, replacement in replacements:
-            # Check if emoji is already there to avoid double emoji
-            # We assume if the header already has an emoji it might not match exactly "## Actividades" 
-            # but usually it's "## 🧪 Actividades".
-            # My regex `^##\s+Actividades` checks for strict start, so "## 🧪 Actividades" won't match, which is good.
-            # But what if there are trailing spaces?
-            
-            new_content = re.sub(pattern, replacement, new_content, flags=re.MULTILINE)
+        # Headings are indexed once; a header that already has an emoji
+        # ("## 🧪 Actividades") does not start with the bare title, so it is left alone.
+        doc = MarkdownDocument(content)
+        for heading in doc.headings:
+            if heading.level != 2:
+                continue
+            for title, replacement in replacements:
+                if heading.title.startswith(title):
+                    doc.replace(heading.start, heading.title_start + len(title), replacement)
+                    break
             
-        if new_content != content:
+        if doc.modified:
             with open(path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+                f.write(doc.render())
             print(f"Updated {filename}")
         else:
             print(f"No changes for {filename}")
@@ -9,7 +9,10 @@ immediately after the frontmatter if it doesn't already exist.
 import os
 import re
 import yaml
-import glob
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_discovery import scan_dir
 
 SESSIONS_DIR = 'sessions'
 
@@ -63,7 +66,7 @@ def add_objectives_block(filepath):
     print(f"Added objectives block to {filepath}")
 
 def main():
-    files = sorted(glob.glob(os.path.join(SESSIONS_DIR, '*.md')))
+    files = [e.path for e in scan_dir(SESSIONS_DIR, extensions='.md')]
     for filepath in files:
         add_objectives_block(filepath)
 
@@ -2,11 +2,15 @@
 import os
 import yaml
 import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_discovery import scan_dir
 
 def extract_evaluations():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     sessions_dir = os.path.join(base_dir, 'sessions')
-    files = sorted([f for f in os.listdir(sessions_dir) if f.endswith('.md')])
+    files = [e.name for e in scan_dir(sessions_dir, extensions='.md')]
     
     print("| Session | Type | Description |")
     print("|---|---|---|")
@@ -1,11 +1,15 @@
 
 import os
 import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_discovery import scan_dir
 
 def fix_titles():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     eval_dir = os.path.join(base_dir, 'evaluations')
-    files = [f for f in os.listdir(eval_dir) if f.endswith('.md')]
+    files = [e.name for e in scan_dir(eval_dir, extensions='.md')]
     
     for filename in files:
         path = os.path.join(eval_dir, filename)
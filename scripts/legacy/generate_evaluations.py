@@ -2,6 +2,10 @@
 import os
 import yaml
 import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_discovery import scan_dir
 
 def generate_evaluations():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,7 +37,7 @@ def generate_evaluations():
         '16': '16-sumativa-proyecto-final.md'
     }
 
-    files = sorted([f for f in os.listdir(sessions_dir) if f.endswith('.md')])
+    files = [e.name for e in scan_dir(sessions_dir, extensions='.md')]
     
     for filename in files:
         session_num = filename[:2]
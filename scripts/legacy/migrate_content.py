@@ -1,6 +1,10 @@
 
 import os
-import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from markdown_sections import MarkdownDocument
+from file_discovery import scan_dir
 
 def migrate_content():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -8,7 +12,7 @@ def migrate_content():
     target_dir = os.path.join(base_dir, 'sessions')
     
     # List all markdown files in source directory
-    files = [f for f in os.listdir(source_dir) if f.endswith('.md')]
+    files = [e.name for e in scan_dir(source_dir, extensions='.md')]
     
     for filename in files:
         source_path = os.path.join(source_dir, filename)
@@ -27,33 +31,26 @@ def migrate_content():
             with open(target_path, 'r', encoding='utf-8') as f:
                 target_content = f.read()
                 
+            # Index both documents once (headings and directives with offsets)
+            source_doc = MarkdownDocument(source_content)
+            target_doc = MarkdownDocument(target_content)
+
             # Extract content from source
             # Start after ::: {note} Objetivos ... :::
-            start_marker = r':::\{note\} Objetivos\s*.*?\s*:::'
-            match_start = re.search(start_marker, source_content, re.DOTALL)
+            source_block = source_doc.find_directive('note', 'Objetivos')
             
-            if not match_start:
+            if not source_block:
                 print(f"  Warning: Could not find 'Objetivos' block in {filename} source.")
                 continue
                 
-            start_pos = match_start.end()
+            start_pos = source_block.end
             
             # Find end position (Actividades, Ejercicios, Referencias, Evaluacion)
-            # We look for the first occurrence of any of these headers
-            end_markers = [
-                r'\n#+\s+Actividades',
-                r'\n#+\s+Ejercicios',
-                r'\n#+\s+Referencias',
-                r'\n#+\s+Evaluación'
-            ]
-            
-            end_pos = len(source_content)
-            for marker in end_markers:
-                match_end = re.search(marker, source_content[start_pos:])
-                if match_end:
-                    current_end_pos = start_pos + match_end.start()
-                    if current_end_pos < end_pos:
-                        end_pos = current_end_pos
+            # We look for the first of these headers after the block
+            end_titles = ('Actividades', 'Ejercicios', 'Referencias', 'Evaluación')
+            end_header = source_doc.find_heading(lambda h: h.title.startswith(end_titles), after=start_pos)
+            # The preceding newline is not part of the extracted content
+            end_pos = end_header.start - 1 if end_header else len(source_content)
             
             extracted_content = source_content[start_pos:end_pos].strip()
             
@@ -63,25 +60,16 @@ def migrate_content():
                 
             # Insert into target
             # Find insertion point: after Objetivos block and before Actividades
-            # Assuming target has Actividades header. If not, append before References or at end.
-            
-            target_start_marker = r':::\{note\} Objetivos\s*.*?\s*:::'
-            target_match_start = re.search(target_start_marker, target_content, re.DOTALL)
+            target_block = target_doc.find_directive('note', 'Objetivos')
 
-            if not target_match_start:
+            if not target_block:
                  print(f"  Warning: Could not find 'Objetivos' block in {filename} target.")
                  continue
 
-            insertion_point = target_match_start.end()
-            
-            # Check if content is already there (heuristic check)
-            # If the extracted starts with characters present right after insertion point, skip
-            # But safer to just insert cleanly. 
-            # We need to make sure we don't double insert.
-            
             # Construct new content
             # Add some newlines for spacing
-            new_content = target_content[:insertion_point] + "\n\n" + extracted_content + "\n\n" + target_content[insertion_point:]
+            target_doc.insert(target_block.end, "\n\n" + extracted_content + "\n\n")
+            new_content = target_doc.render()
             
             with open(target_path, 'w', encoding='utf-8') as f:
                 f.write(new_content)
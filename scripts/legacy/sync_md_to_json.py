@@ -1,9 +1,13 @@
-import glob
+import os
+import sys
 import yaml
 import json
 import re
 from typing import Dict, Any, List
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_discovery import scan_dir
+
 def main() -> None:
     """
     Synchronizes learning objectives from session markdown files to the planeamiento.json file.
@@ -34,7 +38,7 @@ def main() -> None:
     week_map: Dict[int, Dict[str, Any]] = {item['week']: item for item in data if 'week' in item}
 
     # Find all session markdown files
-    files = sorted(glob.glob("sessions/*.md"))
+    files = [e.path for e in scan_dir("sessions", extensions=".md")]
     
     updates_count = 0
 
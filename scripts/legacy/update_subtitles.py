@@ -5,6 +5,10 @@ Update session subtitles based on a predefined mapping related to their content.
 
 import os
 import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_discovery import scan_dir
 
 SESSIONS_DIR = "/home/glacy/biotec/sessions"
 
@@ -56,15 +60,12 @@ def update_subtitle(filepath, new_subtitle):
 
 def main():
     print(f"Updating subtitles in {SESSIONS_DIR}...")
-    for filename in sorted(os.listdir(SESSIONS_DIR)):
-        if filename.endswith(".md") and filename[0].isdigit():
-            prefix = filename[:2]
-            if prefix in SUBTITLE_MAP:
-                new_subtitle = SUBTITLE_MAP[prefix]
-                full_path = os.path.join(SESSIONS_DIR, filename)
-                update_subtitle(full_path, new_subtitle)
-            else:
-                print(f"Skipping {filename} (no mapping found)")
+    for entry in scan_dir(SESSIONS_DIR, prefix=tuple('0123456789'), extensions='.md'):
+        prefix = entry.name[:2]
+        if prefix in SUBTITLE_MAP:
+            update_subtitle(entry.path, SUBTITLE_MAP[prefix])
+        else:
+            print(f"Skipping {entry.name} (no mapping found)")
 
 if __name__ == "__main__":
         main()
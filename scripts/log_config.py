@@ -0,0 +1,170 @@
+"""
+Logging shared by the scaffold scripts.
+
+Every script logs through get_logger(<script name>) instead of print(), so a
+run can be made quieter or machine-readable from one place:
+
+    - levels: per-file messages ('Generated: ...', 'Skipping ...') are DEBUG,
+      stage progress and summaries are INFO, caught errors are ERROR and
+      carry their context ('week', 'file') as record fields;
+    - formats: 'text' prints the bare message (what the scripts always
+      printed), 'json' prints one object per line with level, logger,
+      message and the lang/stage/week/file fields that are set;
+    - buffering: lines are held in memory and written in one call when the
+      buffer fills, at the end of each stage (flush()) and at exit. ERROR
+      records flush immediately, so failures are never delayed.
+
+Scripts that are run directly get the default configuration (INFO, text,
+unbuffered); scaffold_course.py calls configure() from its command line.
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from typing import List
+
+LOGGER_NAME = 'scaffold'
+
+LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+
+# Lines buffered before a write when buffering is enabled
+DEFAULT_BUFFER = 500
+
+# Record fields exported by the JSON format when they are set
+CONTEXT_FIELDS = ('lang', 'stage', 'week', 'file')
+
+_context: contextvars.ContextVar = contextvars.ContextVar('scaffold_log_context', default={})
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _ContextFilter(logging.Filter):
+    """Copies the fields set with log_context() onto each record (explicit extra= wins)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for field, value in _context.get().items():
+            if getattr(record, field, None) is None:
+                setattr(record, field, value)
+        return True
+
+
+class BufferedStreamHandler(logging.Handler):
+    """
+    Writes formatted records to sys.stdout or sys.stderr in batches.
+
+    The stream is looked up when the buffer is written, not when the handler
+    is created, so contextlib.redirect_stdout() keeps working.
+
+    Args:
+        stream (str): 'stdout' or 'stderr'.
+        capacity (int): Records kept before writing (0 writes every record at once).
+    """
+
+    def __init__(self, stream: str = 'stdout', capacity: int = 0):
+        super().__init__()
+        self.stream_name = stream
+        self.capacity = capacity
+        self._lines: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._lines.append(self.format(record))
+            if len(self._lines) > self.capacity or record.levelno >= logging.ERROR:
+                self._write()
+        except Exception:
+            self.handleError(record)
+
+    def _write(self) -> None:
+        lines, self._lines = self._lines, []
+        if lines:
+            stream = getattr(sys, self.stream_name)
+            try:
+                stream.write('\n'.join(lines) + '\n')
+                stream.flush()
+            except OSError:
+                # The reader went away (e.g. `| head`); logging must not fail the run
+                pass
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            self._write()
+        finally:
+            self.release()
+
+
+def configure(level: str = 'info', fmt: str = 'text', quiet: bool = False,
+              stream: str = 'stdout', buffer: int = 0) -> None:
+    """
+    (Re)configures the output of every scaffold logger.
+
+    Args:
+        level (str): Minimum level: 'debug', 'info', 'warning' or 'error'.
+        fmt (str): 'text' (bare messages) or 'json' (one object per line).
+        quiet (bool): Only warnings and errors (overrides level).
+        stream (str): 'stdout' or 'stderr'.
+        buffer (int): Records buffered before a write (0 = unbuffered).
+    """
+    root = logging.getLogger(LOGGER_NAME)
+    for handler in list(root.handlers):
+        handler.flush()
+        root.removeHandler(handler)
+        handler.close()
+
+    handler = BufferedStreamHandler(stream, capacity=buffer)
+    handler.setFormatter(JsonFormatter() if fmt == 'json' else logging.Formatter('%(message)s'))
+    handler.addFilter(_ContextFilter())
+    root.addHandler(handler)
+    root.setLevel(logging.WARNING if quiet else LEVELS[level])
+    root.propagate = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns the logger of a script (configured with the defaults on first use)."""
+    if not logging.getLogger(LOGGER_NAME).handlers:
+        configure()
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def flush() -> None:
+    """Writes any buffered records (called at the end of each stage)."""
+    for handler in logging.getLogger(LOGGER_NAME).handlers:
+        handler.flush()
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """
+    Attaches fields (e.g. lang='es', stage='generate_sessions') to every record
+    logged in this thread inside the block.
+    """
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
@@ -0,0 +1,173 @@
+"""
+Managed regions in generated markdown files.
+
+A managed block is a region that a generator owns inside a file the author
+otherwise edits by hand. It is delimited by two identical marker lines:
+
+    <!-- ACTIVITY-BADGES -->
+    ![](https://img.shields.io/badge/...)
+    <!-- ACTIVITY-BADGES -->
+
+Blocks are located with a bounded, line-by-line forward scan that starts at
+the end of the frontmatter and stops after a fixed number of lines, so the
+cost does not depend on the size of the file. Only when a block is missing
+from that window is the rest of the file scanned, before inserting it, so a
+block pushed further down by hand is updated rather than duplicated. Marker
+lines are matched with one dict lookup per line. A file may hold several named blocks.
+Unbalanced or interleaved markers raise MarkerError instead of splicing the
+wrong region.
+"""
+
+import itertools
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Frontmatter at the top of a file: "---\n<yaml>\n---\n"
+FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---\n', re.DOTALL)
+
+# Lines scanned after the frontmatter when looking for markers
+DEFAULT_SCAN_LINES = 100
+
+
+class MarkerError(ValueError):
+    """Raised when the markers of a managed block are unbalanced or interleaved."""
+
+
+class Block(NamedTuple):
+    """Position of a managed block; start/end span both marker lines (end excludes the final newline)."""
+    name: str
+    start: int
+    end: int
+    body: str
+
+
+def marker(name: str) -> str:
+    """Marker line of a block name, e.g. 'ACTIVITY-BADGES' -> '<!-- ACTIVITY-BADGES -->'."""
+    return f"<!-- {name} -->"
+
+
+def frontmatter_end(content: str) -> int:
+    """Offset just after the closing '---' line of the frontmatter (0 without frontmatter)."""
+    match = FRONTMATTER_RE.match(content)
+    return match.end() if match else 0
+
+
+class ManagedBlocks:
+    """
+    Finds and updates a fixed set of named blocks.
+
+    Instances hold only precomputed marker lines, so one module-level
+    instance per generator can be shared by every call (and by worker
+    processes, which build their own on import).
+
+    Args:
+        names (iterable): Block names managed by the caller.
+        scan_lines (int): Lines scanned after the frontmatter; markers further down are
+            only looked for when a block would otherwise be inserted (see update()).
+    """
+
+    def __init__(self, names: Iterable[str], scan_lines: int = DEFAULT_SCAN_LINES):
+        self.names = list(names)
+        self.scan_lines = scan_lines
+        self._markers = {marker(name): name for name in self.names}
+
+    def find(self, content: str, start: Optional[int] = None, whole: bool = False) -> Dict[str, Block]:
+        """
+        Locates the managed blocks present in a file.
+
+        Args:
+            content (str): File content.
+            start (int, optional): Where the scan starts (the frontmatter end by default).
+            whole (bool): Scan to the end of the file instead of scan_lines lines.
+
+        Returns:
+            dict: Block name -> Block for every complete block in the scan window.
+
+        Raises:
+            MarkerError: If a block is opened but not closed within the window, or if
+                two blocks are interleaved.
+        """
+        pos = frontmatter_end(content) if start is None else start
+        blocks: Dict[str, Block] = {}
+        open_name, open_at, body_at = None, 0, 0
+        for _ in (itertools.count() if whole else range(self.scan_lines)):
+            if pos >= len(content):
+                break
+            newline = content.find('\n', pos)
+            line_end = len(content) if newline == -1 else newline
+            name = self._markers.get(content[pos:line_end].strip())
+            if name is not None:
+                if open_name is None:
+                    if name in blocks:
+                        raise MarkerError(f"block '{name}' appears more than once")
+                    open_name, open_at, body_at = name, pos, line_end + 1
+                elif name == open_name:
+                    body = content[body_at:pos - 1] if pos > body_at else ''
+                    blocks[name] = Block(name, open_at, line_end, body)
+                    open_name = None
+                else:
+                    raise MarkerError(f"block '{name}' starts inside block '{open_name}'")
+            pos = line_end + 1
+        if open_name is not None:
+            if whole:
+                raise MarkerError(f"block '{open_name}' is not closed")
+            raise MarkerError(f"block '{open_name}' is not closed within {self.scan_lines} lines")
+        return blocks
+
+    def update(self, content: str, bodies: Dict[str, str], start: Optional[int] = None) -> Tuple[str, Dict[str, str]]:
+        """
+        Sets the body of one or more blocks.
+
+        Existing blocks are replaced where they are; missing ones are inserted
+        (in the order of bodies) right after the frontmatter. A block that is
+        not in the scan window is looked for in the whole file first. The result is
+        assembled in one join from slices of the original content, and the
+        original string itself is returned when nothing changes.
+
+        Args:
+            content (str): File content.
+            bodies (dict): Block name -> new body (without markers).
+            start (int, optional): Frontmatter end, if the caller already knows it.
+
+        Returns:
+            tuple: (new content, {name: 'inserted' | 'updated' | 'unchanged'}).
+
+        Raises:
+            MarkerError: See find(); the content is then left alone.
+            KeyError: If a name is not managed by this instance.
+        """
+        for name in bodies:
+            if marker(name) not in self._markers:
+                raise KeyError(f"'{name}' is not a managed block")
+        start = frontmatter_end(content) if start is None else start
+        found = self.find(content, start)
+        if any(name not in found for name in bodies):
+            found = self.find(content, start, whole=True)
+
+        actions: Dict[str, str] = {}
+        edits: List[Tuple[int, int, str]] = []
+        inserted: List[str] = []
+        for name, body in bodies.items():
+            text = f"{marker(name)}\n{body}\n{marker(name)}"
+            block = found.get(name)
+            if block is None:
+                inserted.append(text)
+                actions[name] = 'inserted'
+            elif block.body == body:
+                actions[name] = 'unchanged'
+            else:
+                edits.append((block.start, block.end, text))
+                actions[name] = 'updated'
+        if inserted:
+            edits.append((start, start, "".join(f"\n{text}\n" for text in inserted)))
+        if not edits:
+            return content, actions
+
+        # Insertions at the frontmatter end go before a block that starts right there
+        edits.sort(key=lambda edit: (edit[0], edit[1]))
+        pieces, pos = [], 0
+        for begin, end, text in edits:
+            pieces += [content[pos:begin], text]
+            pos = end
+        pieces.append(content[pos:])
+        return "".join(pieces), actions
@@ -0,0 +1,172 @@
+"""
+Section-offset index for markdown files.
+
+A MarkdownDocument scans the text once and records the offsets of every
+heading and colon-fence directive (e.g. ':::{note} Objetivos'), ignoring
+frontmatter and fenced code. Post-processors locate sections through the
+index and queue edits by offset; render() applies all edits in one pass,
+so nothing re-scans or copies the rest of the document per lookup.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+_HEADING_RE = re.compile(r'(#{1,6})[ \t]+(.*?)[ \t]*#*[ \t]*$')
+_DIRECTIVE_OPEN_RE = re.compile(r'(:{3,})[ \t]*\{([\w-]+)\}[ \t]*(.*?)[ \t]*$')
+_DIRECTIVE_CLOSE_RE = re.compile(r'(:{3,})[ \t]*$')
+_CODE_FENCE_RE = re.compile(r'[ \t]*(`{3,}|~{3,})')
+
+
+@dataclass(slots=True)
+class Heading:
+    level: int
+    title: str
+    start: int        # Offset of the first '#'
+    title_start: int  # Offset of the first character of the title
+    line_end: int     # Offset just past the heading line (after its newline)
+    end: int          # End of the section: next heading of same or higher level, or EOF
+
+
+@dataclass(slots=True)
+class Directive:
+    name: str
+    argument: str
+    start: int        # Offset of the opening ':::'
+    body_start: int   # Offset just past the opening line
+    body_end: int     # Offset of the closing ':::' line
+    end: int          # Offset just past the closing ':::' (before its newline)
+
+
+class MarkdownDocument:
+    """
+    Markdown text plus a one-pass index of its headings and directives.
+
+    Args:
+        text (str): Full document content.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.headings: List[Heading] = []
+        self.directives: List[Directive] = []
+        self._edits: List[Tuple[int, int, str]] = []
+        self._scan()
+
+    def _scan(self) -> None:
+        text = self.text
+        open_directives: List[Tuple[str, str, str, int, int]] = []
+        code_fence: Optional[str] = None
+        in_frontmatter = text.startswith('---\n')
+        offset = 0
+
+        for index, line in enumerate(text.splitlines(keepends=True)):
+            start = offset
+            offset += len(line)
+            content = line.rstrip('\r\n')
+
+            if in_frontmatter:
+                if index > 0 and content == '---':
+                    in_frontmatter = False
+                continue
+
+            if code_fence is not None:
+                stripped = content.strip()
+                if stripped.startswith(code_fence) and stripped.strip(code_fence[0]) == '':
+                    code_fence = None
+                continue
+
+            fence = _CODE_FENCE_RE.match(content)
+            if fence:
+                code_fence = fence.group(1)
+                continue
+
+            heading = _HEADING_RE.match(content)
+            if heading:
+                self.headings.append(Heading(
+                    level=len(heading.group(1)),
+                    title=heading.group(2),
+                    start=start,
+                    title_start=start + heading.start(2),
+                    line_end=offset,
+                    end=len(text),
+                ))
+                continue
+
+            opening = _DIRECTIVE_OPEN_RE.match(content)
+            if opening:
+                colons, name, argument = opening.groups()
+                open_directives.append((colons, name, argument, start, offset))
+                continue
+
+            closing = _DIRECTIVE_CLOSE_RE.match(content)
+            if closing and open_directives and len(closing.group(1)) >= len(open_directives[-1][0]):
+                _, name, argument, d_start, body_start = open_directives.pop()
+                self.directives.append(Directive(
+                    name=name,
+                    argument=argument,
+                    start=d_start,
+                    body_start=body_start,
+                    body_end=start,
+                    end=start + closing.end(1),
+                ))
+
+        self.directives.sort(key=lambda d: d.start)
+
+        # Section ends: a stack of open headings is closed by any heading of
+        # the same or a higher level.
+        stack: List[Heading] = []
+        for heading in self.headings:
+            while stack and stack[-1].level >= heading.level:
+                stack.pop().end = heading.start
+            stack.append(heading)
+
+    # Lookups -----------------------------------------------------------
+
+    def find_heading(self, match: Callable[[Heading], bool], after: int = 0) -> Optional[Heading]:
+        """Returns the first heading at or after an offset that satisfies match."""
+        for heading in self.headings:
+            if heading.start >= after and match(heading):
+                return heading
+        return None
+
+    def find_directive(self, name: str, argument: Optional[str] = None) -> Optional[Directive]:
+        """Returns the first directive with the given name (and argument prefix, if given)."""
+        for directive in self.directives:
+            if directive.name == name and (argument is None or directive.argument.startswith(argument)):
+                return directive
+        return None
+
+    def contains(self, needle: str, start: int = 0, end: Optional[int] = None) -> bool:
+        """Substring test over a region without copying it."""
+        return self.text.find(needle, start, len(self.text) if end is None else end) != -1
+
+    # Edits -------------------------------------------------------------
+
+    def insert(self, offset: int, text: str) -> None:
+        """Queues an insertion at an offset of the original text."""
+        self._edits.append((offset, offset, text))
+
+    def replace(self, start: int, end: int, text: str) -> None:
+        """Queues a replacement of the original text between two offsets."""
+        self._edits.append((start, end, text))
+
+    @property
+    def modified(self) -> bool:
+        return bool(self._edits)
+
+    def render(self) -> str:
+        """Applies all queued edits in a single pass and returns the new text."""
+        if not self._edits:
+            return self.text
+        parts = []
+        cursor = 0
+        # Stable sort keeps insertions at the same offset in queue order
+        for start, end, text in sorted(self._edits, key=lambda e: (e[0], e[1])):
+            if start < cursor:
+                raise ValueError(f"Overlapping edits at offset {start}")
+            parts.append(self.text[cursor:start])
+            parts.append(text)
+            cursor = end
+        parts.append(self.text[cursor:])
+        return ''.join(parts)
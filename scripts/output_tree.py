@@ -0,0 +1,419 @@
+"""
+Output tree abstraction shared by all generator scripts.
+
+Every stage reads and writes generated files through an OutputTree instead of
+touching the working directory directly, so the same course can be rendered
+into several output roots (one per language) in a single run.
+
+A disk tree can also record its effective writes in a ChangeManifest as they
+happen, so the pages that changed are known without rescanning the output,
+and count them (with the bytes written and each stage's duration) in the run
+metrics (see run_metrics.py).
+
+A MemoryTree keeps the writes in memory on top of the files on disk (used by
+--plan); a VirtualTree keeps them in memory with no disk underneath (used by
+the in-process API in course_api.py).
+"""
+
+import contextlib
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import sys
+from typing import Dict, List, Optional, Set
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from file_discovery import FileEntry, list_dirs, name_matches, scan_dir
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from file_discovery import FileEntry, list_dirs, name_matches, scan_dir
+
+
+class ChangeManifest:
+    """
+    Thread-safe record of the files whose content actually changed.
+
+    Each entry has 'path', 'old_hash' (None for new files), 'new_hash'
+    (sha256 hex digests), 'reason' ('created' or 'modified') and 'stages'
+    (the generators that wrote it, in order). A path written several times
+    keeps its first old hash and its last new hash; if it ends up as it
+    started, it is dropped.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, path: str, old_hash: Optional[str], new_hash: str, stage: Optional[str] = None) -> None:
+        with self._lock:
+            previous = self._entries.get(path)
+            stages = []
+            if previous is not None:
+                old_hash = previous['old_hash']
+                stages = previous['stages']
+            if old_hash == new_hash:
+                self._entries.pop(path, None)
+                return
+            if stage and stage not in stages:
+                stages = stages + [stage]
+            self._entries[path] = {
+                'path': path,
+                'old_hash': old_hash,
+                'new_hash': new_hash,
+                'reason': 'created' if old_hash is None else 'modified',
+                'stages': stages,
+            }
+
+    @property
+    def entries(self) -> List[Dict[str, object]]:
+        with self._lock:
+            return [self._entries[path] for path in sorted(self._entries)]
+
+    def to_dict(self) -> Dict[str, object]:
+        entries = self.entries
+        return {'changed': bool(entries), 'count': len(entries), 'files': entries}
+
+    def write(self, filepath: str) -> None:
+        """Writes the manifest as JSON, creating the parent directory if needed."""
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+
+class OutputTree:
+    """
+    Disk-backed output root.
+
+    Paths passed to the methods are relative to the root (e.g. 'sessions/01-intro.md').
+    With the default root ('.') they resolve against the current working directory,
+    which keeps the historical single-language behaviour.
+
+    With a manifest, writes that would not change a file are skipped and every
+    other write is recorded under the current `stage` name. With metrics
+    (a run_metrics.MetricsScope), identical writes are skipped as well and
+    every write is counted as 'generated' or 'unchanged' for the stage.
+    """
+
+    # False for trees whose writes never reach the disk (stat-based skips must not trust them)
+    writes_to_disk = True
+
+    def __init__(self, root: str = '.', manifest: Optional[ChangeManifest] = None, metrics=None):
+        self.root = root
+        self.manifest = manifest
+        self.metrics = metrics
+        self.stage: Optional[str] = None
+
+    def path(self, relpath: str) -> str:
+        """Returns the on-disk path for a path relative to the root."""
+        if self.root in ('', '.'):
+            return relpath
+        return os.path.join(self.root, relpath)
+
+    def ensure_root(self) -> None:
+        """Creates the root directory if needed."""
+        os.makedirs(self.root or '.', exist_ok=True)
+
+    def exists(self, relpath: str) -> bool:
+        return os.path.exists(self.path(relpath))
+
+    def makedirs(self, relpath: str) -> None:
+        os.makedirs(self.path(relpath))
+
+    def read_text(self, relpath: str) -> str:
+        with open(self.path(relpath), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def write_text(self, relpath: str, content: str) -> None:
+        self._write_file(relpath, content, self.stage)
+
+    def count(self, outcome: str, n: int = 1) -> None:
+        """Reports an outcome that involves no write (e.g. 'skipped', 'failed') for the current stage."""
+        if self.metrics is not None:
+            self.metrics.count(self.stage, outcome, n)
+
+    @contextlib.contextmanager
+    def running(self, stage: str):
+        """
+        Makes `stage` the current stage and records its duration.
+
+        A stage that raises is counted as one failure before the error propagates.
+        """
+        self.stage = stage
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.count('failed')
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.add_duration(stage, time.perf_counter() - started)
+
+    def flush(self) -> None:
+        """Waits for pending writes (nothing to do for synchronous trees)."""
+
+    def close(self) -> None:
+        """Releases any writer resources (nothing to do for synchronous trees)."""
+
+    def _write_file(self, relpath: str, content: str, stage: Optional[str]) -> None:
+        if self.manifest is None and self.metrics is None:
+            with open(self.path(relpath), 'w', encoding='utf-8') as f:
+                f.write(content)
+            return
+
+        # The old content is hashed right before it is replaced, so building
+        # the manifest never needs a second pass over the tree.
+        new = content.encode('utf-8')
+        new_hash = hashlib.sha256(new).hexdigest()
+        try:
+            with open(self.path(relpath), 'rb') as f:
+                old_hash = hashlib.sha256(f.read()).hexdigest()
+        except FileNotFoundError:
+            old_hash = None
+        if old_hash == new_hash:
+            if self.metrics is not None:
+                self.metrics.count(stage, 'unchanged')
+            return
+        with open(self.path(relpath), 'wb') as f:
+            f.write(new)
+        if self.manifest is not None:
+            self.manifest.record(self.path(relpath).replace(os.sep, '/'), old_hash, new_hash, stage)
+        if self.metrics is not None:
+            self.metrics.count(stage, 'generated')
+            self.metrics.add_bytes(stage, len(new))
+
+    def glob(self, pattern: str) -> List[str]:
+        """Returns sorted root-relative paths matching a glob pattern."""
+        matches = glob.glob(self.path(pattern))
+        if self.root in ('', '.'):
+            return sorted(matches)
+        return sorted(os.path.relpath(m, self.root) for m in matches)
+
+    def scan(self, relpath: str, prefix=None, extensions=None, pattern=None, subdirs=None) -> List[FileEntry]:
+        """
+        Lists the files of a directory with cached stat data (see file_discovery.scan_dir).
+
+        Returned paths are relative to the root (e.g. 'activities/01-lab.md').
+        With `subdirs` (a compiled regex), the files of the immediate subdirectories
+        whose names match are listed too (e.g. 'activities/unit-02/04-lab.md'),
+        and the entries of all directories are sorted together by name.
+        """
+        if subdirs is None:
+            return self._scan_dir(relpath, prefix, extensions, pattern)
+        entries = self._scan_dir(relpath, prefix, extensions, pattern)
+        for name in self.list_dirs(relpath, subdirs):
+            entries.extend(self._scan_dir(os.path.join(relpath, name), prefix, extensions, pattern))
+        entries.sort(key=lambda e: (e.name, e.path))
+        return entries
+
+    def list_dirs(self, relpath: str, pattern=None) -> List[str]:
+        """Names of the subdirectories of a directory (see file_discovery.list_dirs)."""
+        return list_dirs(self.path(relpath), pattern)
+
+    def _scan_dir(self, relpath: str, prefix=None, extensions=None, pattern=None) -> List[FileEntry]:
+        return [
+            FileEntry(os.path.join(relpath, e.name), e.name, e.size, e.mtime_ns)
+            for e in scan_dir(self.path(relpath), prefix, extensions, pattern)
+        ]
+
+    def copy_tree(self, source_dir: str, relpath: Optional[str] = None) -> None:
+        """Copies a shared source directory (e.g. assets/) into the root."""
+        target = self.path(relpath or os.path.basename(os.path.normpath(source_dir)))
+        if os.path.abspath(target) == os.path.abspath(source_dir):
+            return
+        shutil.copytree(source_dir, target, dirs_exist_ok=True)
+
+
+class MemoryTree(OutputTree):
+    """
+    In-memory output root layered over the files already on disk.
+
+    Writes and directory creation are only recorded; reads see pending writes
+    first and fall back to the disk, so later stages observe the output of
+    earlier ones exactly as in a real run. Nothing is ever written to disk.
+    """
+
+    writes_to_disk = False
+
+    def __init__(self, root: str = '.'):
+        super().__init__(root)
+        self.files: Dict[str, bytes] = {}
+        self.dirs: Set[str] = set()
+
+    @staticmethod
+    def _key(relpath: str) -> str:
+        return os.path.normpath(relpath)
+
+    def exists(self, relpath: str) -> bool:
+        key = self._key(relpath)
+        return key in self.files or key in self.dirs or super().exists(relpath)
+
+    def ensure_root(self) -> None:
+        pass
+
+    def makedirs(self, relpath: str) -> None:
+        self.dirs.add(self._key(relpath))
+
+    def read_bytes(self, relpath: str) -> bytes:
+        key = self._key(relpath)
+        if key in self.files:
+            return self.files[key]
+        with open(self.path(relpath), 'rb') as f:
+            return f.read()
+
+    def read_text(self, relpath: str) -> str:
+        return self.read_bytes(relpath).decode('utf-8')
+
+    def write_bytes(self, relpath: str, content: bytes) -> None:
+        key = self._key(relpath)
+        self.files[key] = content
+        parent = os.path.dirname(key)
+        while parent:
+            self.dirs.add(parent)
+            parent = os.path.dirname(parent)
+
+    def write_text(self, relpath: str, content: str) -> None:
+        self.write_bytes(relpath, content.encode('utf-8'))
+
+    def glob(self, pattern: str) -> List[str]:
+        pattern = self._key(pattern)
+        depth = pattern.count(os.sep)
+        pending = {
+            key for key in self.files
+            if key.count(os.sep) == depth and fnmatch.fnmatchcase(key, pattern)
+        }
+        on_disk = {self._key(p) for p in super().glob(pattern)}
+        return sorted(pending | on_disk)
+
+    def list_dirs(self, relpath: str, pattern=None) -> List[str]:
+        directory = self._key(relpath)
+        pending = {
+            os.path.basename(key) for key in self.dirs
+            if os.path.dirname(key) == directory and (pattern is None or pattern.match(os.path.basename(key)))
+        }
+        return sorted(pending | set(super().list_dirs(relpath, pattern)))
+
+    def _scan_dir(self, relpath: str, prefix=None, extensions=None, pattern=None) -> List[FileEntry]:
+        directory = self._key(relpath)
+        entries = {e.name: e for e in super()._scan_dir(relpath, prefix, extensions, pattern)}
+        for key, content in self.files.items():
+            name = os.path.basename(key)
+            if os.path.dirname(key) == directory and name_matches(name, prefix, extensions, pattern):
+                entries[name] = FileEntry(os.path.join(relpath, name), name, len(content), None)
+        return [entries[name] for name in sorted(entries)]
+
+    def copy_tree(self, source_dir: str, relpath: Optional[str] = None) -> None:
+        target = relpath or os.path.basename(os.path.normpath(source_dir))
+        if os.path.abspath(self.path(target)) == os.path.abspath(source_dir):
+            return
+        for dirpath, _, filenames in os.walk(source_dir):
+            for name in filenames:
+                source = os.path.join(dirpath, name)
+                rel = os.path.join(target, os.path.relpath(source, source_dir))
+                with open(source, 'rb') as f:
+                    self.write_bytes(rel, f.read())
+
+    def plan(self) -> List[Dict[str, object]]:
+        """
+        Compares every pending write with the file currently on disk.
+
+        Returns:
+            list: One dict per file, sorted by path, with keys 'path',
+            'action' ('create', 'change' or 'unchanged'), 'old_bytes',
+            'new_bytes' and 'delta'.
+        """
+        entries = []
+        for key in sorted(self.files):
+            new = self.files[key]
+            disk_path = self.path(key)
+            if os.path.isfile(disk_path):
+                with open(disk_path, 'rb') as f:
+                    old = f.read()
+                action = 'unchanged' if old == new else 'change'
+                old_size = len(old)
+            else:
+                action = 'create'
+                old_size = 0
+            entries.append({
+                'path': key,
+                'action': action,
+                'old_bytes': old_size,
+                'new_bytes': len(new),
+                'delta': len(new) - old_size,
+            })
+        return entries
+
+
+class VirtualTree(MemoryTree):
+    """
+    In-memory output root with nothing underneath.
+
+    Unlike MemoryTree, reads, listings and existence checks never fall back to
+    the disk: the tree starts empty and only holds what the stages write to it,
+    whatever the working directory contains. Used by course_api.build_course().
+    """
+
+    def __init__(self):
+        super().__init__('')
+
+    def exists(self, relpath: str) -> bool:
+        key = self._key(relpath)
+        return key in self.files or key in self.dirs
+
+    def read_bytes(self, relpath: str) -> bytes:
+        key = self._key(relpath)
+        if key not in self.files:
+            raise FileNotFoundError(f"No such file in the virtual tree: {relpath}")
+        return self.files[key]
+
+    def glob(self, pattern: str) -> List[str]:
+        pattern = self._key(pattern)
+        depth = pattern.count(os.sep)
+        return sorted(
+            key for key in self.files
+            if key.count(os.sep) == depth and fnmatch.fnmatchcase(key, pattern)
+        )
+
+    def list_dirs(self, relpath: str, pattern=None) -> List[str]:
+        directory = self._key(relpath)
+        return sorted(
+            os.path.basename(key) for key in self.dirs
+            if os.path.dirname(key) == directory and (pattern is None or pattern.match(os.path.basename(key)))
+        )
+
+    def _scan_dir(self, relpath: str, prefix=None, extensions=None, pattern=None) -> List[FileEntry]:
+        directory = self._key(relpath)
+        entries = [
+            FileEntry(os.path.join(relpath, os.path.basename(key)), os.path.basename(key), len(content), None)
+            for key, content in self.files.items()
+            if os.path.dirname(key) == directory and name_matches(os.path.basename(key), prefix, extensions, pattern)
+        ]
+        entries.sort(key=lambda e: e.name)
+        return entries
+
+    def copy_tree(self, source_dir: str, relpath: Optional[str] = None) -> None:
+        target = relpath or os.path.basename(os.path.normpath(source_dir))
+        for dirpath, _, filenames in os.walk(source_dir):
+            for name in filenames:
+                source = os.path.join(dirpath, name)
+                with open(source, 'rb') as f:
+                    self.write_bytes(os.path.join(target, os.path.relpath(source, source_dir)), f.read())
+
+    def to_dict(self) -> Dict[str, bytes]:
+        """Every file of the tree, keyed by its '/'-separated path relative to the root, sorted by path."""
+        return {key.replace(os.sep, '/'): self.files[key] for key in sorted(self.files)}
+
+
+DEFAULT_TREE = OutputTree()
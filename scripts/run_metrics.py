@@ -0,0 +1,209 @@
+"""
+Machine-readable run metrics for the scaffold stages.
+
+Every stage reports, per language, how many files it generated, skipped
+(existing files kept without --force), left unchanged (identical content,
+nothing written) or failed on, how many bytes it wrote and how long it ran.
+Disk writes are counted by OutputTree itself; stages only report the
+outcomes that never reach a write (skips and failures).
+
+At the end of a run the metrics are exported twice:
+
+    metrics.json   one record per (language, stage) plus totals
+    metrics.prom   Prometheus text exposition format, e.g. for the
+                   node_exporter textfile collector or a CI dashboard
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import CACHE_DIR, write_atomic
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import CACHE_DIR, write_atomic
+
+DEFAULT_METRICS_FILE = os.path.join(CACHE_DIR, 'metrics.json')
+
+OUTCOMES = ('generated', 'skipped', 'unchanged', 'failed')
+
+
+def _new_record() -> Dict[str, float]:
+    record = {outcome: 0 for outcome in OUTCOMES}
+    record['bytes_written'] = 0
+    record['duration_seconds'] = 0.0
+    return record
+
+
+def _label(value: str) -> str:
+    """Escapes a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_path(json_path: str) -> str:
+    """Path of the Prometheus export written next to the JSON one (metrics.json -> metrics.prom)."""
+    return os.path.splitext(json_path)[0] + '.prom'
+
+
+class RunMetrics:
+    """
+    Thread-safe counters keyed by (language, stage).
+
+    Languages render in parallel threads and the async writer counts from its
+    worker threads, so every update goes through one lock.
+    """
+
+    def __init__(self):
+        self._records: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def _record(self, lang: str, stage: str) -> Dict[str, float]:
+        key = (lang or '', stage or 'unknown')
+        record = self._records.get(key)
+        if record is None:
+            record = self._records[key] = _new_record()
+        return record
+
+    def count(self, lang: str, stage: str, outcome: str, n: int = 1) -> None:
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown outcome '{outcome}' (expected one of {', '.join(OUTCOMES)})")
+        with self._lock:
+            self._record(lang, stage)[outcome] += n
+
+    def add_bytes(self, lang: str, stage: str, n: int) -> None:
+        with self._lock:
+            self._record(lang, stage)['bytes_written'] += n
+
+    def add_duration(self, lang: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._record(lang, stage)['duration_seconds'] += seconds
+
+    def scope(self, lang: str) -> 'MetricsScope':
+        """Returns a view that reports everything under one language."""
+        return MetricsScope(self, lang)
+
+    # Export ----------------------------------------------------------------
+
+    @property
+    def records(self) -> List[Dict[str, object]]:
+        """One dict per (language, stage), languages sorted, stages in the order they ran."""
+        with self._lock:
+            items = list(self._records.items())
+        items.sort(key=lambda item: item[0][0])
+        return [{'lang': lang, 'stage': stage, **record} for (lang, stage), record in items]
+
+    def to_dict(self) -> Dict[str, object]:
+        records = self.records
+        totals = _new_record()
+        del totals['duration_seconds']
+        for record in records:
+            for name in totals:
+                totals[name] += record[name]
+        for record in records:
+            record['duration_seconds'] = round(record['duration_seconds'], 6)
+        return {
+            'duration_seconds': round(time.perf_counter() - self._started, 6),
+            'totals': totals,
+            'stages': records,
+        }
+
+    def to_prometheus(self) -> str:
+        """Renders the metrics in the Prometheus text exposition format (version 0.0.4)."""
+        data = self.to_dict()
+        records = data['stages']
+        lines = [
+            '# HELP scaffold_files_total Files handled by a scaffold stage, by outcome.',
+            '# TYPE scaffold_files_total counter',
+        ]
+        for record in records:
+            labels = f'lang="{_label(record["lang"])}",stage="{_label(record["stage"])}"'
+            for outcome in OUTCOMES:
+                lines.append(f'scaffold_files_total{{{labels},outcome="{outcome}"}} {record[outcome]}')
+        lines += [
+            '# HELP scaffold_bytes_written_total Bytes written by a scaffold stage.',
+            '# TYPE scaffold_bytes_written_total counter',
+        ]
+        for record in records:
+            labels = f'lang="{_label(record["lang"])}",stage="{_label(record["stage"])}"'
+            lines.append(f'scaffold_bytes_written_total{{{labels}}} {record["bytes_written"]}')
+        lines += [
+            '# HELP scaffold_stage_duration_seconds Wall-clock time spent in a scaffold stage.',
+            '# TYPE scaffold_stage_duration_seconds gauge',
+        ]
+        for record in records:
+            labels = f'lang="{_label(record["lang"])}",stage="{_label(record["stage"])}"'
+            lines.append(f'scaffold_stage_duration_seconds{{{labels}}} {record["duration_seconds"]}')
+        lines += [
+            '# HELP scaffold_run_duration_seconds Wall-clock time of the whole scaffold run.',
+            '# TYPE scaffold_run_duration_seconds gauge',
+            f'scaffold_run_duration_seconds {data["duration_seconds"]}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def stage_summary(self, lang: str, stage: str) -> str:
+        """One-line summary of a stage, e.g. '12 generated, 2 unchanged, 48213 bytes, 0.04s'."""
+        with self._lock:
+            record = dict(self._records.get((lang or '', stage), _new_record()))
+        parts = [f"{record[outcome]} {outcome}" for outcome in OUTCOMES if record[outcome]]
+        if record['bytes_written']:
+            parts.append(f"{record['bytes_written']} bytes")
+        parts.append(f"{record['duration_seconds']:.2f}s")
+        return ', '.join(parts)
+
+    def failures(self, lang: str) -> int:
+        """Failures counted for one language, over all its stages."""
+        with self._lock:
+            return sum(record['failed'] for (key, _), record in self._records.items() if key == (lang or ''))
+
+    def summary(self) -> str:
+        totals = self.to_dict()['totals']
+        return (f"{totals['generated']} generated, {totals['unchanged']} unchanged, "
+                f"{totals['skipped']} skipped, {totals['failed']} failed, "
+                f"{totals['bytes_written']} bytes written")
+
+    def write(self, json_path: str) -> str:
+        """
+        Writes the JSON export and the Prometheus export next to it.
+
+        Both files are replaced atomically, so a collector never reads a
+        half-written file.
+
+        Args:
+            json_path (str): Target of the JSON export (the .prom file shares its name).
+
+        Returns:
+            str: Path of the Prometheus export.
+        """
+        prom_path = prometheus_path(json_path)
+        write_atomic(json_path, json.dumps(self.to_dict(), indent=2, ensure_ascii=False) + '\n')
+        write_atomic(prom_path, self.to_prometheus())
+        return prom_path
+
+
+class MetricsScope:
+    """RunMetrics view bound to one language; this is what an OutputTree holds."""
+
+    def __init__(self, metrics: RunMetrics, lang: str):
+        self.metrics = metrics
+        self.lang = lang
+
+    def count(self, stage: str, outcome: str, n: int = 1) -> None:
+        self.metrics.count(self.lang, stage, outcome, n)
+
+    def add_bytes(self, stage: str, n: int) -> None:
+        self.metrics.add_bytes(self.lang, stage, n)
+
+    def add_duration(self, stage: str, seconds: float) -> None:
+        self.metrics.add_duration(self.lang, stage, seconds)
+
+    def summary(self, stage: str) -> str:
+        return self.metrics.stage_summary(self.lang, stage)
@@ -7,8 +7,13 @@ fully configured MyST course (myst.yml, programa.md, sessions, activities).
 """
 
 import argparse
+import contextlib
+import functools
+import json
+import posixpath
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add local directory to path to allow imports if running directly
@@ -16,9 +21,18 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from utils import (
-        load_json, generate_filename, TRANSLATIONS, save_yaml,
+        load_json, TRANSLATIONS, save_yaml,
         OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, OUTPUT_DIR_EXAMPLES,
-        OUTPUT_DIR_EXERCISES, OUTPUT_DIR_ASSETS, MYST_CONFIG_FILE
+        OUTPUT_DIR_EXERCISES, OUTPUT_DIR_ASSETS, MYST_CONFIG_FILE, JSON_FILE, CACHE_DIR
+    )
+    from course_model import as_course, load_course, parse_weeks
+    from output_tree import OutputTree, MemoryTree, ChangeManifest, DEFAULT_TREE
+    from build_cache import BuildCache
+    from async_writer import AsyncWriteTree, BulkWriteError, DEFAULT_CONCURRENCY
+    from run_metrics import RunMetrics, DEFAULT_METRICS_FILE
+    import syllabus_diff
+    from log_config import (
+        get_logger, configure as configure_logging, flush as flush_logs, log_context, LEVELS, DEFAULT_BUFFER
     )
     import generate_sessions
     import generate_activities
@@ -27,13 +41,25 @@ try:
     import update_toc
     import inject_activity_header
     import generate_sessions_table_json
+    import search_index
+    import toc_units
+    import validate_schema
 except ImportError:
     # Fallback for when running from root
     sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
     from utils import (
-        load_json, generate_filename, TRANSLATIONS, save_yaml,
+        load_json, TRANSLATIONS, save_yaml,
         OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, OUTPUT_DIR_EXAMPLES,
-        OUTPUT_DIR_EXERCISES, OUTPUT_DIR_ASSETS, MYST_CONFIG_FILE
+        OUTPUT_DIR_EXERCISES, OUTPUT_DIR_ASSETS, MYST_CONFIG_FILE, JSON_FILE, CACHE_DIR
+    )
+    from course_model import as_course, load_course, parse_weeks
+    from output_tree import OutputTree, MemoryTree, ChangeManifest, DEFAULT_TREE
+    from build_cache import BuildCache
+    from async_writer import AsyncWriteTree, BulkWriteError, DEFAULT_CONCURRENCY
+    from run_metrics import RunMetrics, DEFAULT_METRICS_FILE
+    import syllabus_diff
+    from log_config import (
+        get_logger, configure as configure_logging, flush as flush_logs, log_context, LEVELS, DEFAULT_BUFFER
     )
     import generate_sessions
     import generate_activities
@@ -42,22 +68,78 @@ except ImportError:
     import update_toc
     import inject_activity_header
     import generate_sessions_table_json
+    import search_index
+    import toc_units
+    import validate_schema
 
-def create_myst_config(lang: str):
-    """Creates the myst.yml configuration file."""
-    if Path(MYST_CONFIG_FILE).exists():
-        return
+logger = get_logger('scaffold_course')
+
+# Changed-pages manifest written at the end of every real run
+DEFAULT_MANIFEST = os.path.join(CACHE_DIR, 'changes.json')
+
+def build_toc_skeleton(course) -> list:
+    """
+    Builds the language-independent part of the TOC.
+
+    Returns a list of (week_number, children) pairs where children are the
+    session and (hidden) activity entries of the week. Session paths are the
+    ones generate_sessions writes, so the TOC needs no later fix-up. Only the
+    week labels depend on the language, plus the session path of a week
+    without a title (its file is named after the translated "Session N"):
+    that entry's file is None and create_myst_config fills it in, so the
+    skeleton can be shared across languages.
+    In the sharded layout the paths include the week's unit subdirectory.
+    """
+    skeleton = []
+    for w in as_course(course).numbered_weeks():
+        children = [
+            {'file': generate_sessions.session_path(w, None) if w.title else None}
+        ]
+
+        # Add Activities
+        for act in w.activities:
+            children.append({
+                'file': posixpath.join(OUTPUT_DIR_ACTIVITIES, w.folder, act.filename),
+                'hidden': True
+            })
 
-    print("\n🚀 Creating default myst.yml...")
+        skeleton.append((w.number, children))
+    return skeleton
+
+def create_myst_config(lang: str, data=None, out=None, skeleton=None):
+    """
+    Creates the myst.yml configuration file.
+
+    Args:
+        lang (str): Language code used for the week labels.
+        data (Course|dict, optional): Already parsed course (read from disk if omitted).
+        out (OutputTree, optional): Output root (defaults to the working directory).
+        skeleton (list, optional): Precomputed result of build_toc_skeleton().
+
+    Returns:
+        bool: True if myst.yml was created, False if it already existed.
+
+    In the sharded layout the weeks of each unit are nested under a
+    "Unit N" part, so the navigation tree stays small. Each part is also
+    written to its own toc/unit-NN.yml file and spliced into myst.yml
+    (see toc_units.py), so later TOC updates only rewrite the units that changed.
+    """
+    out = out or DEFAULT_TREE
+    if out.exists(MYST_CONFIG_FILE):
+        out.count('skipped')
+        return False
+
+    logger.info("Creating default myst.yml...")
     
     t = TRANSLATIONS.get(lang, TRANSLATIONS['es'])
+    parts = {}
     default_title = "Course Title"
     default_subtitle = "Course Subtitle"
     default_author = "Author Name"
     
     try:
-        data = load_json()
-        metadata = data.get("metadata", {})
+        course = as_course(data if data is not None else load_json())
+        metadata = course.metadata
         default_title = metadata.get("title", default_title)
         default_subtitle = metadata.get("semester", default_subtitle)
         authors = metadata.get("authors", [])
@@ -67,42 +149,31 @@ def create_myst_config(lang: str):
              default_author = authors
         
         # Build TOC
+        if skeleton is None:
+            skeleton = build_toc_skeleton(course)
         toc_entries = [{'file': 'programa.md'}]
-        weeks = data.get('weeks', [])
         week_label = t['week']
-        
-        if weeks:
-            for w in weeks:
-                week_num = w.get('week')
-                if not week_num: continue
-                
-                week_entry = {
-                    'title': f"{week_label} {week_num}",
-                    'children': [
-                        {'file': f"sessions/{int(week_num):02d}-session.md"}
-                    ]
-                }
-                
-                # Add Activities
-                raw_activities = w.get('activities')
-                if raw_activities:
-                    act_list = []
-                    if isinstance(raw_activities, str):
-                        act_list.append(raw_activities)
-                    elif isinstance(raw_activities, list):
-                        act_list = raw_activities
-                    
-                    for act_desc in act_list:
-                        act_filename = generate_filename(week_num, act_desc)
-                        week_entry['children'].append({
-                            'file': f"activities/{act_filename}",
-                            'hidden': True
-                        })
-                
+
+        for week_num, children in skeleton:
+            week = course.week(int(week_num))
+            week_entry = {
+                'title': f"{week_label} {week_num}",
+                'children': [dict(child) for child in children]
+            }
+            session = week_entry['children'][0]
+            if session['file'] is None:
+                session['file'] = generate_sessions.session_path(week, t)
+            unit = week.unit if week is not None else None
+            if unit is None:
                 toc_entries.append(week_entry)
+            elif unit in parts:
+                parts[unit]['children'].append(week_entry)
+            else:
+                parts[unit] = {'title': f"{t['unit']} {unit}", 'children': [week_entry]}
+                toc_entries.append(toc_units.include(unit))
 
     except Exception as e:
-        print(f"⚠️  Could not read metadata from planeamiento.json: {e}")
+        logger.warning(f"⚠️  Could not read metadata from planeamiento.json: {e}")
         toc_entries = [{'file': 'programa.md'}]
 
     myst_config = {
@@ -133,8 +204,201 @@ def create_myst_config(lang: str):
         }
     }
     
-    save_yaml(MYST_CONFIG_FILE, myst_config)
-    print("✅ Created myst.yml")
+    if not parts:
+        save_yaml(MYST_CONFIG_FILE, myst_config, out=out)
+        logger.debug(f"Created {MYST_CONFIG_FILE}")
+        return True
+
+    if not out.exists(toc_units.TOC_DIR):
+        out.makedirs(toc_units.TOC_DIR)
+    units = {toc_units.unit_file(unit): toc_units.render_unit(part) for unit, part in parts.items()}
+    for path, text in units.items():
+        out.write_text(path, text)
+    out.write_text(MYST_CONFIG_FILE, toc_units.render_config(myst_config, units))
+    logger.debug(f"Created {MYST_CONFIG_FILE} and {len(units)} unit TOC files")
+    return True
+
+@contextlib.contextmanager
+def _stage(out, name: str, title: str, done: str):
+    """
+    Runs one stage: logs its start, times it through the tree and closes with
+    a one-line summary (counts from the run metrics when the tree has them).
+    Buffered log lines are written at the end of every stage.
+    """
+    with log_context(stage=name):
+        logger.info(f"🚀 {title}")
+        try:
+            with out.running(name):
+                yield
+            detail = f" ({out.metrics.summary(name)})" if out.metrics is not None else ''
+            logger.info(f"✅ {done}{detail}")
+        finally:
+            flush_logs()
+
+def scaffold(lang: str, force: bool, data, out=None, skeleton=None, cache=None, jobs: int = 1, weeks=None,
+             rebuild=None):
+    """
+    Runs every generation stage for one language into one output root.
+
+    Args:
+        lang (str): Language code.
+        force (bool): Whether to overwrite existing files.
+        data (Course): Parsed course, shared between languages.
+        out (OutputTree, optional): Output root (defaults to the working directory).
+        skeleton (list, optional): Shared result of build_toc_skeleton().
+        cache (BuildCache, optional): Build cache for sessions, activities and programa.md.
+        jobs (int): Worker processes for badge injection.
+        weeks (list, optional): Only regenerate the outputs of these week numbers
+            (sessions, activities, badges, TOC entries, sessions table rows and
+            search index entries);
+            programa.md is then only created if missing.
+        rebuild (RebuildPlan, optional): Per-stage selection from syllabus_diff (overrides
+            weeks): each stage only regenerates the weeks whose inputs changed, and
+            programa.md is only rewritten when a field it shows changed. The selected
+            outputs are overwritten.
+    """
+    out = out or DEFAULT_TREE
+    force = force or rebuild is not None
+
+    def selected(stage):
+        return rebuild.weeks(stage) if rebuild is not None else weeks
+
+    if rebuild is not None:
+        init_program = not force or not rebuild.reruns(syllabus_diff.PROGRAM)
+    else:
+        init_program = not force or weeks is not None
+
+    with log_context(lang=lang):
+        # 0. Ensure myst.yml exists
+        with _stage(out, 'create_myst_config', "Checking myst.yml...", "myst.yml ready"):
+            created = create_myst_config(lang, data=data, out=out, skeleton=skeleton)
+
+        # 0.5 Ensure programa.md exists
+        with _stage(out, 'generate_program', "Generating programa.md...", "programa.md verification completed"):
+            generate_program.run(lang=lang, init=init_program, data=data, out=out, cache=cache)
+
+        # 1. Create Directory Structure
+        directories = [OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, OUTPUT_DIR_EXAMPLES, OUTPUT_DIR_EXERCISES, OUTPUT_DIR_ASSETS]
+        logger.info("🚀 Verifying directory structure...")
+        for d in directories:
+            if not out.exists(d):
+                out.makedirs(d)
+                logger.debug(f"   Created directory: {d}/")
+            else:
+                logger.debug(f"   Directory exists: {d}/")
+        logger.info("✅ Directory structure verification completed.")
+
+        # 2. Sync Myst Metadata
+        with _stage(out, 'sync_myst', "Synchronizing myst.yml metadata...", "myst.yml synchronized"):
+            sync_myst.main(data=data, out=out)
+
+        # 2. Generate Sessions
+        with _stage(out, 'generate_sessions', "Generating session files...", "Session files generated"):
+            generate_sessions.run(lang=lang, force=force, data=data, out=out, cache=cache,
+                                  weeks=selected('generate_sessions'))
+
+        # 3. Update Table of Contents (a myst.yml created by this run already matches the sessions)
+        if created:
+            logger.debug("Skipping TOC update: myst.yml was just created")
+        else:
+            with _stage(out, 'update_toc', "Updating Table of Contents (TOC)...", "TOC updated"):
+                update_toc.main(out=out, data=data, weeks=selected('update_toc'))
+
+        # 4. Generate Activities
+        with _stage(out, 'generate_activities', "Generating activity skeletons...", "Activity skeletons generated"):
+            generate_activities.run(lang=lang, force=force, data=data, out=out, cache=cache,
+                                    weeks=selected('generate_activities'),
+                                    filenames=rebuild.activity_files if rebuild is not None else None)
+
+        # 5. Inject Activity Headers
+        with _stage(out, 'inject_activity_header', "Injecting activity badges...", "Activity badges injected"):
+            inject_activity_header.run(lang=lang, out=out, jobs=jobs, weeks=selected('inject_activity_header'))
+
+        # 5. Generate Sessions Table
+        with _stage(out, 'generate_sessions_table_json', "Generating sessions table...", "Sessions table generated"):
+            generate_sessions_table_json.run(lang=lang, data=data, out=out,
+                                             weeks=selected('generate_sessions_table_json'))
+
+        # 6. Build Search Index
+        with _stage(out, 'build_search_index', "Building search index...", "Search index built"):
+            search_index.run(lang=lang, data=data, out=out, weeks=selected('build_search_index'))
+
+def scaffold_languages(trees: dict, force: bool, data, cache=None, jobs: int = 1, weeks=None, rebuild=None):
+    """
+    Renders several languages concurrently, one output root per language.
+
+    The course is parsed once by the caller; the TOC skeleton, filename slugs
+    and static assets are computed or copied once and shared by all languages.
+
+    Args:
+        trees (dict): Mapping of language code to its OutputTree.
+        force (bool): Whether to overwrite existing files.
+        data (Course): Parsed course.
+        cache (BuildCache, optional): Build cache shared by all languages.
+        jobs (int): Worker processes for badge injection, per language.
+        weeks (list, optional): Week numbers to regenerate (all by default).
+        rebuild (dict, optional): Language code -> RebuildPlan; languages without one run every stage.
+
+    Returns:
+        dict: Mapping of language code to the exception it raised (empty on success).
+    """
+    skeleton = build_toc_skeleton(data)
+
+    def render(lang):
+        out = trees[lang]
+        out.ensure_root()
+        if Path(OUTPUT_DIR_ASSETS).is_dir():
+            out.copy_tree(OUTPUT_DIR_ASSETS)
+        scaffold(lang, force, data, out=out, skeleton=skeleton, cache=cache, jobs=jobs, weeks=weeks,
+                 rebuild=(rebuild or {}).get(lang))
+
+    failures = {}
+    with ThreadPoolExecutor(max_workers=len(trees)) as executor:
+        futures = {executor.submit(render, lang): lang for lang in trees}
+        for future in as_completed(futures):
+            lang = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failures[lang] = e
+    return failures
+
+def print_plan(trees: list, fmt: str = 'text'):
+    """
+    Prints the pending writes recorded by one or more MemoryTrees.
+
+    Args:
+        trees (list): MemoryTree instances that the stages ran against.
+        fmt (str): 'text' for a human-readable listing, 'json' for CI.
+    """
+    entries = []
+    for tree in trees:
+        for entry in tree.plan():
+            entry['path'] = tree.path(entry['path'])
+            entries.append(entry)
+
+    summary = {action: 0 for action in ('create', 'change', 'unchanged')}
+    for entry in entries:
+        summary[entry['action']] += 1
+    empty = summary['create'] == 0 and summary['change'] == 0
+
+    if fmt == 'json':
+        print(json.dumps({
+            'empty': empty,
+            'summary': summary,
+            'bytes_delta': sum(e['delta'] for e in entries),
+            'files': entries
+        }, indent=2, ensure_ascii=False))
+        return
+
+    symbols = {'create': '+', 'change': '~', 'unchanged': '='}
+    print(f"\n📋 Plan: {summary['create']} to create, {summary['change']} to change, "
+          f"{summary['unchanged']} unchanged")
+    for entry in entries:
+        print(f"   {symbols[entry['action']]} {entry['path']} "
+              f"({entry['old_bytes']} -> {entry['new_bytes']} bytes, {entry['delta']:+d})")
+    if empty:
+        print("✅ Nothing to do: all generated files are up to date.")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -151,23 +415,143 @@ def main():
         choices=["es", "en", "fr"],
         help="Language for generated content (default: en)"
     )
+    parser.add_argument(
+        "--langs",
+        help="Comma-separated languages to render in one run (e.g. es,en,fr); "
+             "each goes to its own directory under --output-root"
+    )
+    parser.add_argument(
+        "--output-root",
+        default="langs",
+        help="Parent directory for per-language output roots used with --langs (default: langs)"
+    )
+    parser.add_argument(
+        "--weeks",
+        metavar="SPEC",
+        help="Only regenerate these weeks, as numbers and ranges (e.g. 3,5-9): their sessions, "
+             "activities, badges, TOC entries and sessions table rows"
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Diff planeamiento.json against the snapshot saved by the last complete run and "
+             "overwrite only the outputs that depend on the changed fields (e.g. an objectives "
+             "change rewrites that session page and its sessions table row)"
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Report every file that would be created or changed without writing anything"
+    )
+    parser.add_argument(
+        "--plan-format",
+        default="text",
+        choices=["text", "json"],
+        help="Output format for --plan (default: text)"
+    )
+    parser.add_argument(
+        "--build-cache",
+        metavar="DIR",
+        help="Content-addressed cache directory: unchanged weeks are restored from it "
+             "instead of re-rendered (e.g. .scaffold_cache/build, persisted with actions/cache)"
+    )
+    parser.add_argument(
+        "--manifest",
+        default=DEFAULT_MANIFEST,
+        metavar="PATH",
+        help="Where to write the JSON list of files whose content changed "
+             f"(path, old/new hash, reason; default: {DEFAULT_MANIFEST}). Use '' to disable"
+    )
+    parser.add_argument(
+        "--metrics",
+        default=DEFAULT_METRICS_FILE,
+        metavar="PATH",
+        help="Where to write per-stage run metrics as JSON (files generated/skipped/unchanged/failed, "
+             f"bytes written, duration; default: {DEFAULT_METRICS_FILE}). A Prometheus text "
+             "export is written next to it with a .prom extension. Use '' to disable"
+    )
+    parser.add_argument(
+        "--writer",
+        default="sync",
+        choices=["sync", "async"],
+        help="Output backend: 'sync' writes files one at a time, 'async' queues them and "
+             "writes concurrently (faster on NFS and other network filesystems)"
+    )
+    parser.add_argument(
+        "--write-concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        metavar="N",
+        help=f"Parallel writes for --writer async (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes for activity badge injection (default: 1)"
+    )
     parser.add_argument(
         "--yes", "-y",
         action="store_true",
         help="Automatically answer 'yes' to confirmation prompts"
     )
+    parser.add_argument(
+        "--log-level",
+        default="info",
+        choices=list(LEVELS),
+        help="Minimum log level (default: info). Per-file messages are only shown at debug"
+    )
+    parser.add_argument(
+        "--quiet", "-q",
+        action="store_true",
+        help="Only log warnings and errors"
+    )
+    parser.add_argument(
+        "--log-format",
+        default="text",
+        choices=["text", "json"],
+        help="'text' for plain messages, 'json' for one JSON object per line "
+             "(level, logger, message, lang, stage, week, file)"
+    )
     
     args = parser.parse_args()
+
+    # In plan mode logs go to stderr so stdout only carries the plan
+    configure_logging(level=args.log_level, fmt=args.log_format, quiet=args.quiet,
+                      stream='stderr' if args.plan else 'stdout', buffer=DEFAULT_BUFFER)
+
+    langs = None
+    if args.langs:
+        langs = [l.strip() for l in args.langs.split(',') if l.strip()]
+        unknown = [l for l in langs if l not in TRANSLATIONS]
+        if unknown or not langs:
+            logger.error(f"❌ Unsupported language(s) in --langs: {', '.join(unknown) or args.langs}")
+            sys.exit(1)
+        # Remove duplicates while keeping order
+        langs = list(dict.fromkeys(langs))
+
+    if args.weeks and args.changed_only:
+        logger.error("❌ --weeks and --changed-only cannot be combined")
+        sys.exit(1)
+
+    weeks = None
+    if args.weeks:
+        try:
+            weeks = parse_weeks(args.weeks)
+        except ValueError as e:
+            logger.error(f"❌ {e}")
+            sys.exit(1)
     
     # Ensure planeamiento.json exists
-    if not Path("planeamiento.json").exists():
-        print("❌ planeamiento.json not found in the root directory.")
+    if not Path(JSON_FILE).exists():
+        logger.error("❌ planeamiento.json not found in the root directory.")
         sys.exit(1)
     
     t = TRANSLATIONS.get(args.lang, TRANSLATIONS['es'])
     
-    # Check for force flag with interactive confirmation
-    if args.force:
+    # Check for force flag with interactive confirmation (a plan never overwrites anything)
+    if (args.force or args.changed_only) and not args.plan:
         print(f"\n{t['warning']}")
         if args.yes:
              print(f"{t['confirm']} y (auto-confirmed)")
@@ -176,63 +560,137 @@ def main():
             if response != 'y':
                 print(f"{t['abort']}")
                 sys.exit(0)
-    
-    print("🏗️  Starting course scaffolding process...")
-    print(f"   Language: {args.lang}")
-    print(f"   Force overwrite: {args.force}")
 
-    # 0. Ensure myst.yml exists
-    create_myst_config(args.lang)
-    
-    # 0.5 Ensure programa.md exists
-    print("\n🚀 Generating programa.md...")
-    generate_program.run(lang=args.lang, init=not args.force)
-    print("✅ programa.md verification completed.")
-    
-    # 1. Create Directory Structure
-    directories = [OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, OUTPUT_DIR_EXAMPLES, OUTPUT_DIR_EXERCISES, OUTPUT_DIR_ASSETS]
-    print("\n🚀 Verifying directory structure...")
-    for d in directories:
-        p = Path(d)
-        if not p.exists():
-            p.mkdir(parents=True)
-            print(f"   Created directory: {d}/")
-        else:
-            print(f"   Directory exists: {d}/")
-    print("✅ Directory structure verification completed.")
-
-    # 2. Sync Myst Metadata
-    print("\n🚀 Synchronizing myst.yml metadata...")
-    sync_myst.main()
-    print("✅ myst.yml synchronized.")
-
-    # 2. Generate Sessions
-    print("\n🚀 Generating session files...")
-    generate_sessions.run(lang=args.lang, force=args.force)
-    print("✅ Session files generated.")
-
-    # 3. Update Table of Contents
-    print("\n🚀 Updating Table of Contents (TOC)...")
-    update_toc.main()
-    print("✅ TOC updated.")
-
-    # 4. Generate Activities
-    print("\n🚀 Generating activity skeletons...")
-    generate_activities.run(lang=args.lang, force=args.force)
-    print("✅ Activity skeletons generated.")
-
-    # 5. Inject Activity Headers
-    print("\n🚀 Injecting activity badges...")
-    inject_activity_header.run(lang=args.lang)
-    print("✅ Activity badges injected.")
-
-    # 5. Generate Sessions Table
-    print("\n🚀 Generating sessions table...")
-    generate_sessions_table_json.run(lang=args.lang)
-    print("✅ Sessions table generated.")
-
-    print(f"\n{t['success']}")
-    print(t['run_hint'])
+    # Anything else printed during a plan also goes to stderr
+    log = contextlib.redirect_stdout(sys.stderr) if args.plan else contextlib.nullcontext()
+    # Real runs record their effective writes as they happen (no rescan at the end)
+    manifest = ChangeManifest() if args.manifest and not args.plan else None
+    # Always collected for the stage summaries; exported only with --metrics
+    metrics = RunMetrics() if not args.plan else None
+    if args.writer == 'async':
+        make_disk_tree = functools.partial(AsyncWriteTree, manifest=manifest, concurrency=args.write_concurrency)
+    else:
+        make_disk_tree = functools.partial(OutputTree, manifest=manifest)
+
+    def make_tree(lang, root='.'):
+        if args.plan:
+            return MemoryTree(root)
+        return make_disk_tree(root, metrics=metrics.scope(lang) if metrics is not None else None)
+
+    with log:
+        logger.info("🏗️  Starting course scaffolding process...")
+        logger.info(f"   Language: {', '.join(langs) if langs else args.lang}")
+        logger.info(f"   Force overwrite: {args.force}")
+
+        # Pre-flight: validate the whole syllabus once (cached by file hash; a plan writes no cache)
+        errors = validate_schema.validate_file(JSON_FILE, cache_dir=None if args.plan else CACHE_DIR)
+        if errors:
+            logger.error(f"❌ {JSON_FILE}: {len(errors)} schema error(s)\n" +
+                         '\n'.join(f"   {error}" for error in errors), extra={'file': JSON_FILE})
+            sys.exit(1)
+
+        try:
+            data = load_course()
+        except Exception as e:
+            logger.error(f"❌ Error reading planeamiento.json: {e}", extra={'file': JSON_FILE})
+            sys.exit(1)
+
+        if weeks is not None:
+            missing = [n for n in weeks if data.week(n) is None]
+            if missing:
+                logger.warning(f"⚠️  No week(s) {', '.join(map(str, missing))} in {JSON_FILE}")
+            logger.info(f"   Weeks: {', '.join(map(str, weeks))}")
+
+        roots = {lang: os.path.join(args.output_root, lang) for lang in langs} if langs else {args.lang: '.'}
+        current = syllabus_diff.snapshot(data)
+        previous = {lang: syllabus_diff.load_snapshot(os.path.join(root, syllabus_diff.SNAPSHOT_FILE))
+                    for lang, root in roots.items()}
+        rebuild = {}
+        if args.changed_only:
+            for lang, root in roots.items():
+                if previous[lang] is None:
+                    logger.warning(f"⚠️  No syllabus snapshot in {root}: running every stage without overwriting",
+                                   extra={'lang': lang})
+                    continue
+                changes = syllabus_diff.diff(previous[lang], current)
+                rebuild[lang] = syllabus_diff.RebuildPlan.from_changes(changes, data)
+                logger.info(f"   Syllabus changes ({root}): {len(changes) or 'none'}", extra={'lang': lang})
+                for change in changes:
+                    logger.info(f"      {change}", extra={'lang': lang})
+                for line in rebuild[lang].describe():
+                    logger.info(f"      -> {line}", extra={'lang': lang})
+
+        # A plan must not write anywhere, including the cache
+        cache = BuildCache(args.build_cache) if args.build_cache and not args.plan else None
+
+        try:
+            if langs:
+                trees = {lang: make_tree(lang, os.path.join(args.output_root, lang)) for lang in langs}
+                failures = scaffold_languages(trees, args.force, data, cache=cache, jobs=args.jobs, weeks=weeks,
+                                              rebuild=rebuild)
+                for lang, e in failures.items():
+                    logger.error(f"❌ Language '{lang}' failed: {e}", extra={'lang': lang})
+                if failures:
+                    sys.exit(1)
+            else:
+                trees = {args.lang: make_tree(args.lang)}
+                scaffold(args.lang, args.force, data, out=trees[args.lang], cache=cache, jobs=args.jobs, weeks=weeks,
+                         rebuild=rebuild.get(args.lang))
+
+            # Wait for queued writes (async backend) and report every failure at once
+            write_errors = []
+            for tree in trees.values():
+                try:
+                    tree.close()
+                except BulkWriteError as e:
+                    write_errors.extend(e.errors)
+            if write_errors:
+                for path, error in write_errors:
+                    logger.error(f"   {path}: {error}", extra={'file': path})
+                logger.error(f"❌ {len(write_errors)} file(s) could not be written")
+                sys.exit(1)
+
+            # The snapshot is the baseline of the next --changed-only run: only move it
+            # when this run left every output of the root up to date, i.e. a --force or
+            # --changed-only run (others keep existing files) in which no stage failed
+            if not args.plan and weeks is None:
+                for lang, tree in trees.items():
+                    if not (args.force or lang in rebuild):
+                        if previous[lang] is None:
+                            logger.info(f"   No syllabus snapshot in {tree.root}: run once with --force to set "
+                                        "the baseline for --changed-only", extra={'lang': lang})
+                        continue
+                    failed = metrics.failures(lang)
+                    if failed:
+                        logger.warning(f"⚠️  Syllabus snapshot in {tree.root} not updated: {failed} failure(s) "
+                                       "in this run", extra={'lang': lang})
+                        continue
+                    syllabus_diff.save_snapshot(tree.path(syllabus_diff.SNAPSHOT_FILE), current)
+
+            if cache is not None:
+                logger.info(f"📦 {cache.summary()}")
+
+            if manifest is not None:
+                manifest.write(args.manifest)
+                logger.info(f"🧾 {len(manifest.entries)} changed file(s) recorded in {args.manifest}")
+        finally:
+            # Also written when the run fails: that is when the numbers matter most
+            if metrics is not None and args.metrics:
+                prom_path = metrics.write(args.metrics)
+                logger.info(f"📈 {metrics.summary()} (metrics: {args.metrics}, {prom_path})")
+            flush_logs()
+
+    if args.plan:
+        print_plan([trees[lang] for lang in (langs or [args.lang])], fmt=args.plan_format)
+        return
+
+    logger.info(t['success'])
+    if langs:
+        for lang in langs:
+            logger.info(f"   {lang}: {trees[lang].root}")
+    else:
+        logger.info(t['run_hint'])
+    flush_logs()
 
 if __name__ == "__main__":
     main()
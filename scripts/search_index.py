@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Builds a prebuilt, sharded inverted index for client-side search.
+
+Sessions (title, content items, objectives, evaluations) and activities
+(description) become documents; their terms are tokenised like the session
+keywords, folded to lower-case ASCII and written as an inverted index split
+by the first two letters of each term, so the browser only fetches the
+shards of the terms typed in:
+
+    assets/search/manifest.json   version, shard list, per-week fingerprints
+    assets/search/docs.json       document id -> [title, source path]
+    assets/search/terms/ve.json   term -> [[document id, weight], ...]
+
+Document ids start with their week ("3/session", "3/03-lab-3"). The manifest
+records, per week, a hash of its indexed text and the shard prefixes its
+terms fall in. A rebuild only reads and rewrites the shards touched by
+weeks whose hash changed (or that were added or removed). Only the shards
+listed in the manifest are part of the index: a shard left without terms is
+dropped from it and not rewritten.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import load_json, generate_filename, OUTPUT_DIR_ASSETS, OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, TRANSLATIONS
+    from course_model import as_course, parse_weeks
+    from output_tree import DEFAULT_TREE
+    from keywords import tokenize, TITLE_WEIGHT
+    from log_config import get_logger
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import load_json, generate_filename, OUTPUT_DIR_ASSETS, OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, TRANSLATIONS
+    from course_model import as_course, parse_weeks
+    from output_tree import DEFAULT_TREE
+    from keywords import tokenize, TITLE_WEIGHT
+    from log_config import get_logger
+
+logger = get_logger('search_index')
+
+SEARCH_DIR = os.path.join(OUTPUT_DIR_ASSETS, 'search')
+MANIFEST_FILE = os.path.join(SEARCH_DIR, 'manifest.json')
+DOCS_FILE = os.path.join(SEARCH_DIR, 'docs.json')
+SHARD_DIR = os.path.join(SEARCH_DIR, 'terms')
+
+INDEX_VERSION = 1
+PREFIX_LENGTH = 2
+
+# Terms whose prefix is not plain ASCII letters/digits share one shard
+OTHER_SHARD = '_'
+_SHARD_NAME_RE = re.compile(r'[a-z0-9]+')
+
+
+def fold(term: str) -> str:
+    """Lower-case ASCII form of a term ('Energía' -> 'energia'); the client folds queries the same way."""
+    decomposed = unicodedata.normalize('NFKD', term.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def shard_of(term: str) -> str:
+    """Shard prefix of a folded term."""
+    prefix = term[:PREFIX_LENGTH]
+    return prefix if _SHARD_NAME_RE.fullmatch(prefix) else OTHER_SHARD
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+
+def _terms(*texts: str) -> Counter:
+    counts = Counter()
+    for text in texts:
+        counts.update(fold(token) for token in tokenize(text or ''))
+    return counts
+
+
+def week_documents(week, t: dict) -> List[Tuple[str, List[str], Counter]]:
+    """
+    Documents of one week.
+
+    Returns:
+        list: (document id, [title, source path], term weights) per session and activity.
+    """
+    number = int(week.number)
+    title = week.title or f"{t['session']} {number}"
+    session_terms = _terms(*[title] * TITLE_WEIGHT, *week.content, *week.objectives,
+                           *[f"{e.type or ''} {e.description or ''}" for e in week.evaluation])
+    session_path = posixpath.join(OUTPUT_DIR_SESSIONS, week.folder, generate_filename(number, title))
+    docs = [(f"{number}/session", [title, session_path], session_terms)]
+    for activity in week.activities:
+        stem = os.path.splitext(activity.filename)[0]
+        docs.append((f"{number}/{stem}",
+                     [activity.title, posixpath.join(OUTPUT_DIR_ACTIVITIES, week.folder, activity.filename)],
+                     _terms(activity.description)))
+    return docs
+
+
+def _fingerprint(docs) -> str:
+    payload = [(doc_id, meta, sorted(terms.items())) for doc_id, meta, terms in docs]
+    return hashlib.sha256(_dumps(payload).encode('utf-8')).hexdigest()[:16]
+
+
+def _read_json(out, relpath: str) -> Optional[dict]:
+    try:
+        data = json.loads(out.read_text(relpath))
+    except (OSError, ValueError, KeyError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _shard_path(prefix: str) -> str:
+    return os.path.join(SHARD_DIR, f"{prefix}.json")
+
+
+def run(lang: str = 'es', data=None, out=None, weeks=None):
+    """
+    Builds or incrementally updates the search index.
+
+    Args:
+        lang (str): Language code (fallback session titles).
+        data (Course|dict, optional): Already parsed course (read from disk if omitted).
+        out (OutputTree, optional): Output root (defaults to the working directory).
+        weeks (list, optional): Only re-index these weeks (see course_model.parse_weeks); the
+            other weeks keep their entries, and selected weeks no longer in the course are
+            removed. Every week is checked by default, and always when there is no index yet.
+    """
+    t = TRANSLATIONS.get(lang, TRANSLATIONS['es'])
+    out = out or DEFAULT_TREE
+
+    try:
+        course = as_course(data if data is not None else load_json())
+    except Exception as e:
+        logger.error(f"Error reading JSON file: {e}")
+        out.count('failed')
+        return
+
+    manifest = _read_json(out, MANIFEST_FILE) if out.exists(MANIFEST_FILE) else None
+    if manifest is not None and (manifest.get('version') != INDEX_VERSION
+                                 or manifest.get('prefix_length') != PREFIX_LENGTH):
+        manifest = None
+    old_weeks = manifest.get('weeks', {}) if manifest else {}
+
+    # A first build (or a format change) indexes every week
+    if manifest is None:
+        weeks = None
+
+    # Week key -> (fingerprint, shard prefixes, documents) for the weeks to check
+    current = {}
+    for week in course.select(weeks):
+        try:
+            number = int(week.number)
+        except (TypeError, ValueError):
+            continue
+        docs = week_documents(week, t)
+        prefixes = sorted({shard_of(term) for _, _, terms in docs for term in terms})
+        current[str(number)] = (_fingerprint(docs), prefixes, docs)
+
+    if weeks is not None:
+        # Selected weeks that are gone from the course still have to leave the index
+        checked = set(current) | {str(n) for n in weeks if str(n) in old_weeks}
+    else:
+        checked = set(current) | set(old_weeks)
+    changed = {key for key in checked
+               if key not in current or key not in old_weeks or old_weeks[key][0] != current[key][0]}
+    if manifest is not None and not changed:
+        logger.info("Search index: up to date")
+        out.count('unchanged')
+        return
+
+    touched: Set[str] = set()
+    for key in changed:
+        if key in old_weeks:
+            touched.update(old_weeks[key][1])
+        if key in current:
+            touched.update(current[key][1])
+
+    if not out.exists(SHARD_DIR):
+        if not out.exists(SEARCH_DIR):
+            if not out.exists(OUTPUT_DIR_ASSETS):
+                out.makedirs(OUTPUT_DIR_ASSETS)
+            out.makedirs(SEARCH_DIR)
+        out.makedirs(SHARD_DIR)
+
+    # Postings of the changed weeks, grouped by shard
+    added: Dict[str, Dict[str, List[list]]] = {}
+    for key in changed & set(current):
+        for doc_id, _, terms in current[key][2]:
+            for term, weight in terms.items():
+                added.setdefault(shard_of(term), {}).setdefault(term, []).append([doc_id, weight])
+
+    shards = dict(manifest.get('shards', {})) if manifest else {}
+    for prefix in sorted(touched):
+        index = {}
+        # A shard left out of the manifest is stale (see below), never read it back
+        if prefix in shards and out.exists(_shard_path(prefix)):
+            index = _read_json(out, _shard_path(prefix)) or {}
+        for term in list(index):
+            postings = [p for p in index[term] if p[0].split('/', 1)[0] not in changed]
+            if postings:
+                index[term] = postings
+            else:
+                del index[term]
+        for term, postings in added.get(prefix, {}).items():
+            index.setdefault(term, []).extend(postings)
+        for postings in index.values():
+            postings.sort(key=lambda p: (-p[1], p[0]))
+        # An emptied shard is dropped from the manifest instead of being written
+        if index:
+            out.write_text(_shard_path(prefix), _dumps(index))
+            shards[prefix] = len(index)
+        else:
+            shards.pop(prefix, None)
+
+    docs = (_read_json(out, DOCS_FILE) or {}) if manifest is not None and out.exists(DOCS_FILE) else {}
+    docs = {doc_id: meta for doc_id, meta in docs.items() if doc_id.split('/', 1)[0] not in changed}
+    for key in changed & set(current):
+        for doc_id, meta, _ in current[key][2]:
+            docs[doc_id] = meta
+    out.write_text(DOCS_FILE, _dumps(docs))
+
+    new_weeks = {key: value for key, value in old_weeks.items() if key not in changed}
+    for key in changed & set(current):
+        new_weeks[key] = [current[key][0], current[key][1]]
+    out.write_text(MANIFEST_FILE, _dumps({
+        'version': INDEX_VERSION,
+        'prefix_length': PREFIX_LENGTH,
+        'documents': len(docs),
+        'shards': shards,
+        'weeks': new_weeks,
+    }))
+
+    logger.info(f"Search index: {len(changed)} week(s) re-indexed, {len(touched)} shard(s) rewritten, "
+                f"{len(docs)} documents in {len(shards)} shards")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the sharded client-side search index from planeamiento.json.')
+    parser.add_argument('--lang', default='es', choices=['es', 'en', 'fr'], help='Language for fallback titles')
+    parser.add_argument('--weeks', help='Only re-index these weeks, as numbers and ranges (e.g., 3,5-9)')
+    args = parser.parse_args()
+    try:
+        weeks = parse_weeks(args.weeks) if args.weeks else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    run(lang=args.lang, weeks=weeks)
+
+if __name__ == "__main__":
+    main()
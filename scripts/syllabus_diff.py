@@ -0,0 +1,330 @@
+"""
+Field-level change detection between syllabus revisions.
+
+After every --force or --changed-only run without failures (the runs that
+leave every output up to date) a compact snapshot of planeamiento.json is
+stored in the output root: one short hash per metadata key and per week field, and one
+hash per activity. The next run diffs the current syllabus against it and
+reports what changed at field level:
+
+    week 3: objectives modified
+    week 5: activities[2] added
+    metadata.title modified
+
+Each change is mapped to the stages whose outputs read that field (see
+WEEK_FIELD_DEPENDENTS), giving a RebuildPlan that scaffold_course.py runs with
+--changed-only: a typo fix in a week's references only rewrites that session
+page, an objectives change only that session page and its sessions table row
+(plus the other session pages whose TF-IDF keywords it shifted).
+"""
+
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import CACHE_DIR, write_atomic
+    from course_model import as_course
+    from keywords import extract_keywords
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import CACHE_DIR, write_atomic
+    from course_model import as_course
+    from keywords import extract_keywords
+
+# Snapshot location, relative to an output root
+SNAPSHOT_FILE = os.path.join(CACHE_DIR, 'syllabus_snapshot.json')
+
+# Bump when the snapshot layout or the hashed representation changes
+SNAPSHOT_VERSION = 3
+
+# Stages whose outputs can depend on the syllabus (names as in scaffold_course)
+SESSIONS = 'generate_sessions'
+ACTIVITIES = 'generate_activities'
+BADGES = 'inject_activity_header'
+TOC = 'update_toc'
+TABLE = 'generate_sessions_table_json'
+PROGRAM = 'generate_program'
+MYST = 'sync_myst'
+SEARCH = 'build_search_index'
+
+WEEK_STAGES = (SESSIONS, TOC, ACTIVITIES, BADGES, TABLE, SEARCH)
+
+# Week field -> stages that render it. 'activities' is the list itself (order,
+# single-string shape); 'activity' is one added activity, whose skeleton is new.
+WEEK_FIELD_DEPENDENTS = {
+    'title': (SESSIONS, TOC, TABLE, PROGRAM, SEARCH),
+    'subtitle': (SESSIONS,),
+    'content': (SESSIONS, PROGRAM, SEARCH),
+    'objectives': (SESSIONS, TABLE, SEARCH),
+    'activities': (SESSIONS, TOC, SEARCH),
+    'activity': (SESSIONS, ACTIVITIES, BADGES, TOC, SEARCH),
+    'evaluation': (SESSIONS, SEARCH),
+    'references': (SESSIONS,),
+    # Unit of the sharded layout: the week's pages move to another directory
+    'unit': (SESSIONS, TOC, ACTIVITIES, BADGES, SEARCH),
+    # Derived: the session keywords (course-wide TF-IDF, see keywords.py)
+    'keywords': (SESSIONS,),
+}
+
+WEEK_FIELDS = ('title', 'subtitle', 'content', 'objectives', 'activities', 'evaluation', 'references', 'unit',
+               'keywords')
+
+
+def _digest(value) -> str:
+    """Short, stable hash of a JSON-serialisable value."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def snapshot(data) -> dict:
+    """
+    Builds the compact snapshot of a course.
+
+    Args:
+        data (Course|dict): Parsed course or raw planeamiento.json.
+
+    Returns:
+        dict: {'version', 'metadata': {key: hash}, 'weeks': {number: {field: hash, 'activity_hashes': [...]}}}.
+
+    Besides the week fields, each week records a hash of its session keywords.
+    They are scored across the whole course, so editing (or adding, or removing)
+    one week can change the keywords of the others, which diff() then reports
+    as their own 'keywords modified' change.
+    """
+    course = as_course(data)
+    keywords = extract_keywords(course)
+    weeks = {}
+    for w in course.numbered_weeks():
+        fields = {
+            'title': _digest(w.title),
+            'subtitle': _digest(w.subtitle),
+            'content': _digest(w.content),
+            'objectives': _digest(w.objectives_value()),
+            'activities': _digest(w.activities_value()),
+            'evaluation': _digest([e.to_dict() for e in w.evaluation]),
+            'references': _digest([r.to_dict() for r in w.references]),
+            'unit': _digest(w.unit),
+            'keywords': _digest(keywords.get(w.number, [])),
+        }
+        fields['activity_hashes'] = [_digest(a.description) for a in w.activities]
+        weeks[str(w.number)] = fields
+    return {
+        'version': SNAPSHOT_VERSION,
+        'metadata': {key: _digest(value) for key, value in course.metadata.items()},
+        'weeks': weeks,
+    }
+
+
+def load_snapshot(filepath: str) -> Optional[dict]:
+    """Reads a snapshot; None if it is missing, unreadable or from another version."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION:
+        return None
+    return data
+
+
+def save_snapshot(filepath: str, snap: dict) -> None:
+    """Writes a snapshot atomically (an interrupted run keeps the previous one)."""
+    write_atomic(filepath, json.dumps(snap, sort_keys=True, separators=(',', ':')))
+
+
+@dataclass(frozen=True)
+class Change:
+    """
+    One field-level difference.
+
+    Attributes:
+        week (int|None): Week number, None for metadata.
+        field (str): Week field or metadata key ('objectives', 'activities', 'title', ...).
+        kind (str): 'added', 'removed' or 'modified'.
+        index (int|None): Position of an added (new list) or removed (old list) activity.
+    """
+    week: Optional[int]
+    field: str
+    kind: str
+    index: Optional[int] = None
+
+    def __str__(self) -> str:
+        name = self.field if self.index is None else f"{self.field}[{self.index}]"
+        if self.week is None:
+            return f"metadata.{name} {self.kind}"
+        return f"week {self.week}: {name} {self.kind}"
+
+
+def _diff_activities(number: int, old: List[str], new: List[str]) -> List[Change]:
+    # Activities are matched by content, not position: inserting one at the top
+    # must not invalidate the skeletons of the ones that merely moved down.
+    changes = []
+    old_left = list(old)
+    for index, h in enumerate(new):
+        if h in old_left:
+            old_left.remove(h)
+        else:
+            changes.append(Change(number, 'activities', 'added', index))
+    new_left = list(new)
+    for index, h in enumerate(old):
+        if h in new_left:
+            new_left.remove(h)
+        else:
+            changes.append(Change(number, 'activities', 'removed', index))
+    return changes
+
+
+def _week_order(key: str):
+    # Week keys are numbers in practice; anything else sorts after them
+    return (0, int(key), '') if key.isdigit() else (1, 0, key)
+
+
+def diff(old: dict, new: dict) -> List[Change]:
+    """
+    Compares two snapshots field by field.
+
+    Args:
+        old (dict): Previous snapshot.
+        new (dict): Current snapshot.
+
+    Returns:
+        list: Change records, metadata first, then weeks in ascending order.
+    """
+    changes = []
+    old_meta, new_meta = old.get('metadata', {}), new.get('metadata', {})
+    for key in sorted(set(old_meta) | set(new_meta)):
+        if key not in old_meta:
+            changes.append(Change(None, key, 'added'))
+        elif key not in new_meta:
+            changes.append(Change(None, key, 'removed'))
+        elif old_meta[key] != new_meta[key]:
+            changes.append(Change(None, key, 'modified'))
+
+    old_weeks, new_weeks = old.get('weeks', {}), new.get('weeks', {})
+    for key in sorted(set(old_weeks) | set(new_weeks), key=_week_order):
+        number = int(key) if key.isdigit() else key
+        if key not in old_weeks:
+            changes.append(Change(number, 'week', 'added'))
+            continue
+        if key not in new_weeks:
+            changes.append(Change(number, 'week', 'removed'))
+            continue
+        before, after = old_weeks[key], new_weeks[key]
+        for name in WEEK_FIELDS:
+            if before.get(name) == after.get(name):
+                continue
+            if name == 'activities':
+                items = _diff_activities(number, before.get('activity_hashes', []),
+                                         after.get('activity_hashes', []))
+                # Only reordered, or switched between a string and a one-item list
+                changes.extend(items or [Change(number, 'activities', 'modified')])
+            else:
+                changes.append(Change(number, name, 'modified'))
+    return changes
+
+
+class RebuildPlan:
+    """
+    Minimal set of outputs to regenerate for a list of changes.
+
+    Week-scoped stages get the weeks whose outputs are stale (None means every
+    week); generate_activities is narrowed further to the skeletons of added
+    activities. Whole-file stages (programa.md) are either rerun or kept.
+    """
+
+    def __init__(self):
+        self._weeks: Dict[str, Set[int]] = {stage: set() for stage in WEEK_STAGES}
+        self._all_weeks: Set[str] = set()
+        self.stages: Set[str] = set()
+        self.activity_files: Set[str] = set()
+
+    def add(self, stage: str, week: Optional[int] = None) -> None:
+        """Marks a stage as stale, for one week or (week=None) for all of them."""
+        self.stages.add(stage)
+        if stage in self._weeks:
+            if week is None:
+                self._all_weeks.add(stage)
+            else:
+                self._weeks[stage].add(week)
+
+    def weeks(self, stage: str) -> Optional[List[int]]:
+        """Weeks to regenerate for a week-scoped stage (None = all, [] = none)."""
+        if stage in self._all_weeks:
+            return None
+        return sorted(self._weeks.get(stage, ()))
+
+    def reruns(self, stage: str) -> bool:
+        return stage in self.stages
+
+    @property
+    def empty(self) -> bool:
+        return not self.stages
+
+    @classmethod
+    def from_changes(cls, changes: List[Change], data) -> 'RebuildPlan':
+        """
+        Maps each change to the stages that render the changed field.
+
+        Args:
+            changes (list): Result of diff().
+            data (Course|dict): Current course (for the filenames of added activities).
+        """
+        course = as_course(data)
+        plan = cls()
+        for change in changes:
+            if change.week is None:
+                # Every session page carries the course title as its subject
+                if change.field == 'title':
+                    plan.add(SESSIONS)
+                plan.add(PROGRAM)
+                plan.add(MYST)
+            elif change.field == 'week':
+                if change.kind == 'added':
+                    for stage in WEEK_STAGES:
+                        plan.add(stage, change.week)
+                    week = course.week(change.week)
+                    if week is not None:
+                        plan.activity_files.update(a.filename for a in week.activities)
+                else:
+                    # Generated files are never deleted; drop the week from the
+                    # full-course outputs and from the search index
+                    plan.add(TABLE)
+                    plan.add(SEARCH, change.week)
+                plan.add(PROGRAM)
+            elif change.field == 'unit':
+                # Every skeleton of the week is written at its new path
+                for stage in WEEK_FIELD_DEPENDENTS['unit']:
+                    plan.add(stage, change.week)
+                week = course.week(change.week)
+                if week is not None:
+                    plan.activity_files.update(a.filename for a in week.activities)
+            elif change.field == 'activities' and change.kind == 'added':
+                for stage in WEEK_FIELD_DEPENDENTS['activity']:
+                    plan.add(stage, change.week)
+                week = course.week(change.week)
+                if week is not None:
+                    plan.activity_files.add(week.activities[change.index].filename)
+            else:
+                for stage in WEEK_FIELD_DEPENDENTS[change.field]:
+                    plan.add(stage, change.week)
+        return plan
+
+    def describe(self) -> List[str]:
+        """One line per stale stage, e.g. 'generate_sessions: weeks 3, 5'."""
+        lines = []
+        for stage in sorted(self.stages):
+            if stage not in self._weeks:
+                lines.append(stage)
+            elif stage in self._all_weeks:
+                lines.append(f"{stage}: all weeks")
+            else:
+                lines.append(f"{stage}: weeks {', '.join(map(str, self.weeks(stage)))}")
+        return lines
@@ -16,27 +16,45 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from utils import load_json, JSON_FILE
+    from course_model import as_course
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
 except ImportError:
     # Fallback for when running from root
     sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
     from utils import load_json, JSON_FILE
+    from course_model import as_course
+    from output_tree import DEFAULT_TREE
+    from log_config import get_logger
+
+logger = get_logger('sync_myst')
 
 MYST_FILE = 'myst.yml'
 
-def main():
-    if not os.path.exists(JSON_FILE) or not os.path.exists(MYST_FILE):
-        print("Missing planeamiento.json or myst.yml")
+def main(data=None, out=None):
+    """
+    Synchronizes myst.yml metadata.
+
+    Args:
+        data (Course|dict, optional): Already parsed course (read from disk if omitted).
+        out (OutputTree, optional): Output root holding myst.yml (defaults to the working directory).
+    """
+    out = out or DEFAULT_TREE
+    if (data is None and not os.path.exists(JSON_FILE)) or not out.exists(MYST_FILE):
+        logger.warning("Missing planeamiento.json or myst.yml")
         return
 
     # Read Metadata
     try:
-        data = load_json(JSON_FILE)
-        metadata = data.get('metadata', {})
+        if data is None:
+            data = load_json(JSON_FILE)
+        metadata = as_course(data).metadata
         if not metadata:
-            print("No metadata found in planeamiento.json")
+            logger.warning("No metadata found in planeamiento.json")
             return
     except Exception as e:
-        print(f"Error reading JSON: {e}")
+        logger.error(f"Error reading JSON: {e}")
+        out.count('failed')
         return
 
     # Extract values
@@ -61,13 +79,12 @@ def main():
     year_str = year.group(0) if year else "202X"
     copyright_str = f"© {year_str} {author_name}. Distribuido bajo licencia Creative Commons."
 
-    print(f"Syncing {MYST_FILE} with metadata:")
-    print(f"  Title: {project_title}")
-    print(f"  Subtitle: {project_subtitle}")
-    print(f"  Author: {author_name}")
+    logger.debug(f"Syncing {MYST_FILE} with metadata:")
+    logger.debug(f"  Title: {project_title}")
+    logger.debug(f"  Subtitle: {project_subtitle}")
+    logger.debug(f"  Author: {author_name}")
 
-    with open(MYST_FILE, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = out.read_text(MYST_FILE)
 
     # Regex Replacements
     # 1. Update project.title
@@ -93,10 +110,9 @@ def main():
     #   - name: Escuela de Física
     content = re.sub(r'(\s+authors:\s*\n\s+-\s+name:).+', f'\\1 {author_name}', content, flags=re.MULTILINE)
 
-    with open(MYST_FILE, 'w', encoding='utf-8') as f:
-        f.write(content)
+    out.write_text(MYST_FILE, content)
 
-    print("Done.")
+    logger.info(f"Synced {MYST_FILE}: {project_title} / {project_subtitle} / {author_name}")
 
 if __name__ == "__main__":
     main()
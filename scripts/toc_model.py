@@ -0,0 +1,304 @@
+"""
+Line-preserving model of the `project.toc` tree in myst.yml.
+
+The TOC is parsed once into entries that remember their line positions.
+Operations (hide, append, remove, move) are queued as line edits and
+applied together by render(), so comments, quoting and the rest of the
+file are preserved byte for byte. Weeks are identified by the number
+prefix of their session file (sessions/03-*.md), not by the localized
+"Semana/Week/Semaine N" label.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_KEY_RE = re.compile(r'([\w-]+):(?:\s+(.*?))?\s*$')
+_INLINE_COMMENT_RE = re.compile(r'\s+#.*$')
+_TOC_RE = re.compile(r'^(\s+)toc:\s*$')
+_SESSION_RE = re.compile(r'^sessions/(?:[^/]+/)*(\d+)-')
+_TRAILING_NUMBER_RE = re.compile(r'(\d+)\s*$')
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(' '))
+
+
+def _is_blank_or_comment(line: str) -> bool:
+    stripped = line.strip()
+    return not stripped or stripped.startswith('#')
+
+
+def _is_item(line: str) -> bool:
+    stripped = line.lstrip(' ')
+    return stripped.startswith('- ') or stripped.rstrip() == '-'
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+        return value[1:-1]
+    return value
+
+
+@dataclass(eq=False)
+class TocEntry:
+    start: int                      # Line index of the '- ' line
+    indent: int                     # Column of the '-'
+    content_col: int                # Column of the entry's keys
+    parent: Optional['TocEntry'] = None
+    fields: Dict[str, str] = field(default_factory=dict)
+    key_lines: Dict[str, int] = field(default_factory=dict)
+    children: List['TocEntry'] = field(default_factory=list)
+    end: int = 0                    # Line index just past the entry (children included)
+
+    @property
+    def file(self) -> Optional[str]:
+        return self.fields.get('file')
+
+    @property
+    def title(self) -> Optional[str]:
+        return self.fields.get('title')
+
+    @property
+    def hidden(self) -> bool:
+        return self.fields.get('hidden', '').lower() == 'true'
+
+    def walk(self) -> Iterator['TocEntry']:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class TocDocument:
+    """
+    myst.yml content with its `project.toc` tree parsed once.
+
+    Args:
+        text (str): Full myst.yml content.
+        fragment (bool): text is a bare TOC list (e.g. a toc/unit-03.yml file, see
+            toc_units.py) rather than a whole myst.yml.
+    """
+
+    def __init__(self, text: str, fragment: bool = False):
+        self.fragment = fragment
+        self.lines = text.splitlines(keepends=True)
+        self.entries: List[TocEntry] = []
+        self.toc_line: Optional[int] = None
+        self.toc_end = len(self.lines)
+        self._inserts: List[Tuple[int, int, List[str]]] = []
+        self._deletes: set = set()
+        self._replacements: Dict[int, str] = {}
+        self._parse()
+
+    # Parsing -----------------------------------------------------------
+
+    def _parse(self) -> None:
+        if self.fragment:
+            self.toc_line = -1
+            self._parse_toc()
+            return
+        in_project = False
+        for i, line in enumerate(self.lines):
+            if line.startswith('project:'):
+                in_project = True
+                continue
+            if in_project and line.strip() and not line.startswith((' ', '#')):
+                in_project = False
+            if in_project and _TOC_RE.match(line):
+                self.toc_line = i
+                break
+        if self.toc_line is None:
+            return
+        self._parse_toc()
+
+    def _parse_toc(self) -> None:
+        first = self._next_content_line(self.toc_line + 1)
+        if first is None or not _is_item(self.lines[first]):
+            self.toc_end = self.toc_line + 1
+            return
+        self.entries, end = self._parse_list(first, _indent(self.lines[first]), None)
+        self.toc_end = end
+
+    def _next_content_line(self, i: int) -> Optional[int]:
+        while i < len(self.lines):
+            if not _is_blank_or_comment(self.lines[i]):
+                return i
+            i += 1
+        return None
+
+    def _parse_list(self, i: int, dash_col: int, parent: Optional[TocEntry]) -> Tuple[List[TocEntry], int]:
+        items = []
+        end = i
+        while i < len(self.lines):
+            line = self.lines[i]
+            if _is_blank_or_comment(line):
+                i += 1
+                continue
+            if _indent(line) != dash_col or not _is_item(line):
+                break
+            entry = self._parse_item(i, dash_col, parent)
+            items.append(entry)
+            i = end = entry.end
+        return items, end
+
+    def _parse_item(self, i: int, dash_col: int, parent: Optional[TocEntry]) -> TocEntry:
+        line = self.lines[i].rstrip('\r\n')
+        after_dash = line[dash_col + 1:]
+        content_col = dash_col + 1 + (len(after_dash) - len(after_dash.lstrip(' ')))
+        entry = TocEntry(start=i, indent=dash_col, content_col=content_col, parent=parent)
+        self._parse_key(entry, i, line[content_col:])
+        last = i
+        i += 1
+
+        while i < len(self.lines):
+            line = self.lines[i]
+            if _is_blank_or_comment(line):
+                i += 1
+                continue
+            if _indent(line) != content_col or _is_item(line):
+                break
+            key = self._parse_key(entry, i, line[content_col:].rstrip('\r\n'))
+            last = i
+            i += 1
+            if key == 'children' and not entry.fields.get('children'):
+                child = self._next_content_line(i)
+                if child is not None and _is_item(self.lines[child]) and _indent(self.lines[child]) >= content_col:
+                    entry.children, child_end = self._parse_list(child, _indent(self.lines[child]), entry)
+                    last = child_end - 1
+                    i = child_end
+
+        entry.end = last + 1
+        return entry
+
+    def _parse_key(self, entry: TocEntry, i: int, text: str) -> Optional[str]:
+        match = _KEY_RE.match(text)
+        if not match:
+            return None
+        value = match.group(2) or ''
+        if not value.startswith(('"', "'")):
+            value = _INLINE_COMMENT_RE.sub('', value)
+        key, value = match.group(1), _unquote(value)
+        entry.fields[key] = value
+        entry.key_lines[key] = i
+        return key
+
+    # Lookups -----------------------------------------------------------
+
+    def walk(self) -> Iterator[TocEntry]:
+        for entry in self.entries:
+            yield from entry.walk()
+
+    def find_file(self, path: str) -> Optional[TocEntry]:
+        for entry in self.walk():
+            if entry.file == path:
+                return entry
+        return None
+
+    @staticmethod
+    def week_number(entry: TocEntry) -> Optional[int]:
+        """Week of a top-level entry: session file prefix first, label number as fallback."""
+        for child in entry.children:
+            match = _SESSION_RE.match(child.file or '')
+            if match:
+                return int(match.group(1))
+        match = _TRAILING_NUMBER_RE.search(entry.title or '')
+        return int(match.group(1)) if match and entry.children else None
+
+    @staticmethod
+    def is_part(entry: TocEntry) -> bool:
+        """True for a part grouping week entries (a unit in the sharded layout)."""
+        return any(child.children for child in entry.children)
+
+    def week_entries(self) -> Dict[int, TocEntry]:
+        """Maps week number -> week entry, independent of the label language (also inside unit parts)."""
+        weeks = {}
+        for entry in self.entries:
+            for candidate in (entry.children if self.is_part(entry) else [entry]):
+                number = self.week_number(candidate)
+                if number is not None:
+                    weeks.setdefault(number, candidate)
+        return weeks
+
+    # Edits -------------------------------------------------------------
+
+    def _insert(self, line_index: int, new_lines: List[str]) -> None:
+        # The sequence number keeps insertions at the same line in call order
+        self._inserts.append((line_index, len(self._inserts), new_lines))
+
+    @staticmethod
+    def _format_entry(fields: Dict[str, str], indent: int) -> List[str]:
+        lines = []
+        for n, (key, value) in enumerate(fields.items()):
+            prefix = ' ' * indent + ('- ' if n == 0 else '  ')
+            lines.append(f"{prefix}{key}: {value}\n")
+        return lines
+
+    def hide(self, entry: TocEntry) -> bool:
+        """Marks an entry as hidden. Returns False if it already was."""
+        if entry.hidden:
+            return False
+        pad = ' ' * entry.content_col
+        if 'hidden' in entry.key_lines:
+            self._replacements[entry.key_lines['hidden']] = f"{pad}hidden: true\n"
+        else:
+            own_keys = [n for k, n in entry.key_lines.items() if k != 'children']
+            self._insert(max(own_keys) + 1, [f"{pad}hidden: true\n"])
+        entry.fields['hidden'] = 'true'
+        return True
+
+    def append_child(self, parent: TocEntry, fields: Dict[str, str]) -> None:
+        """Appends a new entry after the last child of parent."""
+        if parent.children:
+            indent = parent.children[0].indent
+        else:
+            indent = parent.content_col
+            if 'children' not in parent.key_lines:
+                self._insert(parent.end, [f"{' ' * parent.content_col}children:\n"])
+        self._insert(parent.end, self._format_entry(fields, indent))
+
+    def append(self, fields: Dict[str, str]) -> None:
+        """Appends a new top-level TOC entry."""
+        indent = self.entries[0].indent if self.entries else 2
+        self._insert(self.toc_end, self._format_entry(fields, indent))
+
+    def remove(self, entry: TocEntry) -> None:
+        """Removes an entry and its children."""
+        self._deletes.update(range(entry.start, entry.end))
+
+    def move(self, entry: TocEntry, new_parent: TocEntry) -> None:
+        """Moves an entry (with its children) to the end of new_parent's children."""
+        target = new_parent.children[0].indent if new_parent.children else new_parent.content_col
+        shift = target - entry.indent
+        moved = []
+        for line in self.lines[entry.start:entry.end]:
+            if shift >= 0 or _is_blank_or_comment(line):
+                moved.append(' ' * max(shift, 0) + line if line.strip() else line)
+            else:
+                moved.append(line[min(-shift, _indent(line)):])
+        self.remove(entry)
+        if not new_parent.children and 'children' not in new_parent.key_lines:
+            self._insert(new_parent.end, [f"{' ' * new_parent.content_col}children:\n"])
+        self._insert(new_parent.end, moved)
+
+    @property
+    def modified(self) -> bool:
+        return bool(self._inserts or self._deletes or self._replacements)
+
+    def render(self) -> str:
+        """Applies every queued edit in a single pass over the lines."""
+        inserts: Dict[int, List[str]] = {}
+        for line_index, _, new_lines in sorted(self._inserts, key=lambda x: (x[0], x[1])):
+            inserts.setdefault(line_index, []).extend(new_lines)
+
+        out = []
+        for i, line in enumerate(self.lines):
+            out.extend(inserts.get(i, ()))
+            if i in self._deletes:
+                continue
+            if i in self._replacements:
+                line = self._replacements[i]
+            elif i == len(self.lines) - 1 and not line.endswith('\n') and len(self.lines) in inserts:
+                line += '\n'
+            out.append(line)
+        out.extend(inserts.get(len(self.lines), ()))
+        return ''.join(out)
@@ -0,0 +1,167 @@
+"""
+Per-unit TOC files for the sharded layout.
+
+With units (see course_model.py), each unit's part of the table of contents
+is kept in its own small YAML file, toc/unit-03.yml, holding a one-item
+list:
+
+    - title: Unit 3
+      children:
+      - title: Week 5
+        children:
+        - file: sessions/unit-03/05-energy.md
+
+MyST reads a single myst.yml, so that file still carries the whole TOC, with
+each unit's entries between two comment markers naming the file they come
+from:
+
+    # >>> toc/unit-03.yml
+    - title: Unit 3
+      ...
+    # <<< toc/unit-03.yml
+
+A TOC entry pointing at a unit file (`- file: toc/unit-03.yml`) is where
+that unit's block goes; scaffold_course writes myst.yml that way, so units
+keep their place among the other entries.
+
+update_toc edits only the unit files of the weeks it touches. splice() then
+copies the unit files into their marked blocks in one pass over the lines
+of myst.yml, with no YAML parsing. Edit the unit files, not the blocks:
+a block is replaced whenever its unit file differs from it.
+"""
+
+import os
+import re
+import sys
+from typing import Dict, List, Optional
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import unit_dir, dump_yaml
+    from toc_model import TocDocument
+    from managed_blocks import MarkerError
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import unit_dir, dump_yaml
+    from toc_model import TocDocument
+    from managed_blocks import MarkerError
+
+TOC_DIR = 'toc'
+
+# Unit files as listed by OutputTree.scan: "unit-03.yml"
+UNIT_FILE_RE = re.compile(r'unit-\d+\.yml$')
+
+_MARKER_RE = re.compile(r'^( *)# (>>>|<<<) (\S+)\s*$')
+_INCLUDE_RE = re.compile(r'^( *)- file: (\S+\.yml)\s*$')
+
+
+def unit_file(unit: int) -> str:
+    """Path of a unit's TOC file relative to the output root ('toc/unit-03.yml')."""
+    return f"{TOC_DIR}/{unit_dir(unit)}.yml"
+
+
+def include(unit: int) -> dict:
+    """TOC entry marking where a unit's block goes (replaced by splice())."""
+    return {'file': unit_file(unit)}
+
+
+def render_unit(part: dict) -> str:
+    """YAML of a unit's TOC file: a one-item list with the unit's part entry."""
+    return dump_yaml([part])
+
+
+def render_config(config: dict, units: Dict[str, str]) -> str:
+    """YAML of a whole myst.yml whose TOC has include() entries, with the unit blocks spliced in."""
+    return splice(dump_yaml(config), units)
+
+
+def _closes_block(line: str) -> bool:
+    match = _MARKER_RE.match(line)
+    return match is not None and match.group(2) == '<<<'
+
+
+def _block(path: str, text: str, indent: int) -> List[str]:
+    pad = ' ' * indent
+    lines = [f"{pad}# >>> {path}\n"]
+    lines.extend(f"{pad}{line}" if line.strip() else line for line in text.splitlines(keepends=True))
+    if not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    lines.append(f"{pad}# <<< {path}\n")
+    return lines
+
+
+def splice(config: str, units: Dict[str, str]) -> str:
+    """
+    Copies unit TOC files into their marked blocks of myst.yml.
+
+    Args:
+        config (str): myst.yml content.
+        units (dict): Unit file path -> content. Blocks of other files are left as they are.
+            A unit without a block replaces its include() entry, or else is appended at the
+            end of the TOC, in the given order.
+
+    Returns:
+        str: The new content (the same string if every block was up to date).
+
+    Raises:
+        MarkerError: If a block is not closed or blocks are nested.
+    """
+    lines = config.splitlines(keepends=True)
+    out: List[str] = []
+    seen = set()
+    current: Optional[str] = None
+    changed = False
+    old_block: List[str] = []
+
+    for line in lines:
+        match = _MARKER_RE.match(line)
+        if current is not None:
+            if match and match.group(2) == '<<<' and match.group(3) == current:
+                new_block = _block(current, units[current], len(match.group(1)))
+                if new_block[1:-1] != old_block:
+                    changed = True
+                out.extend(new_block)
+                current = None
+                continue
+            if match:
+                raise MarkerError(f"'{current}' block is not closed before '{match.group(3)}'")
+            old_block.append(line)
+            continue
+        if match and match.group(2) == '>>>' and match.group(3) in units:
+            current = match.group(3)
+            if current in seen:
+                raise MarkerError(f"'{current}' has more than one block")
+            seen.add(current)
+            old_block = []
+            continue
+        match = _INCLUDE_RE.match(line)
+        if match and match.group(2) in units and match.group(2) not in seen:
+            seen.add(match.group(2))
+            out.extend(_block(match.group(2), units[match.group(2)], len(match.group(1))))
+            changed = True
+            continue
+        out.append(line)
+    if current is not None:
+        raise MarkerError(f"'{current}' block is not closed")
+
+    missing = [path for path in units if path not in seen]
+    if missing:
+        # Only reached when a unit is new: locate the end of the TOC once
+        toc = TocDocument(''.join(out))
+        if toc.toc_line is None:
+            raise MarkerError("myst.yml has no project.toc to add unit blocks to")
+        indent = toc.entries[0].indent if toc.entries else 2
+        new_lines = [line for path in missing for line in _block(path, units[path], indent)]
+        end = toc.toc_end
+        # After the closing marker of a block that ends the TOC
+        while end < len(out) and _closes_block(out[end]):
+            end += 1
+        if end > 0 and not out[end - 1].endswith('\n'):
+            out[end - 1] += '\n'
+        out[end:end] = new_lines
+        changed = True
+
+    return ''.join(out) if changed else config
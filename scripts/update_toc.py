@@ -2,75 +2,171 @@
 """
 Script to synchronize session filenames in 'myst.yml'.
 
-This script scans the 'sessions/' directory for files matching 'XX-*.md'.
+This script scans the 'sessions/' directory (and its unit-NN subdirectories
+in the sharded layout) for files matching 'XX-*.md'.
 It then updates the corresponding links in 'myst.yml' ensuring that the
 Table of Contents points to the correct (sanitized) filenames on disk.
 It uses regex to preserve the existing structure (comments, other children like activities).
+When the parsed course is supplied, activities missing from a week's TOC
+section are appended as hidden entries through the TOC model (toc_model.py).
+In the sharded layout the entries of each unit are edited in its
+toc/unit-NN.yml file, and only the unit files that changed are rewritten
+before they are spliced into myst.yml (see toc_units.py).
 """
 
-import glob
 import re
 import os
+import posixpath
 import sys
 
 # Add local directory to path to allow imports if running directly
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from utils import OUTPUT_DIR_SESSIONS
+    from utils import OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, UNIT_DIR_RE
+    from output_tree import DEFAULT_TREE
+    from toc_model import TocDocument
+    from toc_units import TOC_DIR, UNIT_FILE_RE, splice
+    from course_model import as_course
+    from log_config import get_logger
 except ImportError:
     # Fallback for when running from root
     sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
-    from utils import OUTPUT_DIR_SESSIONS
+    from utils import OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, UNIT_DIR_RE
+    from output_tree import DEFAULT_TREE
+    from toc_model import TocDocument
+    from toc_units import TOC_DIR, UNIT_FILE_RE, splice
+    from course_model import as_course
+    from log_config import get_logger
+
+logger = get_logger('update_toc')
 
 MYST_FILE = 'myst.yml'
+# Session files start with their week number, as in toc_model: "01-intro.md", "105-energy.md"
+SESSION_NAME_RE = re.compile(r'^(\d+)-')
+
+def add_activity_entries(content: str, course, weeks=None, fragment: bool = False) -> tuple:
+    """
+    Appends hidden TOC entries for activities not yet listed under their week.
+
+    Weeks are matched by session file prefix, so the week labels may be in any language.
+
+    Args:
+        content (str): myst.yml content.
+        course (Course): Parsed course model.
+        weeks (list, optional): Only check these week numbers (all by default).
+        fragment (bool): content is a unit TOC file rather than myst.yml.
+
+    Returns:
+        tuple: (new content, number of entries added)
+    """
+    toc = TocDocument(content, fragment=fragment)
+    selected = set(weeks) if weeks is not None else None
+    folder_name = os.path.basename(OUTPUT_DIR_ACTIVITIES)
+    added = 0
+    # Walk the weeks of this TOC, so a unit file only costs its own weeks
+    for number, entry in toc.week_entries().items():
+        w = course.week(number)
+        if w is None or (selected is not None and number not in selected):
+            continue
+        listed = {e.file for e in entry.walk()}
+        for act in w.activities:
+            path = posixpath.join(folder_name, w.folder, act.filename)
+            if path not in listed:
+                toc.append_child(entry, {'file': path, 'hidden': 'true'})
+                added += 1
+    return (toc.render() if added else content), added
+
+def main(out=None, data=None, weeks=None):
+    """
+    Rewrites session links in myst.yml (and the unit TOC files) to match the files on disk.
 
-def main():
-    if not os.path.exists(MYST_FILE):
-        print(f"Error: {MYST_FILE} not found.")
+    Args:
+        out (OutputTree, optional): Output root holding myst.yml (defaults to the working directory).
+        data (Course|dict, optional): Parsed course; when given, missing activity entries are added.
+        weeks (list, optional): Only update the entries of these week numbers (all by default).
+    """
+    out = out or DEFAULT_TREE
+    if not out.exists(MYST_FILE):
+        logger.error(f"Error: {MYST_FILE} not found.", extra={'file': out.path(MYST_FILE)})
+        out.count('failed')
         return
 
-    with open(MYST_FILE, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = original = out.read_text(MYST_FILE)
+    # Sharded layout: "toc/unit-03.yml" -> content; myst.yml only holds copies of these
+    units = {posixpath.join(TOC_DIR, e.name): out.read_text(e.path)
+             for e in out.scan(TOC_DIR, extensions='.yml', pattern=UNIT_FILE_RE)}
+    original_units = dict(units)
 
-    print(f"Scanning {OUTPUT_DIR_SESSIONS} for updates...")
+    logger.debug(f"Scanning {OUTPUT_DIR_SESSIONS} for updates...")
     
     updated_count = 0
     
-    # Iterate through potential weeks (1 to 20 to be safe)
-    # Or just glob all files in sessions
-    session_files = sorted(glob.glob(os.path.join(OUTPUT_DIR_SESSIONS, '[0-9][0-9]-*.md')))
+    # One scandir pass over sessions/ (and its unit subdirectories), filtered on the name: "01-my-title.md"
+    selected = set(weeks) if weeks is not None else None
+    session_files = [] if selected == set() else out.scan(OUTPUT_DIR_SESSIONS, extensions='.md',
+                                                          pattern=SESSION_NAME_RE, subdirs=UNIT_DIR_RE)
+    if selected is not None:
+        # Matched on the parsed number, so "105-" is week 105 whatever the padding
+        session_files = [e for e in session_files if int(SESSION_NAME_RE.match(e.name).group(1)) in selected]
     
-    for file_path in session_files:
-        basename = os.path.basename(file_path)
-        # Extract metadata from filename: "01-my-title.md" -> prefix "01-"
-        match = re.match(r'^(\d{2})-', basename)
-        if not match:
-            continue
-            
-        prefix = match.group(1) # e.g., "01"
+    for entry in session_files:
+        basename = entry.name
+        prefix = SESSION_NAME_RE.match(basename).group(1) # e.g., "01" or "105"
+        relpath = entry.path.replace(os.sep, '/')
         
         # Regex to find the existing entry in myst.yml
-        # Looking for: "file: sessions/01-old-name.md"
-        # We match "file: sessions/01-.*\.md"
+        # Looking for: "file: sessions/01-old-name.md" or "file: sessions/unit-01/01-old-name.md"
+        # The whole path is replaced, so a week that moved to another unit follows its file
         
         folder_name = os.path.basename(OUTPUT_DIR_SESSIONS)
-        pattern = fr'(file:\s*{folder_name}/)({prefix}-.*\.md)'
-        
-        # Perform replacement
-        new_content = re.sub(pattern, f'\\g<1>{basename}', content)
-        
-        if new_content != content:
-            print(f"Updating Week {prefix}: {basename}")
-            content = new_content
-            updated_count += 1
+        pattern = fr'(file:\s*)({folder_name}/(?:[^/\s]+/)*{prefix}-.*\.md)'
         
-    if updated_count > 0:
-        with open(MYST_FILE, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"Successfully updated {updated_count} links in {MYST_FILE}.")
+        # Perform replacement: in the unit files (the week's own unit first), else in myst.yml
+        own = posixpath.join(TOC_DIR, posixpath.basename(posixpath.dirname(relpath)) + '.yml')
+        targets = sorted(units, key=lambda path: path != own) + [MYST_FILE]
+        for target in targets:
+            text = units[target] if target in units else content
+            new_text = re.sub(pattern, lambda m: m.group(1) + relpath, text)
+            if new_text != text:
+                logger.debug(f"Updating Week {prefix}: {relpath}", extra={'week': int(prefix), 'file': entry.path})
+                if target in units:
+                    units[target] = new_text
+                else:
+                    content = new_text
+                updated_count += 1
+                break
+
+    if data is not None:
+        course = as_course(data)
+        added = 0
+        in_units = set()
+        for path, text in units.items():
+            units[path], count = add_activity_entries(text, course, weeks, fragment=True)
+            added += count
+            in_units.update(TocDocument(units[path], fragment=True).week_entries())
+        # Weeks of the unit files also appear in their myst.yml blocks; those are left to splice()
+        rest = [int(w.number) for w in course.select(weeks) if int(w.number) not in in_units]
+        content, count = add_activity_entries(content, course, rest)
+        added += count
+        if added:
+            logger.info(f"Added {added} activity entries to the TOC.")
+            updated_count += added
+
+    for path, text in units.items():
+        if text != original_units[path]:
+            out.write_text(path, text)
+            logger.debug(f"Updated {path}", extra={'file': out.path(path)})
+    if units:
+        # Also picks up unit files edited by hand since the last run
+        content = splice(content, units)
+
+    if content != original:
+        out.write_text(MYST_FILE, content)
+        logger.info(f"Successfully updated {updated_count} links in {MYST_FILE}.")
     else:
-        print("No changes needed in myst.yml.")
+        logger.info("No changes needed in myst.yml.")
+        out.count('unchanged')
 
 if __name__ == "__main__":
     main()
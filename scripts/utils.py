@@ -7,8 +7,10 @@ Centralizes JSON loading, filename generation, translations and output paths.
 import json
 import os
 import re
+import tempfile
 import unicodedata
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Union
 
@@ -20,12 +22,17 @@ OUTPUT_DIR_EXAMPLES = 'examples'
 OUTPUT_DIR_EXERCISES = 'exercises'
 OUTPUT_DIR_ASSETS = 'assets'
 MYST_CONFIG_FILE = 'myst.yml'
+CACHE_DIR = '.scaffold_cache'
+
+# Sharded layout: pages of unit 3 live in sessions/unit-03/ and activities/unit-03/
+UNIT_DIR_RE = re.compile(r'unit-\d+$')
 
 # Translations
 TRANSLATIONS = {
     'es': {
         # General
         'week': 'Semana',
+        'unit': 'Unidad',
         'session': 'Sesión',
         'success': '🎉 ¡Andamiaje del curso completado con éxito!',
         'run_hint': "   Ejecuta 'myst start' para previsualizar el curso.",
@@ -53,6 +60,7 @@ TRANSLATIONS = {
     'en': {
         # General
         'week': 'Week',
+        'unit': 'Unit',
         'session': 'Session',
         'success': '🎉 Course scaffolding completed successfully!',
         'run_hint': "   Run 'myst start' to preview the course.",
@@ -80,6 +88,7 @@ TRANSLATIONS = {
     'fr': {
         # General
         'week': 'Semaine',
+        'unit': 'Unité',
         'session': 'Séance',
         'success': '🎉 Échafaudage du cours terminé avec succès !',
         'run_hint': "   Exécutez 'myst start' pour prévisualiser le cours.",
@@ -114,20 +123,22 @@ def load_json(filepath: str = JSON_FILE) -> Dict[str, Any]:
     with open(filepath, 'r', encoding='utf-8') as f:
         data = json.load(f)
         
-    # Normalize structure: ensure we return a dict with 'weeks' and 'metadata'
+    # Normalize structure: ensure we return a dict with 'weeks' and 'metadata'.
+    # Shape errors (e.g. a dict without 'weeks') are reported by validate_schema.
     if isinstance(data, list):
         return {'weeks': data, 'metadata': {}}
     elif isinstance(data, dict):
-        if 'weeks' not in data and 'metadata' not in data:
-            # Maybe it's just the list inside a dict? unlikely based on code but safe fallback
-             return {'weeks': [], 'metadata': {}}
         return data
     else:
         raise ValueError("Invalid JSON format")
 
+@lru_cache(maxsize=None)
 def generate_filename(prefix: Union[int, str], title: str) -> str:
     """
     Generates a web-safe filename.
+
+    Results are memoized: slugs are language-independent, so multi-language
+    builds compute each one only once.
     
     Args:
         prefix (int|str): The week number or prefix.
@@ -154,15 +165,61 @@ def generate_filename(prefix: Union[int, str], title: str) -> str:
     except ValueError:
         return f"{prefix}-{safe_slug}.md"
 
+def unit_dir(unit: int) -> str:
+    """Subdirectory of a unit's sessions and activities in the sharded layout ('unit-03')."""
+    return f"unit-{int(unit):02d}"
+
 def get_translation(lang: str, key: str) -> str:
     """Retrieves a translation for a given key and language."""
     return TRANSLATIONS.get(lang, TRANSLATIONS['es']).get(key, key)
 
-def save_yaml(filepath: str, data: Any) -> None:
-    """Saves data to a YAML file."""
+def dump_yaml(data: Any) -> str:
+    """Serializes data as YAML, keeping key order and non-ASCII text as is."""
+    return yaml.dump(data, allow_unicode=True, sort_keys=False)
+
+def save_yaml(filepath: str, data: Any, out: Optional[Any] = None) -> None:
+    """
+    Saves data to a YAML file.
+
+    If an OutputTree is given, filepath is relative to its root and the write
+    goes through the tree (so in-memory trees never touch the disk).
+    """
+    if out is not None:
+        out.write_text(filepath, dump_yaml(data))
+        return
     with open(filepath, 'w', encoding='utf-8') as f:
         yaml.dump(data, f, allow_unicode=True, sort_keys=False)
 
+def default_file_mode() -> int:
+    """
+    Mode a file created with open() gets under the current umask (usually 0644).
+
+    Files written atomically through tempfile.mkstemp start as 0600; chmod them
+    to this before the replace so other users (e.g. a metrics collector) can read them.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def write_atomic(filepath: str, content: str) -> None:
+    """
+    Writes a text file atomically: readers see the old or the new content, never a
+    truncated file, and an interrupted run keeps the previous version.
+
+    The parent directory is created if needed; the file gets default_file_mode().
+    """
+    directory = os.path.dirname(filepath) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(tmp, default_file_mode())
+        os.replace(tmp, filepath)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
 def ensure_directory(path: str) -> None:
     """Creates a directory if it doesn't exist."""
     Path(path).mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Cross-reference validation for generated pages.
+
+Walks the course tree once into a set of relative paths, then streams the
+Markdown pages (sessions/, activities/, programa.md) line by line and checks
+every relative link target against that set, plus every `file:` entry of the
+myst.yml TOC. Each broken reference is reported with its location:
+
+    sessions/03-metadata.md:15: ../activities/03-old-name.md
+
+Links with a scheme (https:, mailto:), pure anchors, site-absolute paths and
+anything inside code fences or inline code are not checked. One walk plus one
+pass over each page keeps it fast enough for a pre-commit hook; pass the
+changed files as arguments to only check those pages.
+"""
+
+import argparse
+import os
+import posixpath
+import re
+import sys
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set
+from urllib.parse import unquote
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, MYST_CONFIG_FILE
+    from toc_model import TocDocument
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES, MYST_CONFIG_FILE
+    from toc_model import TocDocument
+
+PROGRAM_FILE = 'programa.md'
+PAGE_DIRS = (OUTPUT_DIR_SESSIONS, OUTPUT_DIR_ACTIVITIES)
+
+# Directories never linked to and potentially huge; dot-directories are skipped too
+SKIP_DIRS = {'node_modules', '_build', '__pycache__'}
+
+# Target of an inline link or image: [text](target "title") / ![alt](<target>)
+_LINK_RE = re.compile(r'\]\(\s*(?:<([^>]*)>|([^)\s]+))')
+_INLINE_CODE_RE = re.compile(r'(`+).*?\1')
+_FENCE_RE = re.compile(r'^\s*(```|~~~)')
+_SCHEME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:')
+
+
+class BrokenLink(NamedTuple):
+    path: str       # Page or myst.yml, relative to the root
+    line: int       # 1-based
+    target: str     # Link target as written
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: {self.target}"
+
+
+def index_tree(root: str = '.') -> Set[str]:
+    """
+    Collects every file and directory under root in a single walk.
+
+    Returns:
+        set: Relative POSIX paths ('sessions/01-intro.md', 'sessions').
+    """
+    paths = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS]
+        rel = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        prefix = '' if rel == '.' else rel + '/'
+        if prefix:
+            paths.add(rel)
+        paths.update(prefix + name for name in filenames)
+    return paths
+
+
+def page_paths(index: Set[str]) -> List[str]:
+    """Pages to check: Markdown files under sessions/ and activities/ (at any depth), and programa.md."""
+    pages = [p for p in index if p.endswith('.md') and p.split('/', 1)[0] in PAGE_DIRS]
+    if PROGRAM_FILE in index:
+        pages.append(PROGRAM_FILE)
+    return sorted(pages)
+
+
+def _resolve(source: str, target: str) -> Optional[str]:
+    """Index path a relative link points to, or None for links that are not checked."""
+    if not target or target.startswith(('#', '/', '{')) or _SCHEME_RE.match(target):
+        return None
+    target = unquote(target.split('#', 1)[0].split('?', 1)[0])
+    if not target:
+        return None
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source), target))
+
+
+def link_targets(lines: Iterable[str]) -> Iterator[tuple]:
+    """
+    Relative-link candidates of a Markdown page, skipping code.
+
+    Returns:
+        iterator: (1-based line number, target as written) pairs.
+    """
+    fence = None
+    for number, line in enumerate(lines, start=1):
+        match = _FENCE_RE.match(line)
+        if match:
+            if fence is None:
+                fence = match.group(1)
+            elif match.group(1) == fence:
+                fence = None
+            continue
+        if fence is not None or '](' not in line:
+            continue
+        if '`' in line:
+            line = _INLINE_CODE_RE.sub('', line)
+        for m in _LINK_RE.finditer(line):
+            yield number, (m.group(1) if m.group(1) is not None else m.group(2)).strip()
+
+
+def check_page(root: str, relpath: str, index: Set[str]) -> List[BrokenLink]:
+    """Streams one page and returns its relative links missing from the index."""
+    broken = []
+    with open(os.path.join(root, relpath), 'r', encoding='utf-8', errors='replace') as f:
+        for number, target in link_targets(f):
+            resolved = _resolve(relpath, target)
+            if resolved is not None and resolved not in index:
+                broken.append(BrokenLink(relpath, number, target))
+    return broken
+
+
+def check_toc(root: str, index: Set[str]) -> List[BrokenLink]:
+    """Returns the `file:` entries of the myst.yml TOC missing from the index."""
+    with open(os.path.join(root, MYST_CONFIG_FILE), 'r', encoding='utf-8') as f:
+        doc = TocDocument(f.read())
+    broken = []
+    for entry in doc.walk():
+        target = entry.file
+        if target and posixpath.normpath(target) not in index:
+            broken.append(BrokenLink(MYST_CONFIG_FILE, entry.key_lines['file'] + 1, target))
+    return broken
+
+
+def validate(root: str = '.', files: Optional[Iterable[str]] = None) -> List[BrokenLink]:
+    """
+    Checks the relative links of the generated pages and the TOC of a course tree.
+
+    Args:
+        root (str): Course root (where myst.yml and sessions/ live).
+        files (list, optional): Only check these pages (paths relative to root); myst.yml is
+            checked when listed. Everything under root is still indexed as a link target.
+
+    Returns:
+        list: BrokenLink records in page order (empty when every link resolves).
+    """
+    index = index_tree(root)
+    if files is None:
+        pages = page_paths(index)
+        check_config = MYST_CONFIG_FILE in index
+    else:
+        selected = {posixpath.normpath(f.replace(os.sep, '/')) for f in files}
+        pages = sorted(p for p in selected if p.endswith('.md') and p in index)
+        check_config = MYST_CONFIG_FILE in selected and MYST_CONFIG_FILE in index
+
+    broken = []
+    for page in pages:
+        broken.extend(check_page(root, page, index))
+    if check_config:
+        broken.extend(check_toc(root, index))
+    return broken
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check relative links in the generated pages and the myst.yml TOC.')
+    parser.add_argument('files', nargs='*', help='Only check these pages (e.g., the files staged for commit)')
+    parser.add_argument('--root', default='.', help='Course root directory (default: current directory)')
+    args = parser.parse_args()
+
+    files = [os.path.relpath(os.path.abspath(f), os.path.abspath(args.root)) for f in args.files] or None
+    broken = validate(args.root, files)
+    if broken:
+        print(f"❌ {len(broken)} broken link(s)")
+        for link in broken:
+            print(f"   {link}")
+        sys.exit(1)
+
+    print("✅ All links resolve.")
+
+if __name__ == "__main__":
+    main()
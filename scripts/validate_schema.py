@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Schema validation for planeamiento.json.
+
+The syllabus schema is declared once as a small JSON-Schema-like dict and
+compiled into a tree of checker functions, so validation is a single pass
+that reports every error with its JSON path (e.g. '$.weeks[2].week').
+Results are cached by file hash: an unchanged file is never revalidated.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+# Add local directory to path to allow imports if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from utils import JSON_FILE, CACHE_DIR, write_atomic
+except ImportError:
+    # Fallback for when running from root
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from utils import JSON_FILE, CACHE_DIR, write_atomic
+
+# Bump whenever COURSE_SCHEMA changes so cached results are invalidated
+SCHEMA_VERSION = 2
+CACHE_FILE = 'validation.json'
+
+STRING_OR_LIST = {'type': ['string', 'array'], 'items': {'type': 'string'}}
+
+WEEK_SCHEMA = {
+    'type': 'object',
+    'required': ['week'],
+    'properties': {
+        'week': {'type': 'integer', 'minimum': 1},
+        'title': {'type': 'string'},
+        'subtitle': {'type': 'string'},
+        'unit': {'type': 'integer', 'minimum': 1},
+        'content': STRING_OR_LIST,
+        'objectives': STRING_OR_LIST,
+        'activities': STRING_OR_LIST,
+        'evaluation': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'type': {'type': 'string'},
+                    'description': {'type': 'string'}
+                }
+            }
+        },
+        'references': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['text'],
+                'properties': {
+                    'text': {'type': 'string'},
+                    'pages': {'type': 'string'}
+                }
+            }
+        }
+    }
+}
+
+COURSE_SCHEMA = {
+    'type': 'object',
+    'required': ['weeks'],
+    'properties': {
+        'metadata': {
+            'type': 'object',
+            'properties': {
+                'code': {'type': 'string'},
+                'title': {'type': 'string'},
+                'semester': {'type': 'string'},
+                'university': {'type': 'string'},
+                'description': {'type': 'string'},
+                'authors': STRING_OR_LIST,
+                'unit_size': {'type': 'integer', 'minimum': 1}
+            }
+        },
+        'weeks': {'type': 'array', 'items': WEEK_SCHEMA, 'unique': 'week'}
+    }
+}
+
+# JSON type name -> Python check. bool is excluded from integer on purpose.
+_TYPE_CHECKS = {
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'string': lambda v: isinstance(v, str),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+}
+
+_JSON_NAMES = {dict: 'object', list: 'array', str: 'string', int: 'integer',
+               float: 'number', bool: 'boolean', type(None): 'null'}
+
+Checker = Callable[[Any, str, List[str]], None]
+
+
+def compile_schema(schema: Dict[str, Any]) -> Checker:
+    """
+    Compiles a schema dict into a checker function.
+
+    The returned function has the signature check(value, path, errors) and
+    appends 'path: message' strings to errors instead of raising, so one call
+    collects every problem in the document.
+    """
+    types = schema.get('type')
+    if isinstance(types, str):
+        types = [types]
+    type_checks = [_TYPE_CHECKS[t] for t in types] if types else []
+    expected = ' or '.join(types) if types else ''
+
+    required = schema.get('required', [])
+    properties = {key: compile_schema(sub) for key, sub in schema.get('properties', {}).items()}
+    items = compile_schema(schema['items']) if 'items' in schema else None
+    minimum = schema.get('minimum')
+    unique = schema.get('unique')
+
+    def check(value: Any, path: str, errors: List[str]) -> None:
+        if type_checks and not any(tc(value) for tc in type_checks):
+            got = _JSON_NAMES.get(type(value), type(value).__name__)
+            errors.append(f"{path}: expected {expected}, got {got}")
+            return
+
+        if minimum is not None and isinstance(value, (int, float)) and value < minimum:
+            errors.append(f"{path}: must be >= {minimum}, got {value}")
+
+        if isinstance(value, dict):
+            for key in required:
+                if key not in value:
+                    errors.append(f"{path}: missing required field '{key}'")
+            for key, sub_check in properties.items():
+                if key in value:
+                    sub_check(value[key], f"{path}.{key}", errors)
+
+        elif isinstance(value, list):
+            seen = {}
+            for i, item in enumerate(value):
+                item_path = f"{path}[{i}]"
+                if items is not None:
+                    items(item, item_path, errors)
+                if unique and isinstance(item, dict) and unique in item:
+                    key = item[unique]
+                    if key in seen:
+                        errors.append(f"{item_path}.{unique}: duplicate value {key!r} (also at {seen[key]})")
+                    else:
+                        seen[key] = item_path
+
+    return check
+
+
+_check_course = compile_schema(COURSE_SCHEMA)
+
+
+def validate(data: Any) -> List[str]:
+    """
+    Validates parsed planeamiento.json content.
+
+    A top-level list is accepted as the legacy 'weeks only' format.
+
+    Returns:
+        list: Error messages with JSON paths (empty when valid).
+    """
+    errors: List[str] = []
+    if isinstance(data, list):
+        data = {'weeks': data}
+    _check_course(data, '$', errors)
+    return errors
+
+
+def _load_cache(cache_path: str) -> Dict[str, Any]:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def validate_file(filepath: str = JSON_FILE, cache_dir: Optional[str] = CACHE_DIR) -> List[str]:
+    """
+    Validates a planeamiento.json file, reusing cached results for unchanged content.
+
+    Args:
+        filepath (str): Path to the JSON file.
+        cache_dir (str, optional): Directory for the result cache; None disables caching.
+
+    Returns:
+        list: Error messages with JSON paths (empty when valid).
+    """
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+
+    cache_key = f"{SCHEMA_VERSION}:{hashlib.sha256(raw).hexdigest()}"
+    cache_path = os.path.join(cache_dir, CACHE_FILE) if cache_dir else None
+    cache = _load_cache(cache_path) if cache_path else {}
+
+    # One entry per file: {"key": "<schema version>:<sha256>", "errors": [...]}
+    entry = cache.get(os.path.abspath(filepath))
+    if isinstance(entry, dict) and entry.get('key') == cache_key:
+        return entry.get('errors', [])
+
+    try:
+        data = json.loads(raw.decode('utf-8'))
+    except ValueError as e:
+        return [f"$: invalid JSON ({e})"]
+
+    errors = validate(data)
+
+    new_entry = {'key': cache_key, 'errors': errors}
+    if cache_path and cache.get(os.path.abspath(filepath)) != new_entry:
+        cache[os.path.abspath(filepath)] = new_entry
+        write_atomic(cache_path, json.dumps(cache))
+
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate planeamiento.json against the syllabus schema.')
+    parser.add_argument('file', nargs='?', default=JSON_FILE, help=f'JSON file to validate (default: {JSON_FILE})')
+    parser.add_argument('--no-cache', action='store_true', help='Always revalidate, ignoring cached results')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"Error: {args.file} not found.")
+        sys.exit(1)
+
+    errors = validate_file(args.file, cache_dir=None if args.no_cache else CACHE_DIR)
+    if errors:
+        print(f"❌ {args.file}: {len(errors)} schema error(s)")
+        for error in errors:
+            print(f"   {error}")
+        sys.exit(1)
+
+    print(f"✅ {args.file} is valid.")
+
+if __name__ == "__main__":
+    main()
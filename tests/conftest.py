@@ -0,0 +1,14 @@
+"""
+Shared pytest configuration.
+
+Registers the 'perf' marker used by the performance regression tests.
+They are opt-in: pytest.ini deselects them by default, run them with:
+
+    python -m pytest -m perf
+"""
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "perf: performance regression tests on large synthetic syllabi (slow; opt-in with -m perf)"
+    )
@@ -0,0 +1,72 @@
+"""
+Unit tests for async_writer.py.
+
+Tests that queued writes are visible to reads before they reach the disk,
+that writes to the same path keep their order, that failures are collected
+into one BulkWriteError, and that a full stage produces the same files as
+the synchronous tree.
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from async_writer import AsyncWriteTree, BulkWriteError
+from output_tree import OutputTree, ChangeManifest
+import generate_activities
+
+
+class TestAsyncWriteTree(unittest.TestCase):
+
+    def test_bulk_writes_keep_per_path_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tree = AsyncWriteTree(tmp, concurrency=4, max_pending=8)
+            for i in range(200):
+                tree.write_text(f"f{i % 20:02d}.md", f"version {i}")
+            self.assertTrue(tree.exists('f00.md'))
+            self.assertEqual(tree.read_text('f19.md'), 'version 199')
+            self.assertEqual(len(tree.glob('f*.md')), 20)
+            tree.close()
+
+            for n in range(20):
+                with open(os.path.join(tmp, f"f{n:02d}.md"), encoding='utf-8') as f:
+                    self.assertEqual(f.read(), f"version {180 + n}")
+
+    def test_errors_are_aggregated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tree = AsyncWriteTree(tmp, concurrency=2)
+            tree.write_text('ok.md', 'fine')
+            tree.write_text('missing/a.md', 'x')
+            tree.write_text('missing/b.md', 'y')
+            with self.assertRaises(BulkWriteError) as ctx:
+                tree.flush()
+            self.assertEqual([path for path, _ in ctx.exception.errors], ['missing/a.md', 'missing/b.md'])
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'ok.md')))
+            # Errors are reported once
+            tree.close()
+
+    def test_stage_output_matches_sync_tree(self):
+        data = {'weeks': [{'week': w, 'activities': [f"Lab {w}", f"Quiz {w}"]} for w in range(1, 11)]}
+        with tempfile.TemporaryDirectory() as tmp:
+            sync_tree = OutputTree(os.path.join(tmp, 'sync'))
+            manifest = ChangeManifest()
+            async_tree = AsyncWriteTree(os.path.join(tmp, 'async'), manifest=manifest)
+            for tree in (sync_tree, async_tree):
+                tree.ensure_root()
+                generate_activities.run(lang='en', data=data, out=tree)
+            async_tree.close()
+
+            paths = sync_tree.glob('activities/*.md')
+            self.assertEqual(len(paths), 20)
+            self.assertEqual(OutputTree(async_tree.root).glob('activities/*.md'), paths)
+            for path in paths:
+                self.assertEqual(async_tree.read_text(path), sync_tree.read_text(path))
+            self.assertEqual(len(manifest.entries), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for build_cache.py.
+
+Tests that keys change with the input record and language, that stored
+outputs round-trip through the content-addressed directory, that damaged
+entries are treated as misses, and that a stage run against a warm cache
+restores byte-identical files without re-rendering.
+"""
+
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from build_cache import BuildCache
+from course_model import Course
+from output_tree import OutputTree
+import generate_activities
+
+COURSE = {
+    'metadata': {'title': 'Curso'},
+    'weeks': [
+        {'week': 1, 'title': 'Intro', 'activities': ['Leer el capítulo. Resumir.']},
+        {'week': 2, 'title': 'Vectores', 'activities': ['Taller de vectores']}
+    ]
+}
+
+
+class TestBuildCache(unittest.TestCase):
+
+    def test_key_depends_on_record_and_language(self):
+        cache = BuildCache('unused')
+        week = Course.from_dict(COURSE).week(1)
+        base = cache.key(generate_activities.__file__, 'es', week)
+        self.assertEqual(base, cache.key(generate_activities.__file__, 'es', week))
+        self.assertNotEqual(base, cache.key(generate_activities.__file__, 'en', week))
+        edited = Course.from_dict({'weeks': [{'week': 1, 'title': 'Intro 2'}]}).week(1)
+        self.assertNotEqual(base, cache.key(generate_activities.__file__, 'es', edited))
+
+    def test_round_trip_and_damaged_entry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = BuildCache(tmp)
+            self.assertIsNone(cache.get('ab' * 32))
+            cache.put('ab' * 32, 'sessions/01-intro.md', 'contenido ✓\n')
+            self.assertEqual(cache.get('ab' * 32), ('sessions/01-intro.md', 'contenido ✓\n'))
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+            # A truncated object must not be served
+            objects = os.path.join(tmp, 'objects')
+            for dirpath, _, names in os.walk(objects):
+                for name in names:
+                    with open(os.path.join(dirpath, name), 'wb') as f:
+                        f.write(b'x')
+            self.assertIsNone(cache.get('ab' * 32))
+
+    def test_warm_cache_restores_identical_outputs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = BuildCache(os.path.join(tmp, 'cache'))
+            cold = OutputTree(os.path.join(tmp, 'cold'))
+            warm = OutputTree(os.path.join(tmp, 'warm'))
+            cold.ensure_root()
+            warm.ensure_root()
+
+            generate_activities.run(lang='es', data=COURSE, out=cold, cache=cache)
+            self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+            with patch('generate_activities.render_activity') as render:
+                generate_activities.run(lang='es', data=COURSE, out=warm, cache=cache)
+                render.assert_not_called()
+            self.assertEqual(cache.hits, 2)
+
+            for path in cold.glob('activities/*.md'):
+                self.assertEqual(warm.read_text(path), cold.read_text(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit tests for convert_number_format.py.
+
+Tests the single-pass number conversion, that code, math and links are left
+untouched, and that files are streamed in place honouring the exclusion list.
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+from unittest.mock import patch
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import convert_number_format
+from convert_number_format import NumberFormatConverter
+
+class TestConvertNumberFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.converter = NumberFormatConverter('en', 'es')
+
+    def test_converts_numbers_in_prose(self):
+        """Test thousands and decimal separators are swapped in one pass."""
+        self.assertEqual(
+            self.converter.convert_line("Total 1,234,567.89 kg, 3.14 rad and 10,000 cells.\n"),
+            "Total 1.234.567,89 kg, 3,14 rad and 10.000 cells.\n"
+        )
+        # Version strings, identifiers and non-grouped commas are left alone
+        self.assertEqual(self.converter.convert_line("v2.0 and 1.2.3 and 12,34"), "v2.0 and 1.2.3 and 12,34")
+
+    def test_skips_code_math_and_links(self):
+        """Test that code spans/blocks, math and URLs are not mangled."""
+        text = (
+            "---\n"
+            "weight: 1.5\n"
+            "---\n"
+            "See `x = 1,000.5`, $a = 2.5$ and [2.5 m](https://example.org/v1.5) at https://x.org/3.5\n"
+            "```python\n"
+            "y = 1,000.25\n"
+            "```\n"
+            "$$\n"
+            "z = 3.5\n"
+            "$$\n"
+            ":::{math}\n"
+            "4.5\n"
+            ":::\n"
+            "After 7.25\n"
+        )
+        expected = text.replace("[2.5 m]", "[2,5 m]").replace("After 7.25", "After 7,25")
+        self.assertEqual(self.converter.convert_text(text), expected)
+
+    def test_prices_are_not_inline_math(self):
+        """Test that two dollar amounts on a line are not paired as one math span."""
+        self.assertEqual(self.converter.convert_text('Cuesta $3.50 y $4.25 total 1.5'),
+                         'Cuesta $3,50 y $4,25 total 1,5')
+        # Real inline math, also next to a price, is still skipped
+        self.assertEqual(self.converter.convert_line('$x = 1.5$ costs $2.50'), '$x = 1.5$ costs $2,50')
+
+    def test_convert_file_keeps_mode_and_cleans_up(self):
+        """Test that a converted file keeps its permissions and no temporary file survives an error."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, '01-a.md')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("x 1.5\n")
+            os.chmod(path, 0o644)
+            self.assertTrue(self.converter.convert_file(path))
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+
+            with patch.object(NumberFormatConverter, 'convert_line', side_effect=RuntimeError):
+                with self.assertRaises(RuntimeError):
+                    self.converter.convert_file(path)
+            self.assertEqual(os.listdir(tmp), ['01-a.md'])
+
+    def test_run_streams_files_and_honours_exclusions(self):
+        """Test that run() rewrites only changed, non-excluded markdown files."""
+        with tempfile.TemporaryDirectory() as tmp:
+            files = {'01-a.md': "x 1.5\n", '02-b.md': "no numbers\n", '07-skip.md': "x 1.5\n"}
+            for name, content in files.items():
+                with open(os.path.join(tmp, name), 'w', encoding='utf-8') as f:
+                    f.write(content)
+
+            convert_number_format.run(directory=tmp, exclude=['07-*.md'])
+
+            with open(os.path.join(tmp, '01-a.md'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), "x 1,5\n")
+            with open(os.path.join(tmp, '07-skip.md'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), "x 1.5\n")
+            self.assertEqual(sorted(os.listdir(tmp)), ['01-a.md', '02-b.md', '07-skip.md'])
+
+if __name__ == '__main__':
+    unittest.main()
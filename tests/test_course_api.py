@@ -0,0 +1,102 @@
+"""
+Unit tests for course_api.py.
+
+Tests that build_course() renders a complete course in memory without
+reading or writing the working directory, that invalid course data is
+rejected with its schema errors, and that the directory, zip and tar sinks
+reproduce the same files.
+"""
+
+import unittest
+import contextlib
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+import sys
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from course_api import build_course, write_directory, write_tar, write_zip
+import validate_links
+
+COURSE = {
+    "metadata": {"title": "Physics", "authors": ["Ada"]},
+    "weeks": [
+        {"week": 1, "title": "Vectors", "objectives": ["Add vectors"], "activities": ["Vector lab"]},
+        {"week": 2, "title": "Energy", "activities": ["Energy lab"]},
+    ],
+}
+
+
+def _build(data, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return build_course(data, **kwargs)
+
+
+class TestBuildCourse(unittest.TestCase):
+
+    def test_builds_in_memory_only(self):
+        """Test that the course is generated without touching the working directory."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            # A stale myst.yml in the working directory must not be picked up
+            with open(os.path.join(tmp, 'myst.yml'), 'w', encoding='utf-8') as f:
+                f.write('stale')
+            os.chdir(tmp)
+            try:
+                files = _build(COURSE, lang='en')
+            finally:
+                os.chdir(cwd)
+            self.assertEqual(os.listdir(tmp), ['myst.yml'])
+
+        self.assertIn(b'title: Physics', files['myst.yml'])
+        self.assertIn(b'sessions/02-energy.md', files['myst.yml'])
+        self.assertIn(b'ACTIVITY-BADGES', files['activities/01-vector-lab.md'])
+        for path in ('programa.md', 'sessions/01-vectors.md', 'sessions_table.md', 'assets/search/manifest.json'):
+            self.assertIn(path, files)
+        self.assertEqual(list(files), sorted(files))
+        self.assertTrue(all(isinstance(content, bytes) for content in files.values()))
+
+    def test_invalid_data_is_rejected(self):
+        """Test that schema errors are raised before any stage runs."""
+        with self.assertRaises(ValueError) as cm:
+            _build({"weeks": [{"week": "one"}]})
+        self.assertIn('$.weeks[0].week', str(cm.exception))
+
+
+class TestSinks(unittest.TestCase):
+
+    def setUp(self):
+        self.files = _build(COURSE, lang='en')
+
+    def test_directory(self):
+        """Test that the directory sink writes a course with working links."""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_directory(self.files, tmp)
+            with open(os.path.join(tmp, 'sessions', '01-vectors.md'), 'rb') as f:
+                self.assertEqual(f.read(), self.files['sessions/01-vectors.md'])
+            self.assertEqual(validate_links.validate(tmp), [])
+
+    def test_zip_is_reproducible(self):
+        """Test that the zip sink round-trips and gives identical bytes for identical input."""
+        first, second = io.BytesIO(), io.BytesIO()
+        write_zip(self.files, first)
+        write_zip(_build(COURSE, lang='en'), second)
+        self.assertEqual(first.getvalue(), second.getvalue())
+        with zipfile.ZipFile(first) as archive:
+            self.assertEqual({name: archive.read(name) for name in archive.namelist()}, self.files)
+
+    def test_tar_stream(self):
+        """Test that the tar sink writes a compressed stream that round-trips."""
+        stream = io.BytesIO()
+        write_tar(self.files, stream, compression='gz')
+        stream.seek(0)
+        with tarfile.open(fileobj=stream, mode='r:gz') as archive:
+            contents = {m.name: archive.extractfile(m).read() for m in archive.getmembers()}
+        self.assertEqual(contents, self.files)
+
+if __name__ == '__main__':
+    unittest.main()
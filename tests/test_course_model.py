@@ -0,0 +1,98 @@
+"""
+Unit tests for course_model.py.
+
+Tests that planeamiento.json entries are normalised once into typed records
+(string-or-list fields, activity slugs), that weeks can be looked up by number
+and that week selections such as '3,5-9' are parsed.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from course_model import Course, Week, as_course, parse_weeks
+
+class TestCourseModel(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            "metadata": {"title": "Course"},
+            "weeks": [
+                {
+                    "week": 1,
+                    "title": "Intro",
+                    "content": "Single topic",
+                    "objectives": ["Obj 1"],
+                    "activities": "Read the paper. Then discuss.",
+                    "evaluation": [{"type": "Quiz"}],
+                    "references": [{"text": "Ref", "pages": "1-2"}]
+                },
+                {
+                    "week": 2,
+                    "activities": ["Lab one", "Lab two"]
+                },
+                {"title": "Unnumbered"}
+            ]
+        }
+
+    def test_normalises_string_or_list_fields(self):
+        """Test that string fields become lists and activity slugs are precomputed."""
+        course = Course.from_dict(self.data)
+        week1, week2, _ = course.weeks
+
+        self.assertEqual(week1.content, ["Single topic"])
+        self.assertEqual([a.filename for a in week1.activities], ["01-read-the-paper-then-discuss.md"])
+        self.assertEqual(week1.activities[0].title, "Read the paper")
+        self.assertEqual(week1.activities_value(), "Read the paper. Then discuss.")
+        self.assertEqual(week2.activities_value(), ["Lab one", "Lab two"])
+        self.assertEqual(week1.objectives_value(), ["Obj 1"])
+        self.assertEqual(Week.from_dict({"objectives": "One"}).objectives_value(), "One")
+        self.assertEqual(week1.evaluation[0].to_dict(), {"type": "Quiz"})
+        self.assertEqual(week1.references[0].to_dict(), {"text": "Ref", "pages": "1-2"})
+
+    def test_week_index(self):
+        """Test O(1) week lookup and numbered-week filtering."""
+        course = as_course(self.data)
+
+        self.assertIs(course.week(2), course.weeks[1])
+        self.assertIsNone(course.week(3))
+        self.assertEqual([w.number for w in course.numbered_weeks()], [1, 2])
+        self.assertIs(as_course(course), course)
+
+    def test_week_selection(self):
+        """Test parsing of '3,5-9' selections and index-backed selection of weeks."""
+        self.assertEqual(parse_weeks('3,5-7'), [3, 5, 6, 7])
+        self.assertEqual(parse_weeks(' 2, 1-2 ,'), [1, 2])
+        for spec in ('', 'a', '4-2', '0', '1-x'):
+            with self.assertRaises(ValueError):
+                parse_weeks(spec)
+
+        course = as_course(self.data)
+        self.assertEqual([w.number for w in course.select([2, 5])], [2])
+        self.assertEqual([w.number for w in course.select(None)], [1, 2])
+        self.assertEqual(course.select([]), [])
+
+    def test_unit_layout(self):
+        """Test that units come from the week field first, then from metadata.unit_size blocks."""
+        course = as_course({
+            "metadata": {"unit_size": 2},
+            "weeks": [{"week": 1}, {"week": 2}, {"week": 3}, {"week": 4, "unit": 7}],
+        })
+        self.assertEqual([w.unit for w in course.weeks], [1, 1, 2, 7])
+        self.assertEqual(course.week(3).folder, 'unit-02')
+        self.assertTrue(course.sharded)
+
+        flat = as_course(self.data)
+        self.assertEqual([w.folder for w in flat.weeks], ['', '', ''])
+        self.assertFalse(flat.sharded)
+
+    def test_records_use_slots(self):
+        """Test that records are compact (no per-instance __dict__)."""
+        week = Week.from_dict({"week": 1})
+        self.assertFalse(hasattr(week, '__dict__'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for file_discovery.py.
+
+Tests that scan_dir filters by prefix, extension and pattern in one pass and
+returns stat data, and that inject_activity_header uses the persisted
+(mtime, size) fingerprints to skip activity files it already processed.
+"""
+
+import unittest
+from unittest.mock import patch
+import json
+import tempfile
+import re
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from file_discovery import scan_dir, StatIndex
+from output_tree import OutputTree, MemoryTree
+import generate_activities
+import inject_activity_header
+from utils import default_file_mode
+
+
+def _touch(path, content='x'):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+class TestScanDir(unittest.TestCase):
+
+    def test_filters_and_stat(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('02-b.md', '01-a.md', 'notes.md', '03-c.txt'):
+                _touch(os.path.join(tmp, name), name)
+            os.makedirs(os.path.join(tmp, '04-dir.md'))
+
+            self.assertEqual([e.name for e in scan_dir(tmp, extensions='.md')], ['01-a.md', '02-b.md', 'notes.md'])
+            self.assertEqual([e.name for e in scan_dir(tmp, prefix=('01', '03'))], ['01-a.md', '03-c.txt'])
+            numbered = scan_dir(tmp, extensions='.md', pattern=re.compile(r'\d{2}-'))
+            self.assertEqual([e.name for e in numbered], ['01-a.md', '02-b.md'])
+            self.assertEqual(numbered[0].size, len('01-a.md'))
+            self.assertEqual(numbered[0].path, os.path.join(tmp, '01-a.md'))
+            self.assertIsNotNone(numbered[0].mtime_ns)
+            self.assertEqual(scan_dir(os.path.join(tmp, 'missing')), [])
+
+    def test_memory_tree_scan_includes_pending_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'activities'))
+            _touch(os.path.join(tmp, 'activities', '01-disk.md'))
+            tree = MemoryTree(tmp)
+            tree.write_text('activities/02-pending.md', 'abc')
+            entries = tree.scan('activities', extensions='.md')
+            self.assertEqual([e.name for e in entries], ['01-disk.md', '02-pending.md'])
+            self.assertIsNone(entries[1].mtime_ns)
+
+
+class TestIncrementalInjection(unittest.TestCase):
+
+    def test_unchanged_files_are_skipped(self):
+        data = {'weeks': [{'week': 1, 'activities': ['Lab']}, {'week': 2, 'activities': ['Quiz']}]}
+        with tempfile.TemporaryDirectory() as tmp:
+            out = OutputTree(os.path.join(tmp, 'course'))
+            out.ensure_root()
+            generate_activities.run(lang='es', data=data, out=out)
+            index_file = os.path.join(tmp, 'stat.json')
+
+            with patch('inject_activity_header.default_stat_index', lambda name, root: StatIndex(index_file)), \
+                    patch('inject_activity_header.process_file', wraps=inject_activity_header.process_file) as process:
+                inject_activity_header.run(lang='es', out=out)
+                self.assertEqual(process.call_count, 2)
+                self.assertIn('ACTIVITY-BADGES', out.read_text('activities/01-lab.md'))
+
+                process.reset_mock()
+                inject_activity_header.run(lang='es', out=out)
+                process.assert_not_called()
+
+                # An edited file and a different language are processed again
+                out.write_text('activities/02-quiz.md', out.read_text('activities/02-quiz.md') + '\nEditado\n')
+                inject_activity_header.run(lang='es', out=out)
+                self.assertEqual([c.args[0] for c in process.call_args_list], [os.path.join('activities', '02-quiz.md')])
+
+                process.reset_mock()
+                inject_activity_header.run(lang='en', out=out)
+                self.assertEqual(process.call_count, 2)
+
+    def test_index_is_saved_atomically_and_pruned(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ('a.md', 'b.md')]
+            for path in paths:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write('x')
+            index_file = os.path.join(tmp, 'cache', 'stat.json')
+            index = StatIndex(index_file)
+            for path in paths:
+                index.record(path, 'es')
+            index.save()
+            self.assertEqual(os.stat(index_file).st_mode & 0o777, default_file_mode())
+
+            # A deleted file leaves the index on the next save
+            os.remove(paths[0])
+            index = StatIndex(index_file)
+            index.record(paths[1], 'en')
+            index.save()
+            with open(index_file, encoding='utf-8') as f:
+                self.assertEqual(list(json.load(f)), [os.path.abspath(paths[1])])
+            self.assertEqual(sorted(os.listdir(os.path.dirname(index_file))), ['stat.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,7 +39,7 @@ class TestGenerateSessions(unittest.TestCase):
     def test_main_standard_generation(self, mock_args, mock_file, mock_load_json, mock_exists, mock_makedirs):
         """Test standard generation flow."""
         # Setup mocks
-        mock_args.return_value = argparse.Namespace(week=None, force=False, lang='es')
+        mock_args.return_value = argparse.Namespace(week=None, weeks=None, force=False, lang='es')
         mock_exists.side_effect = lambda x: False # Output dir doesn't exist initially, file doesn't exist
         mock_load_json.return_value = {
             "weeks": [
@@ -98,7 +98,7 @@ class TestGenerateSessions(unittest.TestCase):
     @patch('argparse.ArgumentParser.parse_args')
     def test_main_skip_existing_without_force(self, mock_args, mock_file, mock_load_json, mock_exists, mock_makedirs):
         """Test that the script skips existing files if --force is not provided."""
-        mock_args.return_value = argparse.Namespace(week=None, force=False, lang='es')
+        mock_args.return_value = argparse.Namespace(week=None, weeks=None, force=False, lang='es')
         
         mock_load_json.return_value = {
             "weeks": [
@@ -128,7 +128,7 @@ class TestGenerateSessions(unittest.TestCase):
     @patch('argparse.ArgumentParser.parse_args')
     def test_main_force_overwrite(self, mock_args, mock_file, mock_load_json, mock_exists, mock_makedirs):
         """Test that the script overwrites existing files if --force IS provided."""
-        mock_args.return_value = argparse.Namespace(week=None, force=True, lang='es')
+        mock_args.return_value = argparse.Namespace(week=None, weeks=None, force=True, lang='es')
         
         mock_load_json.return_value = {
             "weeks": [
@@ -158,7 +158,7 @@ class TestGenerateSessions(unittest.TestCase):
     @patch('argparse.ArgumentParser.parse_args')
     def test_main_filter_week(self, mock_args, mock_file, mock_load_json, mock_exists, mock_makedirs):
         """Test generating a specific week."""
-        mock_args.return_value = argparse.Namespace(week=2, force=False, lang='es')
+        mock_args.return_value = argparse.Namespace(week=2, weeks=None, force=False, lang='es')
         mock_exists.return_value = False
         
         mock_load_json.return_value = {
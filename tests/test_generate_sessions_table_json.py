@@ -0,0 +1,34 @@
+"""
+Unit tests for generate_sessions_table_json.py.
+
+Tests that each week renders one table row and that objectives keep their
+planeamiento.json shape: a list becomes a <ul>, a plain string stays inline.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from course_model import Week
+from generate_sessions_table_json import render_row
+
+class TestRenderRow(unittest.TestCase):
+
+    def test_list_objectives(self):
+        """Test that list objectives (or a missing field) render as a list."""
+        week = Week.from_dict({"week": 3, "title": "3. Limits", "objectives": ["A", "B|C"]})
+        self.assertEqual(render_row(week), "| 3 | Limits | <ul><li>A</li><li>B&#124;C</li></ul> |\n")
+        self.assertEqual(render_row(Week.from_dict({"week": 4})), "| 4 |  | <ul></ul> |\n")
+
+    def test_non_list_objectives(self):
+        """Test that string objectives render inline and null ones as an empty cell."""
+        week = Week.from_dict({"week": 1, "title": "Intro", "objectives": "Understand limits"})
+        self.assertEqual(render_row(week), "| 1 | Intro | Understand limits |\n")
+        self.assertEqual(render_row(Week.from_dict({"week": 2, "objectives": None})), "| 2 |  |  |\n")
+        self.assertEqual(render_row(Week.from_dict({"week": 2, "objectives": ""})), "| 2 |  |  |\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Unit tests for inject_activity_header.py.
+
+Tests that badges are injected once and updated in place, and that the
+--jobs process pool produces the same files and the same log, in file
+order, as the sequential run.
+"""
+
+import unittest
+import contextlib
+import io
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from output_tree import OutputTree
+import generate_activities
+import inject_activity_header
+import log_config
+
+COURSE = {'weeks': [{'week': w, 'activities': [f"Lab {w}", f"Quiz {w}"]} for w in range(1, 13)]}
+
+
+def _scaffold_and_inject(root, lang, jobs):
+    out = OutputTree(root)
+    out.ensure_root()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_activities.run(lang='es', data=COURSE, out=out)
+    # A file without frontmatter must be reported in its place in the log
+    out.write_text('activities/05-notes.md', 'plain text\n')
+    log = io.StringIO()
+    # Per-file results are debug messages
+    log_config.configure(level='debug')
+    try:
+        with contextlib.redirect_stdout(log):
+            inject_activity_header.run(lang=lang, out=out, incremental=False, jobs=jobs)
+    finally:
+        log_config.configure()
+    return out, log.getvalue()
+
+
+class TestInjectActivityHeader(unittest.TestCase):
+
+    def test_inject_then_update(self):
+        content = '---\ntitle: "Lab"\nduration: "60 min"\n---\n\nBody\n'
+        action, injected, _ = inject_activity_header.inject_badges('lab.md', content, 'es')
+        self.assertEqual(action, 'Injected')
+        self.assertEqual(injected.count('<!-- ACTIVITY-BADGES -->'), 2)
+        self.assertIn('Duración-60_min', injected)
+
+        action, updated, _ = inject_activity_header.inject_badges('lab.md', injected, 'en')
+        self.assertEqual(action, 'Updated')
+        self.assertEqual(updated.count('<!-- ACTIVITY-BADGES -->'), 2)
+        self.assertIn('Duration-60_min', updated)
+        self.assertEqual(inject_activity_header.inject_badges('lab.md', updated, 'en')[0], 'No change')
+
+    def test_parallel_matches_sequential(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            seq_out, seq_log = _scaffold_and_inject(os.path.join(tmp, 'seq'), 'fr', jobs=1)
+            par_out, par_log = _scaffold_and_inject(os.path.join(tmp, 'par'), 'fr', jobs=3)
+
+            self.assertEqual(par_log, seq_log)
+            self.assertIn('Skipping activities/05-notes.md: No frontmatter found.', par_log)
+            self.assertIn('Injected: 24, Skipped: 1', par_log)
+            paths = seq_out.glob('activities/*.md')
+            self.assertEqual(len(paths), 25)
+            for path in paths:
+                self.assertEqual(par_out.read_text(path), seq_out.read_text(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
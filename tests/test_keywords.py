@@ -0,0 +1,69 @@
+"""
+Unit tests for keywords.py.
+
+Tests tokenisation, that TF-IDF ranks the terms that distinguish a week above
+the ones every week shares, that the NumPy and pure-Python paths agree, and
+that generated session pages carry the course-wide keywords.
+"""
+
+import unittest
+from unittest.mock import patch
+import contextlib
+import io
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import keywords
+from keywords import extract_keywords, tokenize
+from output_tree import OutputTree
+import generate_sessions
+
+COURSE = {
+    "metadata": {"title": "Physics"},
+    "weeks": [
+        {"week": 1, "title": "Introduction to vectors", "content": ["Vectors", "Physics units"],
+         "objectives": ["Add vectors in the plane"]},
+        {"week": 2, "title": "Kinematics", "content": ["Velocity", "Acceleration", "Physics units"],
+         "objectives": ["Describe motion with velocity and acceleration"]},
+        {"week": 3, "title": "Energía y trabajo", "content": ["Energía cinética"],
+         "objectives": ["Calcular el trabajo de una fuerza"]},
+        {"week": 4},
+    ],
+}
+
+
+class TestKeywords(unittest.TestCase):
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Energía cinética y el trabajo de 3 fuerzas"),
+                         ['energía', 'cinética', 'trabajo', 'fuerzas'])
+        self.assertEqual(tokenize("The use of A/B tests"), ['tests'])
+
+    def test_distinctive_terms_rank_first(self):
+        result = extract_keywords(COURSE, k=3, use_numpy=False)
+        self.assertEqual(result[1], ['vectors', 'introduction', 'add'])
+        self.assertEqual(result[2][:2], ['kinematics', 'velocity'])
+        self.assertNotIn('physics', result[2][:3])
+        self.assertEqual(result[3][0], 'energía')
+        self.assertEqual(result[4], [])
+
+    @unittest.skipIf(keywords.np is None, "NumPy is not installed")
+    def test_numpy_matches_python(self):
+        self.assertEqual(extract_keywords(COURSE, use_numpy=True), extract_keywords(COURSE, use_numpy=False))
+
+    def test_sessions_use_course_keywords(self):
+        # yaml may be mocked by other test modules, so check what the renderer receives
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch('generate_sessions.render_session', wraps=generate_sessions.render_session) as render:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_sessions.run(lang='en', data=COURSE, out=OutputTree(tmp), weeks=[2])
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(render.call_args.kwargs['keywords'][:2], ['kinematics', 'velocity'])
+
+
+if __name__ == '__main__':
+    unittest.main()
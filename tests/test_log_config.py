@@ -0,0 +1,104 @@
+"""
+Unit tests for log_config.py.
+
+Tests that per-file messages only appear at debug level, that the JSON format
+carries the lang/stage/week/file context, that buffered records are held
+until a flush or an error, and that errors caught inside a stage stay
+visible with their week in quiet mode.
+"""
+
+import unittest
+from unittest.mock import patch
+import contextlib
+import io
+import json
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import log_config
+from log_config import get_logger, log_context
+from output_tree import OutputTree
+import generate_activities
+import generate_sessions
+
+COURSE = {'weeks': [{'week': 1, 'activities': ['Lab']}, {'week': 2, 'activities': ['Quiz']}]}
+
+
+def _capture(func, **config):
+    buffer = io.StringIO()
+    log_config.configure(**config)
+    try:
+        with contextlib.redirect_stdout(buffer):
+            func()
+            log_config.flush()
+    finally:
+        log_config.configure()
+    return buffer.getvalue()
+
+
+class TestLogConfig(unittest.TestCase):
+
+    def test_per_file_messages_are_debug(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = OutputTree(tmp)
+            info = _capture(lambda: generate_activities.run(lang='es', data=COURSE, out=out))
+            debug = _capture(lambda: generate_activities.run(lang='es', data=COURSE, out=out, force=True),
+                             level='debug')
+
+        # The stage summary is logged once by scaffold_course from the run metrics
+        self.assertEqual(info, '')
+        self.assertIn('Generated: activities/01-lab.md', debug)
+        self.assertIn('Activity files: 2 generated, 0 skipped', debug)
+
+    def test_json_format_carries_context(self):
+        def log():
+            with log_context(lang='fr', stage='generate_sessions'):
+                get_logger('test').info('hello', extra={'week': 3})
+
+        record = json.loads(_capture(log, fmt='json'))
+        self.assertEqual(record['message'], 'hello')
+        self.assertEqual(record['level'], 'info')
+        self.assertEqual((record['lang'], record['stage'], record['week']), ('fr', 'generate_sessions', 3))
+        self.assertNotIn('file', record)
+
+    def test_buffering_until_flush_or_error(self):
+        buffer = io.StringIO()
+        log_config.configure(buffer=10)
+        logger = get_logger('test')
+        try:
+            with contextlib.redirect_stdout(buffer):
+                logger.info('one')
+                logger.info('two')
+                self.assertEqual(buffer.getvalue(), '')
+                logger.error('boom')
+                self.assertEqual(buffer.getvalue(), 'one\ntwo\nboom\n')
+        finally:
+            log_config.configure()
+
+    def test_stage_errors_survive_quiet_mode(self):
+        data = {'metadata': {'title': 'Curso'}, 'weeks': [{'week': 1, 'title': 'Intro'}, {'week': 2, 'title': 'Vectores'}]}
+        real_render = generate_sessions.render_session
+
+        def render(entry, t, course_name, keywords=None):
+            if entry.number == 2:
+                raise ValueError('bad week')
+            return real_render(entry, t, course_name, keywords)
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch('generate_sessions.render_session', render):
+            out = OutputTree(tmp)
+            log = _capture(lambda: generate_sessions.run(lang='es', data=data, out=out), quiet=True, fmt='json')
+
+        records = [json.loads(line) for line in log.splitlines()]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['level'], 'error')
+        self.assertEqual(records[0]['week'], 2)
+        self.assertIn('bad week', records[0]['message'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Unit tests for managed_blocks.py.
+
+Tests that several named blocks are inserted after the frontmatter and then
+updated in place, that unchanged blocks return the original string, that
+stray or interleaved markers raise instead of splicing, and that markers
+beyond the scan window are only looked for before inserting a block.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from managed_blocks import ManagedBlocks, MarkerError, marker, frontmatter_end
+import inject_activity_header
+
+PAGE = '---\ntitle: "Lab"\n---\n\nBody\n'
+
+
+class TestManagedBlocks(unittest.TestCase):
+
+    def setUp(self):
+        self.blocks = ManagedBlocks(['BADGES', 'SUMMARY'])
+
+    def test_insert_then_update_in_place(self):
+        content, actions = self.blocks.update(PAGE, {'BADGES': 'b1', 'SUMMARY': 's1'})
+        self.assertEqual(actions, {'BADGES': 'inserted', 'SUMMARY': 'inserted'})
+        self.assertEqual(content, '---\ntitle: "Lab"\n---\n'
+                                  '\n<!-- BADGES -->\nb1\n<!-- BADGES -->\n'
+                                  '\n<!-- SUMMARY -->\ns1\n<!-- SUMMARY -->\n'
+                                  '\nBody\n')
+
+        updated, actions = self.blocks.update(content, {'SUMMARY': 's2'})
+        self.assertEqual(actions, {'SUMMARY': 'updated'})
+        self.assertEqual(updated, content.replace('s1', 's2'))
+        self.assertEqual(set(self.blocks.find(updated)), {'BADGES', 'SUMMARY'})
+
+    def test_unchanged_returns_same_string(self):
+        content, _ = self.blocks.update(PAGE, {'BADGES': 'b1'})
+        again, actions = self.blocks.update(content, {'BADGES': 'b1'})
+        self.assertEqual(actions, {'BADGES': 'unchanged'})
+        self.assertIs(again, content)
+
+    def test_insert_next_to_existing_block(self):
+        content, _ = self.blocks.update(PAGE, {'BADGES': 'b1'})
+        content, actions = self.blocks.update(content, {'BADGES': 'b2', 'SUMMARY': 's1'})
+        self.assertEqual(actions, {'BADGES': 'updated', 'SUMMARY': 'inserted'})
+        found = self.blocks.find(content)
+        self.assertEqual((found['BADGES'].body, found['SUMMARY'].body), ('b2', 's1'))
+        self.assertEqual(content.count(marker('BADGES')), 2)
+
+    def test_stray_marker_raises(self):
+        stray = PAGE + f"{marker('BADGES')}\nno closing marker\n" + "text\n" * 20
+        with self.assertRaises(MarkerError):
+            self.blocks.update(stray, {'BADGES': 'b1'})
+
+        interleaved = PAGE + f"{marker('BADGES')}\n{marker('SUMMARY')}\n{marker('BADGES')}\n{marker('SUMMARY')}\n"
+        with self.assertRaises(MarkerError):
+            self.blocks.find(interleaved)
+
+    def test_scan_is_bounded(self):
+        far = PAGE + "line\n" * 10 + f"{marker('BADGES')}\nold\n{marker('BADGES')}\n"
+        self.assertEqual(ManagedBlocks(['BADGES'], scan_lines=5).find(far), {})
+        self.assertEqual(self.blocks.find(far)['BADGES'].body, 'old')
+        self.assertEqual(frontmatter_end('no frontmatter\n'), 0)
+
+    def test_update_finds_block_past_scan_window(self):
+        far = PAGE + "line\n" * 150 + f"{marker('BADGES')}\nold\n{marker('BADGES')}\n"
+        self.assertEqual(self.blocks.find(far), {})
+        content, actions = self.blocks.update(far, {'BADGES': 'new'})
+        self.assertEqual(actions, {'BADGES': 'updated'})
+        self.assertEqual(content, far.replace('old', 'new'))
+        self.assertEqual(content.count(marker('BADGES')), 2)
+
+        unclosed = PAGE + "line\n" * 150 + f"{marker('BADGES')}\nold\n"
+        with self.assertRaises(MarkerError):
+            self.blocks.update(unclosed, {'BADGES': 'new'})
+
+    def test_badge_injection_reports_stray_marker(self):
+        content = '---\nduration: "60 min"\n---\n\n<!-- ACTIVITY-BADGES -->\nBody\n'
+        action, new_content, message = inject_activity_header.inject_badges('lab.md', content, 'en')
+        self.assertEqual(action, 'Error')
+        self.assertIs(new_content, content)
+        self.assertIn('not closed', message)
+
+
+if __name__ == '__main__':
+    unittest.main()
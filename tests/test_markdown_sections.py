@@ -0,0 +1,81 @@
+"""
+Unit tests for markdown_sections.py.
+
+Tests that headings and directives are indexed with correct offsets in one
+scan (ignoring frontmatter and fenced code) and that queued edits are applied
+against the original offsets in a single render.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from markdown_sections import MarkdownDocument
+
+SAMPLE = """---
+title: '# not a heading'
+---
+
+:::{note} Objetivos
+1. Obj
+:::
+
+## Actividades
+
+- act
+
+```python
+## not a heading either
+```
+
+### Detail
+
+## Evaluación
+
+- eval
+"""
+
+class TestMarkdownSections(unittest.TestCase):
+
+    def test_index_headings_and_directives(self):
+        """Test that the scan finds real headings, section ends and directive offsets."""
+        doc = MarkdownDocument(SAMPLE)
+
+        self.assertEqual([(h.level, h.title) for h in doc.headings],
+                         [(2, 'Actividades'), (3, 'Detail'), (2, 'Evaluación')])
+
+        activities, detail, evaluation = doc.headings
+        self.assertEqual(activities.end, evaluation.start)
+        self.assertEqual(detail.end, evaluation.start)
+        self.assertEqual(evaluation.end, len(SAMPLE))
+        self.assertEqual(SAMPLE[activities.title_start:activities.line_end], 'Actividades\n')
+
+        note = doc.find_directive('note', 'Objetivos')
+        self.assertEqual(SAMPLE[note.start:note.end], ':::{note} Objetivos\n1. Obj\n:::')
+        self.assertEqual(SAMPLE[note.body_start:note.body_end], '1. Obj\n')
+
+    def test_edits_are_applied_in_one_pass(self):
+        """Test that edits queued against original offsets do not shift each other."""
+        doc = MarkdownDocument(SAMPLE)
+        activities = doc.find_heading(lambda h: h.title == 'Actividades')
+        evaluation = doc.find_heading(lambda h: h.title.startswith('Eval'), after=activities.end)
+
+        doc.insert(evaluation.end, "- link\n")
+        doc.replace(activities.start, activities.title_start, "## 🧪 ")
+        doc.insert(activities.end - 1, "\n- more\n")
+
+        self.assertTrue(doc.contains('- act', activities.line_end, activities.end))
+        self.assertFalse(doc.contains('- eval', activities.line_end, activities.end))
+
+        rendered = doc.render()
+        self.assertIn("## 🧪 Actividades\n", rendered)
+        self.assertIn("### Detail\n\n- more\n\n## Evaluación", rendered)
+        self.assertTrue(rendered.endswith("- eval\n- link\n"))
+        # The original text is untouched
+        self.assertEqual(doc.text, SAMPLE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Unit tests for output_tree.py.
+
+Tests that MemoryTree records writes without touching the disk, that later
+reads observe earlier pending writes, and that the plan classifies files as
+created, changed or unchanged with byte deltas, and that a disk tree with a
+ChangeManifest records only the writes that change a file.
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from output_tree import MemoryTree, OutputTree, ChangeManifest
+import generate_activities
+
+class TestMemoryTree(unittest.TestCase):
+
+    def test_plan_reports_pending_writes_without_touching_disk(self):
+        """Test that a stage run against a MemoryTree only produces a plan."""
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'activities'))
+            with open(os.path.join(tmp, 'programa.md'), 'w', encoding='utf-8') as f:
+                f.write('same')
+            with open(os.path.join(tmp, 'sessions_table.md'), 'w', encoding='utf-8') as f:
+                f.write('old')
+
+            tree = MemoryTree(tmp)
+            data = {"weeks": [{"week": 1, "activities": ["Lab work"]}], "metadata": {}}
+            generate_activities.run(lang='en', force=True, data=data, out=tree)
+            tree.write_text('programa.md', 'same')
+            tree.write_text('sessions_table.md', 'newer')
+
+            # Nothing was written to disk
+            self.assertEqual(os.listdir(os.path.join(tmp, 'activities')), [])
+
+            # Pending writes are visible to later stages
+            self.assertTrue(tree.exists('activities/01-lab-work.md'))
+            self.assertEqual(tree.glob('activities/*.md'), [os.path.join('activities', '01-lab-work.md')])
+            self.assertIn('Lab work', tree.read_text('activities/01-lab-work.md'))
+
+            plan = {e['path']: e for e in tree.plan()}
+            self.assertEqual(plan[os.path.join('activities', '01-lab-work.md')]['action'], 'create')
+            self.assertEqual(plan['programa.md']['action'], 'unchanged')
+            self.assertEqual(plan['sessions_table.md']['action'], 'change')
+            self.assertEqual(plan['sessions_table.md']['delta'], 2)
+
+class TestChangeManifest(unittest.TestCase):
+
+    def test_records_effective_writes_only(self):
+        """Test that unchanged writes are skipped and repeated writes are merged."""
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, 'same.md'), 'w', encoding='utf-8') as f:
+                f.write('same')
+            with open(os.path.join(tmp, 'edited.md'), 'w', encoding='utf-8') as f:
+                f.write('old')
+            manifest = ChangeManifest()
+            tree = OutputTree(tmp, manifest=manifest)
+            before = os.stat(os.path.join(tmp, 'same.md')).st_mtime_ns
+
+            tree.stage = 'first'
+            tree.write_text('same.md', 'same')
+            tree.write_text('edited.md', 'new')
+            tree.write_text('new.md', 'a')
+            tree.stage = 'second'
+            tree.write_text('new.md', 'b')
+
+            self.assertEqual(os.stat(os.path.join(tmp, 'same.md')).st_mtime_ns, before)
+            entries = {os.path.basename(e['path']): e for e in manifest.entries}
+            self.assertEqual(sorted(entries), ['edited.md', 'new.md'])
+            self.assertEqual(entries['edited.md']['reason'], 'modified')
+            self.assertIsNotNone(entries['edited.md']['old_hash'])
+            self.assertEqual(entries['new.md']['reason'], 'created')
+            self.assertIsNone(entries['new.md']['old_hash'])
+            self.assertEqual(entries['new.md']['stages'], ['first', 'second'])
+
+            # Restoring the original content removes the entry again
+            tree.write_text('edited.md', 'old')
+            self.assertEqual([os.path.basename(e['path']) for e in manifest.entries], ['new.md'])
+            self.assertTrue(manifest.to_dict()['changed'])
+
+if __name__ == '__main__':
+    unittest.main()
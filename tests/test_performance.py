@@ -0,0 +1,142 @@
+"""
+Performance regression tests.
+
+Runs every scaffold stage on synthetic 1k- and 10k-week syllabi in a
+temporary directory and checks that:
+
+    - the time of each stage (from the run metrics) and of the whole run
+      grows roughly linearly with the number of weeks;
+    - the peak memory traced by tracemalloc stays under a per-size cap and
+      also grows roughly linearly;
+    - course-wide keyword extraction stays fast enough to run on every build.
+
+Sizes and tolerances live in perf_baseline.json next to this file; the
+recorded_* entries are the measurements the tolerances were set from. The
+tests are offline but slow (about five minutes), so a plain pytest run
+skips them (see pytest.ini); run them with:
+
+    python -m pytest -m perf
+"""
+
+import unittest
+import json
+import tempfile
+import time
+import tracemalloc
+import sys
+import os
+
+import pytest
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import scaffold_course
+import log_config
+from output_tree import OutputTree
+from run_metrics import RunMetrics
+from course_model import as_course
+from keywords import extract_keywords
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'perf_baseline.json')
+
+
+def synthetic_course(weeks: int) -> dict:
+    """A syllabus with every field filled in and two activities per week."""
+    return {
+        "metadata": {"title": "Synthetic Course", "semester": "I-2026", "code": "PERF-101"},
+        "weeks": [
+            {
+                "week": w,
+                "title": f"Topic {w}",
+                "subtitle": f"Unit {w // 10 + 1}",
+                "content": [f"Concept {w}.1", f"Concept {w}.2"],
+                "objectives": [f"Explain concept {w}.1", f"Apply concept {w}.2"],
+                "activities": [f"Lab {w}. Measure the data", f"Quiz {w}"],
+                "evaluation": [{"type": "Quiz", "description": f"Short quiz on topic {w}"}],
+                "references": [{"text": "Course textbook", "pages": f"{w}-{w + 9}"}],
+            }
+            for w in range(1, weeks + 1)
+        ],
+    }
+
+
+def _scaffold(weeks: int, metrics=None) -> float:
+    """Scaffolds a synthetic course into a fresh directory; returns the wall time."""
+    data = as_course(synthetic_course(weeks))
+    with tempfile.TemporaryDirectory() as tmp:
+        out = OutputTree(tmp, metrics=metrics.scope('en') if metrics is not None else None)
+        start = time.perf_counter()
+        scaffold_course.scaffold('en', False, data, out=out)
+        return time.perf_counter() - start
+
+
+@pytest.mark.perf
+class TestPerformance(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(BASELINE_FILE, encoding='utf-8') as f:
+            cls.baseline = json.load(f)
+        cls.small, cls.large = cls.baseline['sizes']
+        cls.ratio = cls.large / cls.small
+
+    def setUp(self):
+        log_config.configure(level='warning')
+
+    def tearDown(self):
+        log_config.configure()
+
+    def test_time_scales_linearly(self):
+        tolerances = self.baseline['time']
+        limit = self.ratio * tolerances['max_scaling_factor']
+
+        runs = {}
+        for size in (self.small, self.large):
+            metrics = RunMetrics()
+            total = _scaffold(size, metrics)
+            runs[size] = (total, {r['stage']: r['duration_seconds'] for r in metrics.records})
+
+        (small_total, small_stages), (large_total, large_stages) = runs[self.small], runs[self.large]
+        self.assertLessEqual(large_total / small_total, limit,
+                             f"{self.large} weeks took {large_total:.2f}s vs {small_total:.2f}s "
+                             f"for {self.small} (limit x{limit:g})")
+        for stage, seconds in large_stages.items():
+            # Stages this fast are dominated by timer noise
+            if seconds < tolerances['min_stage_seconds']:
+                continue
+            scaling = seconds / max(small_stages.get(stage, 0.0), 1e-6)
+            self.assertLessEqual(scaling, limit,
+                                 f"{stage}: {seconds:.3f}s for {self.large} weeks vs "
+                                 f"{small_stages.get(stage, 0.0):.3f}s for {self.small} (limit x{limit:g})")
+
+    def test_peak_memory(self):
+        tolerances = self.baseline['memory']
+        peaks = {}
+        for size in (self.small, self.large):
+            tracemalloc.start()
+            try:
+                _scaffold(size)
+                peaks[size] = tracemalloc.get_traced_memory()[1] / 1e6
+            finally:
+                tracemalloc.stop()
+            self.assertLessEqual(peaks[size], tolerances['max_peak_mb'][str(size)],
+                                 f"Peak memory for {size} weeks: {peaks[size]:.1f} MB")
+
+        limit = self.ratio * tolerances['max_scaling_factor']
+        self.assertLessEqual(peaks[self.large] / peaks[self.small], limit,
+                             f"Peak memory grew from {peaks[self.small]:.1f} MB to "
+                             f"{peaks[self.large]:.1f} MB (limit x{limit:g})")
+
+    def test_keyword_extraction_time(self):
+        tolerances = self.baseline['keywords']
+        course = as_course(synthetic_course(tolerances['weeks']))
+        start = time.perf_counter()
+        extract_keywords(course)
+        seconds = time.perf_counter() - start
+        self.assertLessEqual(seconds, tolerances['max_seconds'],
+                             f"Keywords for {tolerances['weeks']} weeks took {seconds:.2f}s")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Unit tests for run_metrics.py.
+
+Tests that an OutputTree counts generated and unchanged writes with their
+bytes, that stages report skips, that a failing stage is counted and timed,
+and that both exports (JSON and Prometheus text format) are written.
+"""
+
+import unittest
+import contextlib
+import io
+import json
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from run_metrics import RunMetrics, prometheus_path
+from output_tree import OutputTree
+from utils import default_file_mode
+import generate_activities
+
+COURSE = {'weeks': [{'week': 1, 'activities': ['Lab']}, {'week': 2, 'activities': ['Quiz']}]}
+
+
+def _stage(metrics, lang, stage):
+    return next(r for r in metrics.records if r['lang'] == lang and r['stage'] == stage)
+
+
+class TestRunMetrics(unittest.TestCase):
+
+    def test_tree_counts_stage_outcomes(self):
+        metrics = RunMetrics()
+        with tempfile.TemporaryDirectory() as tmp:
+            out = OutputTree(tmp, metrics=metrics.scope('es'))
+            with contextlib.redirect_stdout(io.StringIO()):
+                with out.running('generate_activities'):
+                    generate_activities.run(lang='es', data=COURSE, out=out)
+                # Second pass without --force keeps both files
+                with out.running('generate_activities'):
+                    generate_activities.run(lang='es', data=COURSE, out=out)
+                # Identical content is not rewritten
+                with out.running('generate_activities'):
+                    generate_activities.run(lang='es', force=True, data=COURSE, out=out)
+
+            written = sum(os.path.getsize(os.path.join(tmp, 'activities', name))
+                          for name in os.listdir(os.path.join(tmp, 'activities')))
+
+        record = _stage(metrics, 'es', 'generate_activities')
+        self.assertEqual((record['generated'], record['skipped'], record['unchanged'], record['failed']), (2, 2, 2, 0))
+        self.assertEqual(record['bytes_written'], written)
+        self.assertGreater(record['duration_seconds'], 0)
+
+    def test_failing_stage_is_counted(self):
+        metrics = RunMetrics()
+        out = OutputTree('.', metrics=metrics.scope('en'))
+        with self.assertRaises(RuntimeError):
+            with out.running('sync_myst'):
+                raise RuntimeError('boom')
+        self.assertEqual(_stage(metrics, 'en', 'sync_myst')['failed'], 1)
+        with self.assertRaises(ValueError):
+            metrics.count('en', 'sync_myst', 'exploded')
+
+    def test_exports(self):
+        metrics = RunMetrics()
+        metrics.count('es', 'generate_sessions', 'generated', 3)
+        metrics.add_bytes('es', 'generate_sessions', 1200)
+        metrics.count('fr', 'generate_sessions', 'skipped')
+        metrics.add_duration('es', 'generate_sessions', 0.25)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, 'out', 'metrics.json')
+            prom_path = metrics.write(json_path)
+            self.assertEqual(prom_path, prometheus_path(json_path))
+            with open(json_path, encoding='utf-8') as f:
+                data = json.load(f)
+            with open(prom_path, encoding='utf-8') as f:
+                prom = f.read()
+            # Readable by a collector running as another user (not mkstemp's 0600)
+            for path in (json_path, prom_path):
+                self.assertEqual(os.stat(path).st_mode & 0o777, default_file_mode())
+
+        self.assertEqual(data['totals'], {'generated': 3, 'skipped': 1, 'unchanged': 0, 'failed': 0, 'bytes_written': 1200})
+        self.assertEqual([r['lang'] for r in data['stages']], ['es', 'fr'])
+        self.assertIn('# TYPE scaffold_files_total counter', prom)
+        self.assertIn('scaffold_files_total{lang="es",stage="generate_sessions",outcome="generated"} 3', prom)
+        self.assertIn('scaffold_bytes_written_total{lang="es",stage="generate_sessions"} 1200', prom)
+        self.assertIn('scaffold_stage_duration_seconds{lang="es",stage="generate_sessions"} 0.25', prom)
+        self.assertTrue(prom.endswith('\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
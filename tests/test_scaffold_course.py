@@ -1,14 +1,26 @@
 import unittest
 from unittest.mock import patch, MagicMock
+import contextlib
+import io
 import sys
 import os
+import tempfile
 
 # Add scripts directory to path to import scaffold_course
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+from output_tree import OutputTree, ChangeManifest
 import scaffold_course
+import log_config
+from course_model import as_course
+from toc_model import TocDocument
+import validate_links
 
 class TestScaffoldCourse(unittest.TestCase):
 
+    def tearDown(self):
+        # main() configures buffered logging; restore the defaults for other tests
+        log_config.configure()
+
     @patch('scaffold_course.sys.exit')
     @patch('builtins.input')
     @patch('pathlib.Path.exists')
@@ -16,15 +28,20 @@ class TestScaffoldCourse(unittest.TestCase):
         """Test that --force prompts the user and exits if answer is not 'y'."""
         mock_exists.return_value = True # planeamiento.json exists
         mock_input.return_value = 'n'
+        # Stop main() at the exit like the real sys.exit, so nothing is scaffolded
+        mock_exit.side_effect = SystemExit
         
         with patch('argparse.ArgumentParser.parse_args') as mock_args:
-            mock_args.return_value = MagicMock(force=True, yes=False, lang='es')
+            mock_args.return_value = MagicMock(force=True, yes=False, lang='es', langs=None, output_root='langs', plan=False, plan_format='text', build_cache=None, manifest='', metrics='', writer='sync', write_concurrency=16, jobs=1, log_level='info', quiet=False, log_format='text', weeks=None, changed_only=False)
             
-            scaffold_course.main()
+            with self.assertRaises(SystemExit):
+                scaffold_course.main()
             
             mock_input.assert_called_once()
             mock_exit.assert_called_with(0)
 
+    @patch('scaffold_course.syllabus_diff.save_snapshot')
+    @patch('scaffold_course.search_index.run')
     @patch('scaffold_course.generate_sessions_table_json.run')
     @patch('scaffold_course.inject_activity_header.run')
     @patch('scaffold_course.update_toc.main')
@@ -35,14 +52,16 @@ class TestScaffoldCourse(unittest.TestCase):
     @patch('scaffold_course.create_myst_config')
     @patch('builtins.input')
     @patch('pathlib.Path.exists')
-    def test_force_yes_skips_prompt(self, mock_exists, mock_input, mock_create_config, mock_gen_prog, mock_gen_act, mock_gen_sess, mock_sync, mock_update_toc, mock_inject, mock_gen_table):
+    def test_force_yes_skips_prompt(self, mock_exists, mock_input, mock_create_config, mock_gen_prog, mock_gen_act, mock_gen_sess, mock_sync, mock_update_toc, mock_inject, mock_gen_table, mock_search, mock_save_snapshot):
         """Test that --force --yes works without prompting and calls all steps."""
         mock_exists.return_value = True
+        # myst.yml already exists, so its TOC is updated too
+        mock_create_config.return_value = False
         
         with patch('argparse.ArgumentParser.parse_args') as mock_args:
-            mock_args.return_value = MagicMock(force=True, yes=True, lang='es')
+            mock_args.return_value = MagicMock(force=True, yes=True, lang='es', langs=None, output_root='langs', plan=False, plan_format='text', build_cache=None, manifest='', metrics='', writer='sync', write_concurrency=16, jobs=1, log_level='info', quiet=False, log_format='text', weeks=None, changed_only=False)
             
-            with patch('scaffold_course.Path.mkdir'):
+            with patch('scaffold_course.OutputTree.makedirs'):
                 scaffold_course.main()
                 
             mock_input.assert_not_called()
@@ -54,6 +73,174 @@ class TestScaffoldCourse(unittest.TestCase):
             mock_gen_act.assert_called()
             mock_inject.assert_called()
             mock_gen_table.assert_called()
+            mock_search.assert_called()
+            # A forced full run is the new baseline for --changed-only
+            mock_save_snapshot.assert_called_once()
+
+    @patch('scaffold_course.syllabus_diff.load_snapshot', return_value=None)
+    @patch('scaffold_course.syllabus_diff.save_snapshot')
+    @patch('scaffold_course.scaffold')
+    @patch('pathlib.Path.exists')
+    def test_snapshot_only_saved_by_complete_runs(self, mock_exists, mock_scaffold, mock_save_snapshot, mock_load):
+        """Test that the --changed-only baseline is not saved by runs that kept or failed to write pages."""
+        mock_exists.return_value = True
+        options = dict(yes=True, lang='es', langs=None, output_root='langs', plan=False, plan_format='text', build_cache=None, manifest='', metrics='', writer='sync', write_concurrency=16, jobs=1, log_level='info', quiet=True, log_format='text', weeks=None, changed_only=False)
+
+        with patch('argparse.ArgumentParser.parse_args') as mock_args, contextlib.redirect_stdout(io.StringIO()):
+            # Without --force existing pages are kept, so they may not match the syllabus
+            mock_args.return_value = MagicMock(force=False, **options)
+            scaffold_course.main()
+            mock_save_snapshot.assert_not_called()
+
+            # A forced run in which a stage counted a failure
+            mock_scaffold.side_effect = lambda *args, **kwargs: kwargs['out'].count('failed')
+            mock_args.return_value = MagicMock(force=True, **options)
+            scaffold_course.main()
+            mock_save_snapshot.assert_not_called()
+
+            mock_scaffold.side_effect = None
+            scaffold_course.main()
+            mock_save_snapshot.assert_called_once()
+
+    def test_plan_writes_nothing(self):
+        """Test that --plan leaves the working directory exactly as it was, caches included."""
+        repo = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(repo, 'planeamiento.json'), 'rb') as src, \
+                    open(os.path.join(tmp, 'planeamiento.json'), 'wb') as dst:
+                dst.write(src.read())
+            os.chdir(tmp)
+            try:
+                with patch('argparse.ArgumentParser.parse_args') as mock_args, \
+                        contextlib.redirect_stdout(io.StringIO()) as stdout, contextlib.redirect_stderr(io.StringIO()):
+                    mock_args.return_value = MagicMock(force=False, yes=False, lang='en', langs=None, output_root='langs', plan=True, plan_format='json', build_cache=None, manifest=scaffold_course.DEFAULT_MANIFEST, metrics='', writer='sync', write_concurrency=16, jobs=1, log_level='info', quiet=False, log_format='text', weeks=None, changed_only=False)
+                    scaffold_course.main()
+            finally:
+                os.chdir(cwd)
+            self.assertEqual(os.listdir(tmp), ['planeamiento.json'])
+        self.assertIn('"myst.yml"', stdout.getvalue())
+
+    @patch('scaffold_course.scaffold')
+    def test_scaffold_languages_shares_parsed_course(self, mock_scaffold):
+        """Test that --langs renders each language into its own root from one parsed course."""
+        data = {
+            "weeks": [{"week": 1, "title": "Topic", "activities": "Lab work"}],
+            "metadata": {}
+        }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            trees = {lang: OutputTree(os.path.join(tmp, lang)) for lang in ('es', 'en')}
+            failures = scaffold_course.scaffold_languages(trees, False, data)
+
+            self.assertEqual(failures, {})
+            self.assertEqual(mock_scaffold.call_count, 2)
+            roots = sorted(call.kwargs['out'].root for call in mock_scaffold.call_args_list)
+            self.assertEqual(roots, [os.path.join(tmp, 'en'), os.path.join(tmp, 'es')])
+
+            # Same parsed data and TOC skeleton objects are shared by every language
+            self.assertTrue(all(call.args[2] is data for call in mock_scaffold.call_args_list))
+            skeletons = [call.kwargs['skeleton'] for call in mock_scaffold.call_args_list]
+            self.assertIs(skeletons[0], skeletons[1])
+            self.assertEqual(skeletons[0][0][1][1]['file'], 'activities/01-lab-work.md')
+
+    @patch('scaffold_course.update_toc.main')
+    def test_fresh_myst_config_matches_sessions(self, mock_update_toc):
+        """Test that a created myst.yml already points at the session files, so update_toc is skipped."""
+        data = {
+            "metadata": {"title": "Course"},
+            "weeks": [
+                {"week": 1, "title": "Introducción al Diseño", "activities": "Lab 1"},
+                {"week": 2, "activities": "Lab 2"}
+            ]
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scaffold_course.scaffold('fr', False, as_course(data), out=OutputTree(tmp))
+
+            mock_update_toc.assert_not_called()
+            toc = TocDocument(OutputTree(tmp).read_text('myst.yml'))
+            sessions = [toc.week_entries()[n].children[0].file for n in (1, 2)]
+            # Untitled weeks are named after the translated session label
+            self.assertEqual(sessions, ['sessions/01-introduccion-al-diseno.md', 'sessions/02-seance-2.md'])
+            self.assertEqual(validate_links.validate(tmp), [])
+
+            # Once myst.yml exists, later runs keep it in sync through update_toc
+            with contextlib.redirect_stdout(io.StringIO()):
+                scaffold_course.scaffold('fr', False, as_course(data), out=OutputTree(tmp))
+            mock_update_toc.assert_called_once()
+
+    def test_week_selection_touches_only_selected_outputs(self):
+        """Test that scaffold(weeks=...) rewrites only the outputs of the selected weeks."""
+        data = {
+            "metadata": {"title": "Course"},
+            "weeks": [
+                {"week": w, "title": f"Topic {w}", "objectives": [f"Goal {w}"], "activities": f"Lab {w}"}
+                for w in range(1, 5)
+            ]
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scaffold_course.scaffold('en', False, as_course(data), out=OutputTree(tmp))
+
+                for week in data['weeks']:
+                    week['objectives'] = [f"New goal {week['week']}"]
+                manifest = ChangeManifest()
+                out = OutputTree(tmp, manifest=manifest)
+                scaffold_course.scaffold('en', True, as_course(data), out=out, weeks=[2, 3])
+
+            changed = sorted(os.path.relpath(e['path'], tmp) for e in manifest.entries)
+            self.assertEqual(changed, [
+                # Only the shard of the new term ('new') and the manifest change
+                os.path.join('assets', 'search', 'manifest.json'),
+                os.path.join('assets', 'search', 'terms', 'ne.json'),
+                os.path.join('sessions', '02-topic-2.md'),
+                os.path.join('sessions', '03-topic-3.md'),
+                'sessions_table.md',
+            ])
+            with open(os.path.join(tmp, 'sessions_table.md'), encoding='utf-8') as f:
+                table = f.read()
+            self.assertIn('| 1 | Topic 1 | <ul><li>Goal 1</li></ul> |', table)
+            self.assertIn('| 2 | Topic 2 | <ul><li>New goal 2</li></ul> |', table)
+            self.assertIn('| 4 | Topic 4 | <ul><li>Goal 4</li></ul> |', table)
+
+    def test_sharded_layout(self):
+        """Test that units get their own directories, nested TOC parts and working links."""
+        data = {
+            "metadata": {"title": "Course", "unit_size": 2},
+            "weeks": [{"week": w, "title": f"Topic {w}", "activities": [f"Lab {w}"]} for w in range(1, 4)]
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scaffold_course.scaffold('en', False, as_course(data), out=OutputTree(tmp))
+
+                self.assertTrue(os.path.exists(os.path.join(tmp, 'sessions', 'unit-02', '03-topic-3.md')))
+                self.assertTrue(os.path.exists(os.path.join(tmp, 'activities', 'unit-01', '02-lab-2.md')))
+                with open(os.path.join(tmp, 'sessions', 'unit-01', '01-topic-1.md'), encoding='utf-8') as f:
+                    self.assertIn('](../../activities/unit-01/01-lab-1.md)', f.read())
+                with open(os.path.join(tmp, 'activities', 'unit-02', '03-lab-3.md'), encoding='utf-8') as f:
+                    self.assertIn('ACTIVITY-BADGES', f.read())
+
+                toc = TocDocument(OutputTree(tmp).read_text('myst.yml'))
+                self.assertEqual([e.file or e.title for e in toc.entries], ['programa.md', 'Unit 1', 'Unit 2'])
+                self.assertEqual([e.title for e in toc.entries[1].children], ['Week 1', 'Week 2'])
+
+                # Each unit's part also lives in its own TOC file
+                unit_1 = OutputTree(tmp).read_text(os.path.join('toc', 'unit-01.yml'))
+                self.assertEqual(TocDocument(unit_1, fragment=True).entries[0].title, 'Unit 1')
+
+                # A renamed session is followed inside its unit part, rewriting only that unit's file
+                data['weeks'][2]['title'] = 'Energy'
+                os.remove(os.path.join(tmp, 'sessions', 'unit-02', '03-topic-3.md'))
+                manifest = ChangeManifest()
+                scaffold_course.scaffold('en', False, as_course(data), out=OutputTree(tmp, manifest=manifest))
+            changed = {os.path.relpath(e['path'], tmp).replace(os.sep, '/') for e in manifest.entries}
+            self.assertIn('toc/unit-02.yml', changed)
+            self.assertIn('myst.yml', changed)
+            self.assertNotIn('toc/unit-01.yml', changed)
+            toc = TocDocument(OutputTree(tmp).read_text('myst.yml'))
+            self.assertEqual(toc.week_entries()[3].children[0].file, 'sessions/unit-02/03-energy.md')
+            self.assertEqual(validate_links.validate(tmp), [])
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,127 @@
+"""
+Unit tests for search_index.py.
+
+Tests that sessions and activities are indexed into shards by term prefix
+with folded terms, and that a rebuild only rewrites the shards of the weeks
+that changed, including removed weeks.
+"""
+
+import unittest
+import contextlib
+import copy
+import io
+import json
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import search_index
+import syllabus_diff
+from search_index import fold, shard_of
+from output_tree import OutputTree, ChangeManifest
+
+COURSE = {
+    "metadata": {"title": "Physics"},
+    "weeks": [
+        {"week": 1, "title": "Vectors", "objectives": ["Add vectors"], "activities": ["Vector lab"]},
+        {"week": 2, "title": "Energía", "content": ["Kinetic energy"],
+         "evaluation": [{"type": "Quiz", "description": "Energy quiz"}]},
+        {"week": 3, "title": "Momentum", "activities": ["Collision lab"]},
+    ],
+}
+
+
+def _build(tmp, data, weeks=None):
+    manifest = ChangeManifest()
+    with contextlib.redirect_stdout(io.StringIO()):
+        search_index.run(lang='en', data=data, out=OutputTree(tmp, manifest=manifest), weeks=weeks)
+    return sorted(os.path.relpath(e['path'], tmp).replace(os.sep, '/') for e in manifest.entries)
+
+
+def _load(tmp, relpath):
+    with open(os.path.join(tmp, search_index.SEARCH_DIR, relpath), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def test_fold_and_shards(self):
+        self.assertEqual(fold('Energía'), 'energia')
+        self.assertEqual(shard_of('energia'), 'en')
+        self.assertEqual(shard_of('ßeta'), search_index.OTHER_SHARD)
+
+    def test_full_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _build(tmp, COURSE)
+            manifest = _load(tmp, 'manifest.json')
+            self.assertEqual(manifest['documents'], 5)
+            self.assertEqual(sorted(manifest['weeks']), ['1', '2', '3'])
+
+            self.assertEqual(_load(tmp, 'terms/ve.json')['vectors'], [['1/session', 3]])
+            self.assertEqual(_load(tmp, 'terms/en.json')['energia'], [['2/session', 2]])
+            self.assertEqual(_load(tmp, 'terms/qu.json')['quiz'], [['2/session', 2]])
+            self.assertEqual(_load(tmp, 'terms/la.json')['lab'], [['1/01-vector-lab', 1], ['3/03-collision-lab', 1]])
+            self.assertEqual(_load(tmp, 'docs.json')['1/session'], ['Vectors', 'sessions/01-vectors.md'])
+
+    def test_incremental_rebuild_touches_changed_shards(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _build(tmp, COURSE)
+            self.assertEqual(_build(tmp, COURSE), [])
+
+            data = copy.deepcopy(COURSE)
+            data['weeks'][2]['activities'] = ["Collision experiment"]
+            # 'collision' now points to the renamed activity; 'lab' loses it
+            self.assertEqual(_build(tmp, data), [
+                'assets/search/docs.json',
+                'assets/search/manifest.json',
+                'assets/search/terms/co.json',
+                'assets/search/terms/ex.json',
+                'assets/search/terms/la.json',
+            ])
+            self.assertEqual(_load(tmp, 'terms/la.json')['lab'], [['1/01-vector-lab', 1]])
+            self.assertEqual(_load(tmp, 'terms/co.json')['collision'], [['3/03-collision-experiment', 1]])
+
+            # A removed week leaves the index; other weeks are untouched
+            del data['weeks'][0]
+            self.assertNotIn('assets/search/terms/ve.json', _build(tmp, data))
+            self.assertNotIn('ve', _load(tmp, 'manifest.json')['shards'])
+            self.assertEqual(sorted(_load(tmp, 'docs.json')), ['2/session', '3/03-collision-experiment', '3/session'])
+
+            # The dropped shard is not read back when one of its prefixes returns
+            data['weeks'][0]['title'] = 'Velocity'
+            _build(tmp, data)
+            self.assertEqual(_load(tmp, 'terms/ve.json'), {'velocity': [['2/session', 2]]})
+
+    def test_removed_week_leaves_index_with_rebuild_plan(self):
+        """Test that --changed-only drops a removed week through RebuildPlan's week selection."""
+        with tempfile.TemporaryDirectory() as tmp:
+            _build(tmp, COURSE)
+            data = copy.deepcopy(COURSE)
+            del data['weeks'][2]
+            changes = syllabus_diff.diff(syllabus_diff.snapshot(COURSE), syllabus_diff.snapshot(data))
+            plan = syllabus_diff.RebuildPlan.from_changes(changes, data)
+            self.assertEqual(plan.weeks(syllabus_diff.SEARCH), [3])
+
+            _build(tmp, data, weeks=plan.weeks(syllabus_diff.SEARCH))
+            self.assertEqual(sorted(_load(tmp, 'docs.json')), ['1/01-vector-lab', '1/session', '2/session'])
+            self.assertEqual(sorted(_load(tmp, 'manifest.json')['weeks']), ['1', '2'])
+            self.assertNotIn('co', _load(tmp, 'manifest.json')['shards'])
+            self.assertEqual(_load(tmp, 'terms/la.json')['lab'], [['1/01-vector-lab', 1]])
+
+    def test_week_selection_only_reindexes_selected_weeks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _build(tmp, COURSE)
+            data = copy.deepcopy(COURSE)
+            data['weeks'][0]['title'] = 'Scalars'
+            data['weeks'][1]['title'] = 'Work'
+            _build(tmp, data, weeks=[2])
+            self.assertIn('work', _load(tmp, 'terms/wo.json'))
+            self.assertIn('vectors', _load(tmp, 'terms/ve.json'))
+            self.assertFalse(os.path.exists(os.path.join(tmp, search_index.SHARD_DIR, 'sc.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Unit tests for syllabus_diff.py.
+
+Tests that the differ reports changes at field level (metadata keys, week
+fields, individual activities matched by content), that the snapshot survives
+a save/load round trip, and that a rebuild plan only regenerates the outputs
+that depend on the changed fields.
+"""
+
+import unittest
+import contextlib
+import copy
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import syllabus_diff
+from syllabus_diff import RebuildPlan, diff, snapshot
+from output_tree import OutputTree, ChangeManifest
+from course_model import as_course
+from utils import default_file_mode
+import scaffold_course
+
+COURSE = {
+    "metadata": {"title": "Course", "semester": "I-2026"},
+    "weeks": [
+        {
+            "week": w,
+            "title": f"Topic {w}",
+            "objectives": [f"Goal {w}"],
+            "activities": [f"Lab {w}", f"Quiz {w}"],
+            "references": [{"text": f"Book {w}"}],
+        }
+        for w in range(1, 4)
+    ],
+}
+
+
+def _changes(edit):
+    data = copy.deepcopy(COURSE)
+    edit(data)
+    return [str(c) for c in diff(snapshot(COURSE), snapshot(data))]
+
+
+class TestSyllabusDiff(unittest.TestCase):
+
+    def test_identical_syllabus_has_no_changes(self):
+        self.assertEqual(diff(snapshot(COURSE), snapshot(copy.deepcopy(COURSE))), [])
+
+    def test_field_level_changes(self):
+        def edit(data):
+            data['metadata']['semester'] = 'II-2026'
+            data['weeks'][1]['objectives'].append('Extra goal')
+            data['weeks'][2]['references'][0]['pages'] = '1-10'
+            data['weeks'].append({"week": 4, "title": "Topic 4"})
+
+        self.assertEqual(_changes(edit), [
+            'metadata.semester modified',
+            'week 2: objectives modified',
+            # 'extra' is a new top keyword of week 2
+            'week 2: keywords modified',
+            'week 3: references modified',
+            'week 4: week added',
+        ])
+
+    def test_activities_are_matched_by_content(self):
+        def edit(data):
+            data['weeks'][0]['activities'].insert(0, 'Warm-up')
+            data['weeks'][1]['activities'] = ['Quiz 2', 'Lab 2']
+            data['weeks'][2]['activities'][1] = 'Exam 3'
+
+        self.assertEqual(_changes(edit), [
+            'week 1: activities[0] added',
+            'week 2: activities modified',
+            'week 3: activities[1] added',
+            'week 3: activities[1] removed',
+        ])
+
+    def test_snapshot_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, syllabus_diff.SNAPSHOT_FILE)
+            self.assertIsNone(syllabus_diff.load_snapshot(path))
+            syllabus_diff.save_snapshot(path, snapshot(COURSE))
+            self.assertEqual(syllabus_diff.load_snapshot(path), snapshot(COURSE))
+            self.assertEqual(os.stat(path).st_mode & 0o777, default_file_mode())
+
+    def test_plan_maps_fields_to_dependent_outputs(self):
+        data = copy.deepcopy(COURSE)
+        data['weeks'][0]['references'][0]['text'] = 'Book 1, 2nd ed.'
+        data['weeks'][1]['objectives'] = ['New goal']
+        data['weeks'][2]['activities'].append('Project 3')
+        plan = RebuildPlan.from_changes(diff(snapshot(COURSE), snapshot(data)), data)
+
+        self.assertEqual(plan.weeks('generate_sessions'), [1, 2, 3])
+        self.assertEqual(plan.weeks('generate_sessions_table_json'), [2])
+        self.assertEqual(plan.weeks('generate_activities'), [3])
+        self.assertEqual(plan.activity_files, {'03-project-3.md'})
+        self.assertEqual(plan.weeks('update_toc'), [3])
+        self.assertFalse(plan.reruns('generate_program'))
+
+    def test_course_title_reruns_every_session(self):
+        data = copy.deepcopy(COURSE)
+        data['metadata']['title'] = 'Physics I'
+        plan = RebuildPlan.from_changes(diff(snapshot(COURSE), snapshot(data)), data)
+
+        self.assertIsNone(plan.weeks('generate_sessions'))
+        self.assertTrue(plan.reruns('generate_program'))
+        self.assertEqual(plan.weeks('generate_activities'), [])
+
+    def test_unit_change_moves_week_outputs(self):
+        data = copy.deepcopy(COURSE)
+        data['weeks'][1]['unit'] = 2
+        plan = RebuildPlan.from_changes(diff(snapshot(COURSE), snapshot(data)), data)
+
+        self.assertEqual([str(c) for c in diff(snapshot(COURSE), snapshot(data))], ['week 2: unit modified'])
+        self.assertEqual(plan.weeks('generate_sessions'), [2])
+        self.assertEqual(plan.activity_files, {'02-lab-2.md', '02-quiz-2.md'})
+        self.assertEqual(plan.weeks('generate_sessions_table_json'), [])
+
+    def test_scaffold_rewrites_only_dependent_outputs(self):
+        data = copy.deepcopy(COURSE)
+        with tempfile.TemporaryDirectory() as tmp:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scaffold_course.scaffold('en', False, as_course(data), out=OutputTree(tmp))
+                previous = snapshot(data)
+
+                data['weeks'][0]['references'][0]['text'] = 'Book 1, 2nd ed.'
+                data['weeks'][1]['objectives'] = ['New goal']
+                plan = RebuildPlan.from_changes(diff(previous, snapshot(data)), data)
+                manifest = ChangeManifest()
+                scaffold_course.scaffold('en', False, as_course(data), out=OutputTree(tmp, manifest=manifest),
+                                         rebuild=plan)
+
+            changed = sorted(os.path.relpath(e['path'], tmp) for e in manifest.entries)
+            self.assertEqual(changed, [
+                # References are not indexed; the new objective only adds 'new'
+                os.path.join('assets', 'search', 'manifest.json'),
+                os.path.join('assets', 'search', 'terms', 'ne.json'),
+                os.path.join('sessions', '01-topic-1.md'),
+                os.path.join('sessions', '02-topic-2.md'),
+                'sessions_table.md',
+            ])
+            with open(os.path.join(tmp, 'sessions', '01-topic-1.md'), encoding='utf-8') as f:
+                self.assertIn('Book 1, 2nd ed.', f.read())
+
+    def test_changed_only_matches_full_rebuild(self):
+        """Test that keywords shifted in other weeks by course-wide TF-IDF are rewritten too."""
+        data = {
+            "metadata": {"title": "Course"},
+            "weeks": [
+                {"week": 1, "title": "Forces and vectors", "objectives": ["Add vectors", "Draw forces"]},
+                {"week": 2, "title": "Energy", "objectives": ["Compute energy", "Apply forces"]},
+                {"week": 3, "title": "Momentum", "objectives": ["Conserve momentum"]},
+            ],
+        }
+        with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as full:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scaffold_course.scaffold('en', False, as_course(data), out=OutputTree(tmp))
+                previous = snapshot(data)
+
+                # 'forces' is no longer shared, so its weight in week 1 goes up
+                data['weeks'][1]['objectives'] = ['Compute energy', 'Compute work']
+                changes = diff(previous, snapshot(data))
+                self.assertIn('week 1: keywords modified', [str(c) for c in changes])
+                scaffold_course.scaffold('en', False, as_course(data), out=OutputTree(tmp),
+                                         rebuild=RebuildPlan.from_changes(changes, data))
+                scaffold_course.scaffold('en', False, as_course(data), out=OutputTree(full))
+
+            self.assertEqual(_tree(tmp), _tree(full))
+
+
+def _tree(root):
+    """Generated files of a root, without the run caches and the shards dropped from the search index."""
+    with open(os.path.join(root, 'assets', 'search', 'manifest.json'), encoding='utf-8') as f:
+        shards = {os.path.join('assets', 'search', 'terms', f"{prefix}.json") for prefix in json.load(f)['shards']}
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != '.scaffold_cache']
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, root)
+            if os.path.dirname(rel) == os.path.join('assets', 'search', 'terms') and rel not in shards:
+                continue
+            with open(path, 'rb') as f:
+                files[rel] = f.read()
+    return files
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Unit tests for toc_model.py.
+
+Tests that the project.toc tree of myst.yml is parsed once with line
+positions (in both indented and yaml.dump list styles), that weeks are found
+by session file prefix regardless of their label, and that batched edits are
+written in one pass without disturbing comments or the rest of the file.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from toc_model import TocDocument
+
+INDENTED = """version: 1
+project:
+  title: Curso
+  toc:
+    - file: programa.md
+    # Unidad 1
+    - title: Semana 1
+      children:
+      - file: sessions/01-intro.md
+      - file: activities/01-lab.md
+    - title: Week Two
+      children:
+        - file: sessions/02-vectores.md  # renamed later
+        - file: activities/02-quiz.md
+          hidden: true
+site:
+  title: Curso
+"""
+
+# Style produced by yaml.dump: list items at the same indent as their key
+DUMPED = """project:
+  toc:
+  - file: programa.md
+  - title: Semaine 3
+    children:
+    - file: sessions/03-session.md
+    - file: activities/03-taller.md
+site:
+  template: book-theme
+"""
+
+
+class TestTocModel(unittest.TestCase):
+
+    def test_parses_tree_with_line_positions(self):
+        toc = TocDocument(INDENTED)
+        self.assertEqual([e.file or e.title for e in toc.entries], ['programa.md', 'Semana 1', 'Week Two'])
+        week2 = toc.entries[2]
+        self.assertEqual([c.file for c in week2.children], ['sessions/02-vectores.md', 'activities/02-quiz.md'])
+        self.assertTrue(week2.children[1].hidden)
+        self.assertEqual(INDENTED.splitlines()[week2.start], '    - title: Week Two')
+        self.assertEqual(week2.end, 15)
+
+    def test_weeks_found_by_session_prefix(self):
+        self.assertEqual(sorted(TocDocument(INDENTED).week_entries()), [1, 2])
+        self.assertEqual(list(TocDocument(DUMPED).week_entries()), [3])
+
+    def test_weeks_found_inside_unit_parts(self):
+        text = """project:
+  toc:
+  - file: programa.md
+  - title: Unit 1
+    children:
+    - title: Week 1
+      children:
+      - file: sessions/unit-01/01-intro.md
+    - title: Week 2
+      children:
+      - file: sessions/unit-01/02-vectors.md
+"""
+        weeks = TocDocument(text).week_entries()
+        self.assertEqual(sorted(weeks), [1, 2])
+        self.assertEqual(weeks[2].title, 'Week 2')
+
+    def test_no_edits_round_trips(self):
+        for text in (INDENTED, DUMPED):
+            toc = TocDocument(text)
+            self.assertFalse(toc.modified)
+            self.assertEqual(toc.render(), text)
+
+    def test_batch_hide_and_append_preserves_comments(self):
+        toc = TocDocument(INDENTED)
+        for entry in toc.walk():
+            if (entry.file or '').startswith('activities/'):
+                toc.hide(entry)
+        weeks = toc.week_entries()
+        toc.append_child(weeks[1], {'file': 'evaluations/01-quiz.md', 'hidden': 'true'})
+        toc.append_child(weeks[2], {'file': 'evaluations/02-quiz.md', 'hidden': 'true'})
+
+        rendered = toc.render()
+        self.assertIn("      - file: activities/01-lab.md\n        hidden: true\n"
+                      "      - file: evaluations/01-quiz.md\n        hidden: true\n"
+                      "    - title: Week Two", rendered)
+        self.assertIn("        - file: activities/02-quiz.md\n          hidden: true\n"
+                      "        - file: evaluations/02-quiz.md\n          hidden: true\nsite:", rendered)
+        self.assertEqual(rendered.count('activities/02-quiz.md\n          hidden: true'), 1)
+        self.assertIn("    # Unidad 1\n", rendered)
+        self.assertIn("# renamed later", rendered)
+
+        # The result parses back into the same tree plus the new entries
+        reparsed = TocDocument(rendered)
+        self.assertEqual(len(reparsed.week_entries()[1].children), 3)
+        self.assertTrue(all(e.hidden for e in reparsed.walk() if (e.file or '').startswith('activities/')))
+
+    def test_dumped_style_hide_and_move(self):
+        toc = TocDocument(DUMPED)
+        week = toc.week_entries()[3]
+        toc.hide(week.children[1])
+        toc.move(toc.find_file('programa.md'), week)
+        rendered = toc.render()
+        self.assertEqual(rendered, """project:
+  toc:
+  - title: Semaine 3
+    children:
+    - file: sessions/03-session.md
+    - file: activities/03-taller.md
+      hidden: true
+    - file: programa.md
+site:
+  template: book-theme
+""")
+
+
+if __name__ == '__main__':
+    unittest.main()
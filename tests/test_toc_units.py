@@ -0,0 +1,91 @@
+"""
+Unit tests for toc_units.py.
+
+Tests that unit TOC files are spliced into their marked myst.yml blocks,
+that include entries and missing units get a new block, that up-to-date
+blocks leave the text unchanged, and that broken markers are reported.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from toc_units import splice, unit_file
+from managed_blocks import MarkerError
+from toc_model import TocDocument
+
+UNIT_1 = """\
+- title: Unit 1
+  children:
+  - title: Week 1
+    children:
+    - file: sessions/unit-01/01-vectors.md
+"""
+
+UNIT_2 = """\
+- title: Unit 2
+  children:
+  - title: Week 3
+    children:
+    - file: sessions/unit-02/03-energy.md
+"""
+
+MYST = """\
+version: 1
+project:
+  title: Course
+  toc:
+  - file: programa.md
+  # >>> toc/unit-01.yml
+  - title: Unit 1
+    children:
+    - title: Week 1
+      children:
+      - file: sessions/unit-01/01-old.md
+  # <<< toc/unit-01.yml
+  - file: toc/unit-02.yml
+site:
+  template: book-theme
+"""
+
+
+class TestTocUnits(unittest.TestCase):
+
+    def test_unit_file(self):
+        self.assertEqual(unit_file(3), 'toc/unit-03.yml')
+
+    def test_blocks_are_replaced_and_includes_expanded(self):
+        units = {'toc/unit-01.yml': UNIT_1, 'toc/unit-02.yml': UNIT_2}
+        text = splice(MYST, units)
+        self.assertIn('\n      - file: sessions/unit-01/01-vectors.md\n', text)
+        self.assertNotIn('01-old.md', text)
+        self.assertNotIn('- file: toc/unit-02.yml', text)
+        self.assertIn('  # >>> toc/unit-02.yml\n  - title: Unit 2\n', text)
+        self.assertTrue(text.endswith('site:\n  template: book-theme\n'))
+
+        toc = TocDocument(text)
+        self.assertEqual([e.file or e.title for e in toc.entries], ['programa.md', 'Unit 1', 'Unit 2'])
+        self.assertEqual(sorted(toc.week_entries()), [1, 3])
+        # Up to date: the same string comes back
+        self.assertIs(splice(text, units), text)
+
+    def test_missing_unit_is_appended_to_the_toc(self):
+        myst = MYST.replace('  - file: toc/unit-02.yml\n', '')
+        text = splice(myst, {'toc/unit-02.yml': UNIT_2})
+        toc = TocDocument(text)
+        self.assertEqual([e.file or e.title for e in toc.entries], ['programa.md', 'Unit 1', 'Unit 2'])
+        # Blocks of other unit files are left as they are
+        self.assertIn('01-old.md', text)
+
+    def test_broken_markers(self):
+        with self.assertRaises(MarkerError):
+            splice(MYST.replace('  # <<< toc/unit-01.yml\n', ''), {'toc/unit-01.yml': UNIT_1})
+        with self.assertRaises(MarkerError):
+            splice('version: 1\n', {'toc/unit-01.yml': UNIT_1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,30 +9,36 @@ and do not scramble the file structure.
 
 import unittest
 from unittest.mock import patch, mock_open, MagicMock
+import contextlib
+import io
 import sys
 import os
+import tempfile
 
 # Adjust path to import the script under test
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
 
 import update_toc
+from file_discovery import FileEntry
+from output_tree import OutputTree
 
 class TestUpdateToc(unittest.TestCase):
 
     @patch('update_toc.os.path.exists')
-    @patch('update_toc.glob.glob')
+    @patch('update_toc.DEFAULT_TREE.scan')
     @patch('builtins.open', new_callable=mock_open)
-    def test_update_toc_filenames(self, mock_file, mock_glob, mock_exists):
+    def test_update_toc_filenames(self, mock_file, mock_scan, mock_exists):
         """Test that filenames in myst.yml are updated to match files on disk."""
         
         mock_exists.return_value = True
         
         # Mock file system: exists '01-new-name.md' in sessions
-        # The script uses glob.glob(os.path.join(SESSIONS_DIR, '[0-9][0-9]-*.md'))
-        mock_glob.return_value = [
-            os.path.join('sessions', '01-new-name.md'),
-            os.path.join('sessions', '02-unchanged.md')
+        # The script scans sessions/ once through the output tree (and toc/, empty here)
+        sessions = [
+            FileEntry(os.path.join('sessions', '01-new-name.md'), '01-new-name.md', 10, 1),
+            FileEntry(os.path.join('sessions', '02-unchanged.md'), '02-unchanged.md', 10, 1)
         ]
+        mock_scan.side_effect = lambda relpath, **kwargs: sessions if relpath == 'sessions' else []
         
         # Mock initial myst.yml content
         initial_yaml = """version: 1
@@ -80,5 +86,53 @@ project:
         # 3. Structure preservation: activities link should remains
         self.assertIn("file: activities/01-lab.md", written_content)
 
+    def test_three_digit_weeks_are_relinked(self):
+        """Test that weeks from 100 up are matched by their full number, not as week 10 or 05."""
+        toc = """version: 1
+project:
+  toc:
+    - title: Week 5
+      children:
+      - file: sessions/05-five.md
+    - title: Week 105
+      children:
+      - file: sessions/105-old-name.md
+"""
+        with tempfile.TemporaryDirectory() as tmp:
+            out = OutputTree(tmp)
+            os.makedirs(os.path.join(tmp, 'sessions'))
+            out.write_text('myst.yml', toc)
+            out.write_text(os.path.join('sessions', '05-five.md'), '')
+            out.write_text(os.path.join('sessions', '105-new-name.md'), '')
+            with contextlib.redirect_stdout(io.StringIO()):
+                update_toc.main(out=out)
+            content = out.read_text('myst.yml')
+        self.assertIn('file: sessions/105-new-name.md', content)
+        self.assertIn('file: sessions/05-five.md', content)
+
+    def test_week_selection_with_three_digit_weeks(self):
+        """Test that --weeks selects weeks from 100 up and leaves the other weeks alone."""
+        toc = """version: 1
+project:
+  toc:
+    - title: Week 5
+      children:
+      - file: sessions/05-old-five.md
+    - title: Week 105
+      children:
+      - file: sessions/105-old-name.md
+"""
+        with tempfile.TemporaryDirectory() as tmp:
+            out = OutputTree(tmp)
+            os.makedirs(os.path.join(tmp, 'sessions'))
+            out.write_text('myst.yml', toc)
+            out.write_text(os.path.join('sessions', '05-new-five.md'), '')
+            out.write_text(os.path.join('sessions', '105-new-name.md'), '')
+            with contextlib.redirect_stdout(io.StringIO()):
+                update_toc.main(out=out, weeks=[100, 105, 120])
+            content = out.read_text('myst.yml')
+        self.assertIn('file: sessions/105-new-name.md', content)
+        self.assertIn('file: sessions/05-old-five.md', content)
+
 if __name__ == '__main__':
     unittest.main()
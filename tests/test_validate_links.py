@@ -0,0 +1,103 @@
+"""
+Unit tests for validate_links.py.
+
+Tests that broken relative links and TOC `file:` entries are reported with
+their locations, that external links, anchors and code are ignored, and that
+a freshly scaffolded course has no broken links.
+"""
+
+import unittest
+import contextlib
+import io
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import validate_links
+from validate_links import BrokenLink, validate
+from output_tree import OutputTree
+from course_model import as_course
+import scaffold_course
+
+SESSION = """\
+---
+title: Vectors
+---
+![](https://img.shields.io/badge/-Vectors-lightgrey)
+- [Lab](../activities/01-lab.md)
+- [Missing lab](../activities/01-old-lab.md#steps)
+- [Section](#objectives) and [mail](mailto:a@b.c) and [root](/sessions/x.md)
+- `[not a link](nowhere.md)`
+
+```markdown
+[example](example.md)
+```
+[Program](../programa.md) [Folder](../activities/)
+"""
+
+MYST = """\
+version: 1
+project:
+  title: Course
+  toc:
+    - file: programa.md
+    - title: Week 1
+      children:
+        - file: sessions/01-vectors.md
+        - file: sessions/02-gone.md
+"""
+
+
+def _write(root, relpath, text):
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class TestValidateLinks(unittest.TestCase):
+
+    def _tree(self, tmp):
+        _write(tmp, 'programa.md', '# Program\n')
+        _write(tmp, 'sessions/01-vectors.md', SESSION)
+        _write(tmp, 'activities/01-lab.md', '# Lab\n[Back](../sessions/01-vectors.md)\n')
+        _write(tmp, 'myst.yml', MYST)
+        _write(tmp, '.git/ignored.md', '[x](missing.md)\n')
+
+    def test_reports_broken_links_with_locations(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self._tree(tmp)
+            self.assertEqual(validate(tmp), [
+                BrokenLink('sessions/01-vectors.md', 6, '../activities/01-old-lab.md#steps'),
+                BrokenLink('myst.yml', 9, 'sessions/02-gone.md'),
+            ])
+            self.assertEqual(str(validate(tmp)[0]), 'sessions/01-vectors.md:6: ../activities/01-old-lab.md#steps')
+
+    def test_only_listed_files_are_checked(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self._tree(tmp)
+            self.assertEqual(validate(tmp, files=['activities/01-lab.md']), [])
+            self.assertEqual([b.path for b in validate(tmp, files=['myst.yml'])], ['myst.yml'])
+
+    def test_scaffolded_course_has_no_broken_links(self):
+        data = {
+            "metadata": {"title": "Course"},
+            "weeks": [{"week": w, "title": f"Topic {w}", "activities": [f"Lab {w}"]} for w in range(1, 4)],
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scaffold_course.scaffold('en', False, as_course(data), out=OutputTree(tmp))
+            self.assertTrue(os.path.exists(os.path.join(tmp, validate_links.MYST_CONFIG_FILE)))
+            self.assertEqual(validate(tmp), [])
+
+            os.remove(os.path.join(tmp, 'activities', '02-lab-2.md'))
+            self.assertEqual([(b.path, b.target) for b in validate(tmp)],
+                             [('sessions/02-topic-2.md', '../activities/02-lab-2.md'),
+                              ('myst.yml', 'activities/02-lab-2.md')])
+
+
+if __name__ == '__main__':
+    unittest.main()
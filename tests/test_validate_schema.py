@@ -0,0 +1,75 @@
+"""
+Unit tests for validate_schema.py.
+
+Tests that all schema errors are reported in one pass with their JSON paths,
+and that results are cached by file hash so unchanged files are not revalidated.
+"""
+
+import unittest
+from unittest.mock import patch
+import json
+import tempfile
+import sys
+import os
+
+# Adjust path to import the script under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import validate_schema
+from utils import default_file_mode
+
+class TestValidateSchema(unittest.TestCase):
+
+    def test_reports_every_error_with_path(self):
+        """Test that type errors across weeks are collected in a single pass."""
+        data = {
+            "metadata": {"title": 3},
+            "weeks": [
+                {"week": "1", "title": "Intro"},
+                {"week": 2, "evaluation": ["not a dict"], "references": [{"pages": "1"}]},
+                {"week": 2, "activities": ["ok", 5]}
+            ]
+        }
+
+        errors = validate_schema.validate(data)
+
+        self.assertIn("$.metadata.title: expected string, got integer", errors)
+        self.assertIn("$.weeks[0].week: expected integer, got string", errors)
+        self.assertIn("$.weeks[1].evaluation[0]: expected object, got string", errors)
+        self.assertIn("$.weeks[1].references[0]: missing required field 'text'", errors)
+        self.assertIn("$.weeks[2].activities[1]: expected string, got integer", errors)
+        self.assertIn("$.weeks[2].week: duplicate value 2 (also at $.weeks[1])", errors)
+
+    def test_missing_weeks_is_an_error(self):
+        """Test that a dict without 'weeks' is no longer silently accepted."""
+        self.assertEqual(validate_schema.validate({"title": "x"}), ["$: missing required field 'weeks'"])
+        self.assertEqual(validate_schema.validate([{"week": 1}]), [])
+
+    def test_results_are_cached_by_file_hash(self):
+        """Test that an unchanged file is not revalidated, and a changed one is."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'planeamiento.json')
+            cache_dir = os.path.join(tmp, 'cache')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"weeks": [{"week": 1}]}, f)
+
+            self.assertEqual(validate_schema.validate_file(path, cache_dir=cache_dir), [])
+
+            cache_file = os.path.join(cache_dir, validate_schema.CACHE_FILE)
+            self.assertEqual(os.stat(cache_file).st_mode & 0o777, default_file_mode())
+
+            with patch('validate_schema.validate') as mock_validate, \
+                    patch('validate_schema.write_atomic') as mock_write:
+                self.assertEqual(validate_schema.validate_file(path, cache_dir=cache_dir), [])
+                mock_validate.assert_not_called()
+                # A cache hit rewrites nothing
+                mock_write.assert_not_called()
+
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"weeks": [{"week": 0}]}, f)
+
+            self.assertEqual(validate_schema.validate_file(path, cache_dir=cache_dir),
+                             ["$.weeks[0].week: must be >= 1, got 0"])
+
+if __name__ == '__main__':
+    unittest.main()